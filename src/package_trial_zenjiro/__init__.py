@@ -0,0 +1,110 @@
+"""
+package_trial_zenjiro: add one to numbers, one at a time or in bulk.
+
+The public functions of every engine are available from the package root,
+but the submodule that defines one is only imported when the name is first
+used. ``import package_trial_zenjiro`` therefore does not import asyncio,
+multiprocessing, mmap, decimal or fractions, and a program that only calls
+add_one never pays for them.
+
+Examples:
+    >>> import package_trial_zenjiro as pz
+    >>> pz.add_one(41)
+    42
+    >>> pz.add_one_many([1, 2.5])
+    [2, 3.5]
+"""
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    "add_one": "main",
+    "add_one_many": "main",
+    "add_one_buffer": "buffer",
+    "add_one_chunks": "stream",
+    "add_one_stream": "stream",
+    "add_one_async_chunks": "aio",
+    "add_one_async_stream": "aio",
+    "add_one_queue_worker": "aio",
+    "add_one_parallel": "parallel",
+    "add_one_threaded": "threaded",
+    "free_threaded": "threaded",
+    "FileStats": "fileio",
+    "add_one_file": "fileio",
+    "add_one_decimals": "exact",
+    "add_one_fractions": "exact",
+    "add_one_interleaved": "complexes",
+    "add_one_complex_parts": "complexes",
+    "pack_complex": "complexes",
+    "unpack_complex": "complexes",
+    "register_increment": "registry",
+    "unregister_increment": "registry",
+    "resolve_increment": "registry",
+    "has_increment": "registry",
+    "dispatch_add_one": "registry",
+    "add_one_inplace": "inplace",
+    "AddOneView": "view",
+    "AddOneCache": "cache",
+    "add_one_csv": "records",
+    "add_one_fixed": "fixed",
+    "add_one_ndjson": "records",
+    "add_n": "repeat",
+    "AddOneClient": "client",
+    "serve": "server",
+    "AddOneCoalescer": "coalesce",
+    "BigCounter": "counter",
+    "add_one_shared": "shared",
+    "Progression": "progression",
+    "add_one_progression": "progression",
+}
+
+_SUBMODULES = frozenset(
+    {
+        "aio",
+        "bench",
+        "cache",
+        "buffer",
+        "cli",
+        "client",
+        "coalesce",
+        "complexes",
+        "counter",
+        "exact",
+        "fileio",
+        "fixed",
+        "inplace",
+        "main",
+        "metrics",
+        "parallel",
+        "progression",
+        "records",
+        "registry",
+        "repeat",
+        "server",
+        "shared",
+        "stream",
+        "threaded",
+        "view",
+    }
+)
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    # importlib itself is not imported at startup, so it is loaded here.
+    from importlib import import_module
+
+    module_name = _EXPORTS.get(name)
+    if module_name is not None:
+        value = getattr(import_module(f".{module_name}", __name__), name)
+    elif name in _SUBMODULES:
+        value = import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache the value so later lookups bypass __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
@@ -0,0 +1,9 @@
+"""
+Entry point for ``python -m package_trial_zenjiro``.
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Parsing and formatting of numeric text for package_trial_zenjiro.
+
+The helpers here turn lines of ASCII text into numbers and numbers back into
+text a whole batch at a time, trying one C-level ``map`` over the batch
+first and only falling back to per-line parsing when that fails.
+"""
+
+import re
+from decimal import Decimal, InvalidOperation
+
+# An "auto" batch with no line that int() would accept can be read with
+# float() in one pass; int() accepts underscores and surrounding whitespace.
+_INT_LINE = re.compile(rb"^\s*[+-]?\d[\d_]*\s*$", re.MULTILINE)
+
+# The grammar of a decimal literal that int() accepts.
+_INT_LITERAL = re.compile(rb"\s*[+-]?\d+(?:_\d+)*\s*")
+
+
+def _parse_complex(text):
+    return complex(text.decode("ascii"))
+
+
+def _parse_decimal(text):
+    try:
+        return Decimal(text.decode("ascii").strip())
+    except InvalidOperation:
+        raise ValueError(f"invalid decimal literal {text!r}") from None
+
+
+def parse_int(text):
+    """
+    Parse a decimal integer literal exactly, however many digits it has.
+
+    Args:
+        text: bytes or str accepted by int()
+
+    Returns:
+        The int value
+
+    Raises:
+        ValueError: If text is not an integer literal
+    """
+    try:
+        return int(text)
+    except ValueError:
+        if isinstance(text, str):
+            text = text.encode("ascii", "replace")
+        if not _INT_LITERAL.fullmatch(text):
+            raise
+    # int() refuses literals longer than sys.get_int_max_str_digits(); the
+    # Decimal conversion has no such limit and is exact.
+    try:
+        return int(Decimal(text.decode("ascii")))
+    except InvalidOperation:
+        raise ValueError(f"invalid integer literal {text!r}") from None
+
+
+def _parse_auto(text):
+    try:
+        return parse_int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return _parse_complex(text)
+
+
+PARSERS = {
+    "auto": _parse_auto,
+    "int": parse_int,
+    "float": float,
+    "complex": _parse_complex,
+    "decimal": _parse_decimal,
+}
+
+# Parser tried on the whole batch before falling back to PARSERS per line.
+_BATCH_PARSERS = {"auto": int, "int": int}
+
+
+def parse_lines(lines, kind="auto", first_line=1):
+    """
+    Parse a batch of byte strings, one number per line.
+
+    Lines that are empty or contain only whitespace are skipped.
+
+    Args:
+        lines: List of bytes objects without their line terminators
+        kind: Key of PARSERS selecting how literals are interpreted
+        first_line: Line number of ``lines[0]``, used in error messages
+
+    Returns:
+        A list of numbers
+
+    Raises:
+        ValueError: If a line is not a valid literal of the selected kind
+        KeyError: If kind is unknown
+    """
+    parse = PARSERS[kind]
+    try:
+        return list(map(_BATCH_PARSERS.get(kind, parse), lines))
+    except (ValueError, UnicodeDecodeError):
+        pass
+    if kind == "auto" and not _INT_LINE.search(b"\n".join(lines)):
+        try:
+            return list(map(float, lines))
+        except ValueError:
+            pass
+    numbers = []
+    for line_number, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        try:
+            numbers.append(parse(line))
+        except (ValueError, UnicodeDecodeError):
+            text = line.strip().decode("ascii", "replace")
+            raise ValueError(f"line {line_number}: invalid number {text!r}") from None
+    return numbers
+
+
+def format_lines(numbers):
+    """
+    Format a batch of numbers as newline-terminated ASCII text.
+
+    Args:
+        numbers: List of numbers
+
+    Returns:
+        bytes with one ``str(number)`` per line
+    """
+    if not numbers:
+        return b""
+    try:
+        text = "\n".join(map(str, numbers))
+    except ValueError:
+        text = "\n".join(map(format_number, numbers))
+    return (text + "\n").encode("ascii")
+
+
+def format_number(number):
+    """Format a number like str(), without the digit limit on integers."""
+    if isinstance(number, int):
+        # Like int(), str() is limited to sys.get_int_max_str_digits().
+        return str(Decimal(number))
+    return str(number)
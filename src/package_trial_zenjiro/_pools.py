@@ -0,0 +1,65 @@
+"""
+Executor pools shared by the engines of package_trial_zenjiro.
+
+The thread, process and shared-memory engines each keep one executor that
+is created on first use and reused by later calls until a call asks for a
+different number of workers. PoolSlot holds that executor and the lock
+that guards it, so every engine replaces and shuts it down the same way.
+"""
+
+import os
+import threading
+
+
+class PoolSlot:
+    """
+    A lazily created executor that is reused while its size fits.
+
+    Args:
+        factory: Callable taking a number of workers and returning a new
+            concurrent.futures executor of that size
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._workers = 0
+        self.pool = None
+
+    def get(self, workers):
+        """
+        Return an executor with ``workers`` workers, creating it if needed.
+
+        An executor of another size is replaced and shut down without
+        waiting, so tasks already submitted to it still complete.
+        """
+        with self._lock:
+            pool = self.pool
+            if pool is not None and self._workers == workers:
+                return pool
+            stale, pool = pool, self._factory(workers)
+            self.pool, self._workers = pool, workers
+        if stale is not None:
+            stale.shutdown(wait=False)
+        return pool
+
+    def discard(self, pool):
+        """Forget ``pool`` if it is the current executor and shut it down."""
+        with self._lock:
+            if self.pool is pool:
+                self.pool, self._workers = None, 0
+        pool.shutdown(wait=False)
+
+    def shutdown(self):
+        """Shut down the current executor, if any, and wait for its tasks."""
+        with self._lock:
+            pool, self.pool, self._workers = self.pool, None, 0
+        if pool is not None:
+            pool.shutdown()
+
+
+def usable_cpus():
+    """Return the number of CPUs the calling process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1  # pragma: no cover
@@ -0,0 +1,161 @@
+"""
+Wire format of the add_one server for package_trial_zenjiro.
+
+Every request and response is one frame: a 5-byte header holding the
+payload length (unsigned 32-bit, little-endian) and a one-byte kind,
+followed by the payload. Numeric batches travel as packed little-endian
+int64 (kind ``q``) or float64 (kind ``d``) values; anything else travels as
+newline-separated literals read with the parsers of the add-one command.
+The response to a request has the same kind, or kind ``E`` with a
+``"ExceptionName: message"`` payload when the batch failed.
+"""
+
+import struct
+import sys
+from array import array
+from decimal import Decimal
+
+from ._literals import format_lines, parse_lines
+from .buffer import add_one_buffer
+from .main import add_one_many
+
+HEADER = struct.Struct("<IB")
+MAX_PAYLOAD_BYTES = 1 << 28
+
+KIND_INT64 = ord("q")
+KIND_FLOAT64 = ord("d")
+KIND_ERROR = ord("E")
+
+# Text kinds and the add-one literal parser each one uses.
+TEXT_KINDS = {ord("A"): "auto", ord("I"): "int", ord("D"): "decimal"}
+
+# Exceptions a server error may be re-raised as on the client.
+REMOTE_ERRORS = {
+    error.__name__: error
+    for error in (ArithmeticError, OverflowError, TypeError, ValueError)
+}
+
+_INT64_MAX = (1 << 63) - 1
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def frame(kind, payload):
+    """Return the bytes of a frame."""
+    return HEADER.pack(len(payload), kind) + payload
+
+
+def read_frame(stream):
+    """
+    Read one frame from a buffered binary stream.
+
+    Returns:
+        A (kind, payload) pair, or None at a clean end of stream
+
+    Raises:
+        ConnectionError: If the stream ends inside a frame
+        ValueError: If the declared payload exceeds MAX_PAYLOAD_BYTES
+    """
+    header = stream.read(HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise ConnectionError("connection closed inside a frame header")
+    length, kind = HEADER.unpack(header)
+    if length > MAX_PAYLOAD_BYTES:
+        raise ValueError(f"frame of {length} bytes exceeds the limit")
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise ConnectionError("connection closed inside a frame")
+    return kind, payload
+
+
+def encode(values):
+    """
+    Encode a list of numbers as the payload of a request.
+
+    int64 and float64 batches are packed; other ints, complex numbers and
+    mixtures of int, float and complex use the "auto" literal text, and
+    Decimals the "decimal" text.
+
+    Returns:
+        A (kind, payload) pair
+
+    Raises:
+        TypeError: If a value cannot be sent, such as a bool or Fraction,
+            or Decimals are mixed with other types
+    """
+    types = set(map(type, values))
+    if types == {int} and -_INT64_MAX <= min(values) and max(values) < _INT64_MAX:
+        # Leaving out 2**63 - 1 means the server's int64 lanes never
+        # overflow; such values go as text and are promoted like add_one.
+        return KIND_INT64, _pack("q", values)
+    if types == {float}:
+        return KIND_FLOAT64, _pack("d", values)
+    if types == {Decimal}:
+        return ord("D"), format_lines(values)
+    if types <= {int, float, complex}:
+        return ord("A"), format_lines(values)
+    names = ", ".join(sorted(kind.__name__ for kind in types))
+    raise TypeError(f"cannot send values of type {names} to an add_one server")
+
+
+def decode(kind, payload):
+    """
+    Decode the payload of a response into a list of numbers.
+
+    Raises:
+        The exception named in an error response, or RuntimeError for
+        exceptions without a local counterpart
+    """
+    if kind == KIND_INT64 or kind == KIND_FLOAT64:
+        return _unpack(chr(kind), payload).tolist()
+    if kind in TEXT_KINDS:
+        return parse_lines(payload.split(b"\n"), TEXT_KINDS[kind])
+    if kind == KIND_ERROR:
+        text = payload.decode("utf-8", "replace")
+        name, _, message = text.partition(": ")
+        if name in REMOTE_ERRORS:
+            raise REMOTE_ERRORS[name](message)
+        raise RuntimeError(text)
+    raise ValueError(f"unknown frame kind {kind!r}")
+
+
+def process(kind, payload):
+    """
+    Serve one request: add one to every value of the payload.
+
+    Returns:
+        The (kind, payload) pair of the response; failures are returned as
+        an error frame rather than raised
+    """
+    try:
+        if kind == KIND_INT64 or kind == KIND_FLOAT64:
+            values = _unpack(chr(kind), payload)
+            add_one_buffer(values)
+            return kind, _to_bytes(values)
+        if kind in TEXT_KINDS:
+            numbers = parse_lines(payload.split(b"\n"), TEXT_KINDS[kind])
+            return kind, format_lines(add_one_many(numbers))
+        raise ValueError(f"unknown frame kind {kind!r}")
+    except Exception as error:
+        return KIND_ERROR, f"{type(error).__name__}: {error}".encode()
+
+
+def _pack(typecode, values):
+    return _to_bytes(array(typecode, values))
+
+
+def _to_bytes(values):
+    if _BIG_ENDIAN:  # pragma: no cover
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack(typecode, payload):
+    values = array(typecode)
+    if len(payload) % values.itemsize:
+        raise ValueError("payload is not a whole number of values")
+    values.frombytes(payload)
+    if _BIG_ENDIAN:  # pragma: no cover
+        values.byteswap()
+    return values
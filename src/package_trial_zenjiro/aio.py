@@ -0,0 +1,206 @@
+"""
+asyncio integration for package_trial_zenjiro.
+
+This module applies add_one to async iterables and asyncio queues. Items
+that are ready when the consumer asks for more are processed as one batch
+through add_one_many, large batches are handed to an executor so the event
+loop keeps running, and input is read ahead into a bounded buffer so a slow
+consumer pushes back on the producer.
+"""
+
+import asyncio
+from collections import deque
+
+from .main import add_one_many
+
+DEFAULT_MAX_BATCH = 8192
+DEFAULT_OFFLOAD_THRESHOLD = 2048
+DEFAULT_BUFFER_SIZE = 65536
+
+# The reader gives the loop a chance to run other tasks after this many items
+# even when its source never suspends, e.g. an async generator over a list.
+_READ_SLICE = 1024
+
+
+async def add_one_async_chunks(
+    source,
+    *,
+    max_batch=DEFAULT_MAX_BATCH,
+    offload_threshold=DEFAULT_OFFLOAD_THRESHOLD,
+    executor=None,
+    buffer_size=DEFAULT_BUFFER_SIZE,
+    sentinel=None,
+):
+    """
+    Add one to items from an async source, yielding one list per micro-batch.
+
+    A batch is everything that is already buffered when the consumer asks for
+    more, up to ``max_batch`` items. Batches of at least ``offload_threshold``
+    items run in ``executor`` via ``loop.run_in_executor``; smaller ones run
+    inline because the hand-off would cost more than the work.
+
+    Args:
+        source: An async iterable, or an asyncio.Queue terminated by
+            ``sentinel``; the queue's own maxsize then bounds the buffer
+        max_batch: Maximum number of items per batch
+        offload_threshold: Batch size from which work leaves the event loop
+        executor: Executor for large batches; None uses the loop's default
+        buffer_size: Maximum number of items read ahead from an async
+            iterable before the reader waits for the consumer
+        sentinel: Value that marks the end of a queue source
+
+    Yields:
+        Lists of add_one results, in input order
+
+    Raises:
+        ValueError: If max_batch or buffer_size is smaller than 1
+        TypeError: If an item is not a numeric type
+    """
+    if max_batch < 1 or buffer_size < 1:
+        raise ValueError("max_batch and buffer_size must be at least 1")
+    loop = asyncio.get_running_loop()
+    if isinstance(source, asyncio.Queue):
+        batches = _queue_batches(source, sentinel, max_batch)
+    else:
+        batches = _BoundedReader(source, buffer_size).batches(max_batch)
+    try:
+        async for batch in batches:
+            if len(batch) >= offload_threshold:
+                yield await loop.run_in_executor(executor, add_one_many, batch)
+            else:
+                yield add_one_many(batch)
+    finally:
+        await batches.aclose()
+
+
+async def add_one_async_stream(source, **options):
+    """
+    Add one to items from an async source, yielding one result at a time.
+
+    This is the element-wise counterpart of add_one_async_chunks and accepts
+    the same keyword options.
+
+    Args:
+        source: An async iterable or an asyncio.Queue terminated by a sentinel
+        **options: Keyword options of add_one_async_chunks
+
+    Yields:
+        add_one of every item, in order
+
+    Raises:
+        TypeError: If an item is not a numeric type
+    """
+    async for results in add_one_async_chunks(source, **options):
+        for result in results:
+            yield result
+
+
+async def add_one_queue_worker(inbox, outbox, *, sentinel=None, **options):
+    """
+    Move items from one asyncio.Queue to another, adding one on the way.
+
+    Results are put into ``outbox`` with ``await outbox.put``, so a bounded
+    outbox that fills up pauses the worker, which in turn stops draining
+    ``inbox``. The sentinel is forwarded once the input is exhausted.
+
+    Args:
+        inbox: asyncio.Queue of numbers terminated by ``sentinel``
+        outbox: asyncio.Queue that receives the results and the sentinel
+        sentinel: Value that marks the end of the input
+        **options: Other keyword options of add_one_async_chunks
+
+    Returns:
+        The number of items processed
+
+    Raises:
+        TypeError: If an item is not a numeric type
+    """
+    processed = 0
+    async for results in add_one_async_chunks(inbox, sentinel=sentinel, **options):
+        for result in results:
+            await outbox.put(result)
+        processed += len(results)
+    await outbox.put(sentinel)
+    return processed
+
+
+async def _queue_batches(queue, sentinel, max_batch):
+    # Take what is ready without suspending again, stopping at the sentinel
+    # so items queued after it are left for someone else.
+    while True:
+        batch = [await queue.get()]
+        while batch[-1] is not sentinel and len(batch) < max_batch:
+            if queue.empty():
+                break
+            batch.append(queue.get_nowait())
+        for _ in batch:
+            queue.task_done()
+        if batch[-1] is not sentinel:
+            yield batch
+            continue
+        if len(batch) > 1:
+            yield batch[:-1]
+        return
+
+
+class _BoundedReader:
+    """Read an async iterable ahead into a deque of at most ``limit`` items."""
+
+    def __init__(self, source, limit):
+        self._source = source
+        self._limit = limit
+        self._items = deque()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._done = False
+
+    async def batches(self, max_batch):
+        task = asyncio.get_running_loop().create_task(self._fill())
+        items = self._items
+        try:
+            while True:
+                if not items:
+                    if self._done:
+                        break
+                    self._readable.clear()
+                    await self._readable.wait()
+                    continue
+                if len(items) <= max_batch:
+                    batch = list(items)
+                    items.clear()
+                else:
+                    batch = [items.popleft() for _ in range(max_batch)]
+                self._writable.set()
+                yield batch
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def _fill(self):
+        items = self._items
+        append = items.append
+        wake = self._readable.set
+        limit = self._limit
+        budget = _READ_SLICE
+        try:
+            async for item in self._source:
+                append(item)
+                size = len(items)
+                if size == 1:
+                    # The consumer may be waiting on an empty buffer; wake it
+                    # so it runs as soon as the source suspends, rather than
+                    # once the slice is full.
+                    wake()
+                budget -= 1
+                if budget and size < limit:
+                    continue
+                budget = _READ_SLICE
+                if size >= limit:
+                    self._writable.clear()
+                    await self._writable.wait()
+                else:
+                    await asyncio.sleep(0)
+        finally:
+            self._done = True
+            self._readable.set()
@@ -0,0 +1,522 @@
+"""
+Benchmark suite for package_trial_zenjiro.
+
+This module measures the engines of the package over a matrix of input
+types and batch sizes using only the standard library. Every benchmark is
+warmed up, its loop count is calibrated so that one sample takes at least
+``min_time`` seconds, and several samples are collected; results are
+summarised by median and interquartile range, written to JSON, and can be
+compared against a stored baseline with a rank test so that only
+statistically significant slowdowns are reported as regressions.
+
+Run ``python -m package_trial_zenjiro.bench --help`` for the command line.
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+from array import array
+from collections import namedtuple
+from datetime import datetime, timezone
+from decimal import Decimal
+from fnmatch import fnmatchcase
+from fractions import Fraction
+from timeit import Timer
+
+from .buffer import add_one_buffer
+from .main import add_one, add_one_many
+from .parallel import add_one_parallel
+from .registry import dispatch_add_one, register_increment
+from .shared import add_one_shared
+from .stream import add_one_stream
+from .threaded import add_one_threaded
+
+DEFAULT_REPEAT = 11
+DEFAULT_MIN_TIME = 0.02
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.01
+
+RESULTS_VERSION = 1
+
+SIZES = (1, 100, 10_000)
+
+
+class _Fixed:
+    """Pure-Python fixed-point number with three decimal places."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def __add__(self, other):
+        if isinstance(other, int):
+            return _Fixed(self.raw + other * 1000)
+        return NotImplemented
+
+    def __eq__(self, other):
+        return isinstance(other, _Fixed) and other.raw == self.raw
+
+
+@register_increment(_Fixed)
+def _increment_fixed(number):
+    return _Fixed(number.raw + 1000)
+
+
+INPUT_TYPES = {
+    "int": lambda i: i,
+    "float": lambda i: i + 0.5,
+    "complex": lambda i: complex(i, 1),
+    "decimal": lambda i: Decimal(i) / 4,
+    "fraction": lambda i: Fraction(i, 3),
+    # A custom type with a registered increment handler.
+    "fixed": lambda i: _Fixed(i * 250),
+}
+
+# Array typecodes for the input types the buffer engine can hold.
+_BUFFER_TYPECODES = {"int": "q", "float": "d"}
+
+
+class Measurement(namedtuple("Measurement", "loops samples")):
+    """
+    Timings of one benchmark.
+
+    Attributes:
+        loops: Number of calls timed together in each sample
+        samples: Seconds per call, one value per sample
+    """
+
+    __slots__ = ()
+
+    @property
+    def median(self):
+        """Median seconds per call."""
+        return statistics.median(self.samples)
+
+    @property
+    def iqr(self):
+        """Interquartile range of the seconds per call."""
+        first, _, third = statistics.quantiles(self.samples, n=4)
+        return third - first
+
+
+Comparison = namedtuple("Comparison", "name baseline current change p_value regressed")
+Comparison.__doc__ = """
+Outcome of comparing one benchmark against a baseline.
+
+Attributes:
+    name: Benchmark name
+    baseline: Median seconds per call in the baseline
+    current: Median seconds per call in the current run
+    change: Relative change of the median, positive when slower
+    p_value: One-sided Mann-Whitney p-value for "current is slower"
+    regressed: True when the slowdown exceeds the threshold and is
+        statistically significant
+"""
+
+
+def benchmarks(patterns=("*",), sizes=SIZES):
+    """
+    Build the benchmark matrix.
+
+    Names have the form ``engine/type/size``, for example
+    ``many/float/10000``. Engines are ``plus`` (a loop around a plain
+    ``number + 1``), ``scalar`` (a loop around add_one), ``dispatch`` (a
+    loop around registry.dispatch_add_one), ``many``, ``stream``, ``buffer``
+    (int and float only), ``threaded-N`` for thread counts 1, 2 and 4,
+    ``parallel-2``, and ``shared-2`` (int and float only). The ``fixed``
+    input type has a registered increment handler, so ``dispatch/fixed``
+    and ``many/fixed`` measure the registry against ``plus/fixed``.
+
+    Args:
+        patterns: fnmatch patterns; a benchmark is kept if any pattern
+            matches its name
+        sizes: Batch sizes to include
+
+    Returns:
+        A dict mapping benchmark names to zero-argument callables, in
+        matrix order
+    """
+    engines = {
+        "plus": lambda data: [number + 1 for number in data],
+        "scalar": lambda data: [add_one(number) for number in data],
+        "dispatch": lambda data: [dispatch_add_one(number) for number in data],
+        "many": add_one_many,
+        "stream": lambda data: list(add_one_stream(data)),
+    }
+    for workers in (1, 2, 4):
+        engines[f"threaded-{workers}"] = _threaded(workers)
+    engines["parallel-2"] = lambda data: add_one_parallel(
+        data, max_workers=2, min_cost=0
+    )
+
+    selected = {}
+    buffer_engines = {"buffer": add_one_buffer, "shared-2": _shared}
+    for engine, func in [*engines.items(), *buffer_engines.items()]:
+        for type_name, make in INPUT_TYPES.items():
+            if engine in buffer_engines and type_name not in _BUFFER_TYPECODES:
+                continue
+            for size in sizes:
+                name = f"{engine}/{type_name}/{size}"
+                if not any(fnmatchcase(name, pattern) for pattern in patterns):
+                    continue
+                data = [make(i) for i in range(size)]
+                if engine in buffer_engines:
+                    selected[name] = _buffer(func, _BUFFER_TYPECODES[type_name], data)
+                else:
+                    selected[name] = _bind(func, data)
+    return selected
+
+
+def _bind(func, data):
+    return lambda: func(data)
+
+
+def _threaded(workers):
+    return lambda data: add_one_threaded(data, max_workers=workers, min_batch=0)
+
+
+def _shared(source, out):
+    return add_one_shared(source, out, max_workers=2, min_bytes=0)
+
+
+def _buffer(func, typecode, data):
+    source = array(typecode, data)
+    out = array(typecode, bytes(len(source) * source.itemsize))
+    return lambda: func(source, out)
+
+
+def measure(func, *, repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME, warmup=1):
+    """
+    Time a zero-argument callable.
+
+    The callable is run ``warmup`` times, then the number of calls per
+    sample is doubled (or scaled) until one sample takes at least
+    ``min_time`` seconds, and ``repeat`` samples are taken with the garbage
+    collector disabled, as timeit does.
+
+    Args:
+        func: The callable to time
+        repeat: Number of samples, at least 3
+        min_time: Minimum duration of one sample in seconds
+        warmup: Number of untimed calls before calibration
+
+    Returns:
+        A Measurement
+
+    Raises:
+        ValueError: If repeat is smaller than 3
+    """
+    if repeat < 3:
+        raise ValueError("repeat must be at least 3")
+    for _ in range(warmup):
+        func()
+    timer = Timer(func)
+    loops = calibrate(timer, min_time)
+    samples = tuple(timer.timeit(loops) / loops for _ in range(repeat))
+    return Measurement(loops, samples)
+
+
+def calibrate(timer, min_time=DEFAULT_MIN_TIME):
+    """
+    Find the number of loops for which a timeit.Timer runs at least min_time.
+
+    Args:
+        timer: A timeit.Timer
+        min_time: Target duration in seconds
+
+    Returns:
+        The loop count
+    """
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_time:
+            return loops
+        if elapsed > 0:
+            loops = max(loops * 2, math.ceil(loops * 1.2 * min_time / elapsed))
+        else:
+            loops *= 10
+
+
+def run(selected, *, repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME, report=None):
+    """
+    Measure every benchmark of a matrix.
+
+    Every benchmark is warmed up and calibrated first; samples are then
+    taken round-robin, one per benchmark per round, so that a slow period
+    of the machine is spread over all benchmarks instead of skewing the
+    one that happened to be running.
+
+    Args:
+        selected: A dict of names to callables, as returned by benchmarks()
+        repeat: Number of samples per benchmark, at least 3
+        min_time: Minimum duration of one sample in seconds
+        report: Optional callable receiving (name, measurement) for each
+            benchmark once all samples are taken
+
+    Returns:
+        A dict mapping names to Measurements
+
+    Raises:
+        ValueError: If repeat is smaller than 3
+    """
+    if repeat < 3:
+        raise ValueError("repeat must be at least 3")
+    timers = {}
+    for name, func in selected.items():
+        func()
+        timer = Timer(func)
+        timers[name] = (timer, calibrate(timer, min_time))
+    samples = {name: [] for name in timers}
+    for _ in range(repeat):
+        for name, (timer, loops) in timers.items():
+            samples[name].append(timer.timeit(loops) / loops)
+    results = {}
+    for name, (_, loops) in timers.items():
+        results[name] = Measurement(loops, tuple(samples[name]))
+        if report is not None:
+            report(name, results[name])
+    return results
+
+
+def save_results(path, results):
+    """
+    Write measurements to a JSON file with information about the interpreter.
+
+    Args:
+        path: Destination file name
+        results: A dict of names to Measurements
+    """
+    document = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": {
+            name: {
+                "loops": result.loops,
+                "median": result.median,
+                "iqr": result.iqr,
+                "samples": list(result.samples),
+            }
+            for name, result in results.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as stream:
+        json.dump(document, stream, indent=2)
+        stream.write("\n")
+
+
+def load_results(path):
+    """
+    Read measurements written by save_results.
+
+    Args:
+        path: Source file name
+
+    Returns:
+        A dict mapping names to Measurements
+
+    Raises:
+        ValueError: If the file is not a results file of a known version
+    """
+    with open(path, encoding="utf-8") as stream:
+        document = json.load(stream)
+    if not isinstance(document, dict) or document.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: not a benchmark results file")
+    return {
+        name: Measurement(entry["loops"], tuple(entry["samples"]))
+        for name, entry in document["results"].items()
+    }
+
+
+def compare(baseline, current, *, threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA):
+    """
+    Compare measurements against a baseline.
+
+    A benchmark regressed when its median is more than ``threshold`` slower
+    than the baseline and a one-sided Mann-Whitney U test on the samples
+    gives a p-value below ``alpha``. Benchmarks missing from either side are
+    skipped.
+
+    Args:
+        baseline: A dict of names to Measurements
+        current: A dict of names to Measurements
+        threshold: Relative slowdown of the median that counts as relevant
+        alpha: Significance level of the rank test
+
+    Returns:
+        A list of Comparisons in the order of ``current``
+    """
+    comparisons = []
+    for name, result in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        change = result.median / reference.median - 1
+        p_value = _mann_whitney_greater(result.samples, reference.samples)
+        comparisons.append(
+            Comparison(
+                name,
+                reference.median,
+                result.median,
+                change,
+                p_value,
+                change > threshold and p_value < alpha,
+            )
+        )
+    return comparisons
+
+
+def _mann_whitney_greater(sample, reference):
+    # Normal approximation of the U statistic with tie and continuity
+    # corrections; adequate from about eight samples per side.
+    pooled = sorted(
+        [(value, 0) for value in sample] + [(value, 1) for value in reference]
+    )
+    n1, n2 = len(sample), len(reference)
+    total = n1 + n2
+    rank_sum = 0.0
+    tie_term = 0
+    start = 0
+    while start < total:
+        stop = start
+        while stop < total and pooled[stop][0] == pooled[start][0]:
+            stop += 1
+        ties = stop - start
+        tie_term += ties**3 - ties
+        average_rank = (start + stop + 1) / 2
+        rank_sum += average_rank * sum(1 for _, side in pooled[start:stop] if side == 0)
+        start = stop
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def format_measurement(name, result):
+    """Format one measurement as a report line."""
+    return (
+        f"{name:<28} {_format_time(result.median):>10} "
+        f"± {_format_time(result.iqr):>9}  ({result.loops} loops)"
+    )
+
+
+def format_comparison(comparison):
+    """Format one comparison as a report line."""
+    status = "REGRESSION" if comparison.regressed else ""
+    return (
+        f"{comparison.name:<28} {_format_time(comparison.baseline):>10} -> "
+        f"{_format_time(comparison.current):>10} {comparison.change:+8.1%} "
+        f"p={comparison.p_value:.3g} {status}".rstrip()
+    )
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main(argv=None):
+    """
+    Run the benchmark command.
+
+    Args:
+        argv: Command-line arguments without the program name; defaults to
+            sys.argv[1:]
+
+    Returns:
+        The process exit status: 0 on success, 1 if a regression against
+        the baseline was found
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m package_trial_zenjiro.bench",
+        description="Benchmark the add_one engines over input types and sizes.",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        action="append",
+        help="fnmatch pattern on engine/type/size names; may be repeated",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        action="append",
+        help="batch size to run; may be repeated (default: %s)"
+        % ", ".join(map(str, SIZES)),
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="samples per benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=DEFAULT_MIN_TIME,
+        help="minimum seconds per sample (default: %(default)s)",
+    )
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown that counts as a regression (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=DEFAULT_ALPHA,
+        help="significance level of the comparison (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="list benchmark names and exit"
+    )
+    args = parser.parse_args(argv)
+    if args.repeat < 3:
+        parser.error("--repeat must be at least 3")
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = load_results(args.compare)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+
+    selected = benchmarks(args.filter or ("*",), args.size or SIZES)
+    if args.list:
+        print("\n".join(selected))
+        return 0
+
+    results = run(
+        selected,
+        repeat=args.repeat,
+        min_time=args.min_time,
+        report=lambda name, result: print(format_measurement(name, result), flush=True),
+    )
+    if args.output:
+        save_results(args.output, results)
+    if baseline is None:
+        return 0
+
+    comparisons = compare(baseline, results, threshold=args.threshold, alpha=args.alpha)
+    print()
+    for comparison in comparisons:
+        print(format_comparison(comparison))
+    return 1 if any(comparison.regressed for comparison in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
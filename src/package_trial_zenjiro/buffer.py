@@ -0,0 +1,174 @@
+"""
+Buffer-protocol engine for package_trial_zenjiro.
+
+This module applies add_one to contiguous numeric buffers such as
+array.array, memoryview and mmap objects without going through a Python
+list. Integer buffers are processed as packed lanes inside a single Python
+int per chunk, so no per-element objects are created; float buffers are
+processed chunk by chunk, which keeps memory bounded.
+"""
+
+import sys
+from array import array
+from functools import lru_cache
+from struct import calcsize
+
+SIGNED_TYPECODES = "bhilq"
+UNSIGNED_TYPECODES = "BHILQ"
+FLOAT_TYPECODES = "fd"
+TYPECODES = SIGNED_TYPECODES + UNSIGNED_TYPECODES + FLOAT_TYPECODES
+
+# What an integer element at its maximum becomes: the minimum of its type
+# ("wrap"), the maximum again ("saturate"), or an OverflowError ("raise").
+OVERFLOW_POLICIES = ("raise", "wrap", "saturate")
+
+DEFAULT_CHUNK_BYTES = 1 << 16
+
+_BYTEORDER = sys.byteorder
+
+# Metrics recorder installed by metrics.enable(); None while metrics are off.
+_probe = None
+
+
+def add_one_buffer(
+    source, out=None, *, typecode=None, chunk_bytes=None, overflow="raise"
+):
+    """
+    Add one to every element of a contiguous numeric buffer.
+
+    The result is written into ``out`` when given, otherwise ``source`` is
+    rewritten in place. Elements are processed in chunks of ``chunk_bytes``,
+    so the extra memory used does not depend on the buffer size.
+
+    Args:
+        source: A C-contiguous buffer with one of the typecodes in TYPECODES
+        out: Optional writable buffer of the same size and element type;
+            raw byte buffers are reinterpreted with the source element type
+        typecode: Element type used to reinterpret raw byte buffers such as
+            bytearray or mmap objects; defaults to the buffer's own format
+        chunk_bytes: Number of bytes processed per step
+        overflow: One of OVERFLOW_POLICIES, applied to integer elements
+            already at their maximum; float buffers ignore it
+
+    Returns:
+        The buffer that received the results (``out`` or ``source``)
+
+    Raises:
+        TypeError: If the element type is not supported or the target
+            buffer is read-only
+        ValueError: If the buffers are not contiguous or differ in size, or
+            the overflow policy is unknown
+        OverflowError: If an integer element is already at its maximum and
+            overflow is "raise"; elements in earlier chunks have been
+            written at that point
+
+    Examples:
+        >>> from array import array
+        >>> add_one_buffer(array("q", [1, 2, 3]))
+        array('q', [2, 3, 4])
+        >>> add_one_buffer(array("d", [0.5]), array("d", [0.0]))
+        array('d', [1.5])
+        >>> add_one_buffer(array("b", [126, 127]), overflow="saturate")
+        array('b', [127, 127])
+    """
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+    probe = _probe
+    if probe is not None:
+        return probe.call_buffer(
+            "buffer", _add_one_buffer, source, out, typecode, chunk_bytes, overflow
+        )
+    return _add_one_buffer(source, out, typecode, chunk_bytes, overflow)
+
+
+def _add_one_buffer(source, out, typecode, chunk_bytes, overflow="raise"):
+    code, src = _byte_view(source, typecode)
+    dst = src
+    # Views are released explicitly, even on error, so that a traceback
+    # holding this frame does not keep an mmap from being closed.
+    try:
+        if out is not None:
+            out_code, dst = _byte_view(out, typecode, raw_as=code)
+            if out_code != code:
+                raise TypeError(f"output typecode {out_code!r} does not match {code!r}")
+            if dst.nbytes != src.nbytes:
+                raise ValueError("output buffer size does not match the source")
+        if dst.readonly:
+            raise TypeError("cannot write add_one results to a read-only buffer")
+        _add_one_bytes(src, dst, code, 0, src.nbytes, chunk_bytes, overflow)
+    finally:
+        src.release()
+        dst.release()
+    return source if out is None else out
+
+
+def _add_one_bytes(src, dst, code, begin, end, chunk_bytes, overflow):
+    """Process bytes [begin, end) of flat byte views, one chunk at a time."""
+    itemsize = calcsize(code)
+    step = max(itemsize, (chunk_bytes or DEFAULT_CHUNK_BYTES) // itemsize * itemsize)
+    kernel = _add_one_float_chunk if code in FLOAT_TYPECODES else _add_one_int_chunk
+    for start in range(begin, end, step):
+        stop = min(start + step, end)
+        with src[start:stop] as chunk:
+            dst[start:stop] = kernel(code, itemsize, chunk, start // itemsize, overflow)
+
+
+def _byte_view(obj, typecode, raw_as=None):
+    with memoryview(obj) as view:
+        if not view.c_contiguous:
+            raise ValueError("add_one_buffer requires a C-contiguous buffer")
+        code = typecode or view.format.lstrip("@")
+        if raw_as and code == "B":
+            code = raw_as
+        if code not in TYPECODES:
+            raise TypeError(f"unsupported buffer element type {code!r}")
+        raw = view.cast("B")
+    if raw.nbytes % calcsize(code):
+        raw.release()
+        raise ValueError(f"buffer size is not a multiple of the {code!r} item size")
+    return code, raw
+
+
+@lru_cache(maxsize=64)
+def _lane_masks(width, lanes):
+    """Return (ones, high, low) masks for ``lanes`` packed lanes of ``width`` bits."""
+    ones = ((1 << (width * lanes)) - 1) // ((1 << width) - 1)
+    high = ones << (width - 1)
+    low = ((1 << (width * lanes)) - 1) ^ high
+    return ones, high, low
+
+
+def _add_one_int_chunk(code, itemsize, chunk, first_index, overflow="raise"):
+    # Adding one to the low bits of every lane can carry into the lane's top
+    # bit but never past it; xor-ing the original top bits back in completes
+    # the per-lane addition modulo 2**width without touching neighbours.
+    width = itemsize * 8
+    lanes = len(chunk) // itemsize
+    ones, high, low = _lane_masks(width, lanes)
+    value = int.from_bytes(chunk, _BYTEORDER)
+    value_high = value & high
+    result = ((value & low) + ones) ^ value_high
+    if overflow != "wrap":
+        # A lane overflowed when its top bit flipped the wrong way: 0 -> 1
+        # for signed lanes (max -> min), 1 -> 0 for unsigned (max -> 0).
+        flipped = (result & high) ^ value_high
+        overflowed = flipped & (result if code in SIGNED_TYPECODES else value)
+        if overflowed and overflow == "raise":
+            lane = ((overflowed & -overflowed).bit_length() - 1) // width
+            if _BYTEORDER == "big":  # pragma: no cover
+                lane = lanes - 1 - lane
+            raise OverflowError(
+                f"add_one overflows {code!r} element at index {first_index + lane}"
+            )
+        if overflowed:
+            # Spread each flagged top bit over its lane (the products of
+            # distinct lanes cannot overlap) and keep the maximum there.
+            mask = (overflowed >> (width - 1)) * ((1 << width) - 1)
+            result ^= (result ^ value) & mask
+    return result.to_bytes(len(chunk), _BYTEORDER)
+
+
+def _add_one_float_chunk(code, itemsize, chunk, first_index, overflow="raise"):
+    values = array(code)
+    values.frombytes(chunk)
+    return memoryview(array(code, [value + 1.0 for value in values])).cast("B")
@@ -0,0 +1,227 @@
+"""
+Result cache for package_trial_zenjiro.
+
+This module provides AddOneCache, an opt-in memoizing wrapper around
+add_one for workloads that repeat the same values of a type whose addition
+is costly, such as user-defined numeric types. Entries are keyed on the type
+and value of the input, evicted least recently used first once a memory
+cap is reached, and values whose equality does not determine the result
+are never cached, so a cached call returns exactly what add_one would.
+"""
+
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+from .main import add_one
+
+DEFAULT_MAX_BYTES = 1 << 24
+
+# Approximate bytes per entry beyond the input and result objects: the
+# ordered-dict node, the key tuple and the stored pair.
+ENTRY_OVERHEAD = 200
+
+CacheStats = namedtuple(
+    "CacheStats", "hits misses evictions uncacheable entries bytes max_bytes"
+)
+CacheStats.__doc__ = """
+Counters of an AddOneCache.
+
+Attributes:
+    hits: Calls answered from the cache
+    misses: Cacheable calls that computed and stored a result
+    evictions: Entries dropped to stay within max_bytes
+    uncacheable: Calls whose input could not be cached
+    entries: Entries currently stored
+    bytes: Estimated size of the stored entries
+    max_bytes: The memory cap
+"""
+
+
+class AddOneCache:
+    """
+    Memoizing add_one with a memory cap and least-recently-used eviction.
+
+    Inputs are cached under ``(type, value)``, so ``True`` and ``1`` or
+    ``1`` and ``1.0`` never share an entry. Decimals are keyed on their
+    value, exponent and sign together with the context settings, and are
+    only cached when the addition is exact, so rounding flags and traps
+    behave as without the cache. Unhashable values, NaNs and float or
+    complex zeros (where ``-0.0 == 0.0``) are passed to add_one uncached.
+    The cache can be shared between threads.
+
+    Args:
+        max_bytes: Upper bound on the estimated memory held by entries
+        function: The function to memoize; defaults to add_one
+
+    Raises:
+        ValueError: If max_bytes is negative
+
+    Examples:
+        >>> from decimal import Decimal
+        >>> cached = AddOneCache(max_bytes=1 << 20)
+        >>> cached(Decimal("1.50"))
+        Decimal('2.50')
+        >>> cached(Decimal("1.50"))
+        Decimal('2.50')
+        >>> cached.stats().hits
+        1
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, *, function=add_one):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.max_bytes = max_bytes
+        self.function = function
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = self._uncacheable = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, number):
+        key = _cache_key(number)
+        if key is None:
+            with self._lock:
+                self._uncacheable += 1
+            return self.function(number)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+        decimal = _decimal_type()
+        if decimal is not None and isinstance(number, decimal):
+            result = _exact_decimal_call(self.function, number)
+            if result is None:
+                # Redo the call in the caller's context so that its flags
+                # and traps see the signal exactly as without the cache.
+                with self._lock:
+                    self._uncacheable += 1
+                return self.function(number)
+        else:
+            result = self.function(number)
+        self._store(key, number, result)
+        return result
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, key, number, result):
+        size = sys.getsizeof(number) + sys.getsizeof(result) + ENTRY_OVERHEAD
+        with self._lock:
+            self._misses += 1
+            if size > self.max_bytes or key in self._entries:
+                return
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+
+    def stats(self):
+        """
+        Return the counters of the cache.
+
+        Returns:
+            A CacheStats tuple
+        """
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._uncacheable,
+                len(self._entries),
+                self._bytes,
+                self.max_bytes,
+            )
+
+    def clear(self):
+        """
+        Drop every entry and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = self._uncacheable = 0
+
+
+def _decimal_type():
+    # decimal is only imported by programs that use Decimals; before that
+    # no input can be one.
+    module = sys.modules.get("decimal")
+    return module.Decimal if module is not None else None
+
+
+def _cache_key(number):
+    """Return the cache key of number, or None if it must not be cached."""
+    kind = type(number)
+    # NaN never equals itself and -0.0 equals 0.0, so neither can be told
+    # apart from other entries by equality.
+    if isinstance(number, float):
+        if number != number or number == 0:
+            return None
+        return kind, number
+    if isinstance(number, complex):
+        if number != number or number.real == 0 or number.imag == 0:
+            return None
+        return kind, number
+    decimal = _decimal_type()
+    if decimal is not None and isinstance(number, decimal):
+        if number.is_nan():
+            return None
+        return _DecimalKey(number, sys.modules["decimal"].getcontext())
+    try:
+        hash(number)
+        if number != number:
+            return None
+    except Exception:
+        return None
+    return kind, number
+
+
+class _DecimalKey:
+    """Cache key of a Decimal: value, exponent, sign and context settings."""
+
+    # Decimals cache their hash, and same_quantum compares exponents
+    # without touching the digits, so building and hashing a key is
+    # constant time; as_tuple() would copy every digit.
+    __slots__ = ("number", "settings", "hash")
+
+    def __init__(self, number, context):
+        self.number = number
+        self.settings = (
+            context.prec,
+            context.rounding,
+            context.Emin,
+            context.Emax,
+            context.clamp,
+        )
+        self.hash = hash((type(number), number, self.settings))
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return (
+            type(other) is _DecimalKey
+            and type(self.number) is type(other.number)
+            and self.settings == other.settings
+            and self.number == other.number
+            and self.number.same_quantum(other.number)
+            and self.number.is_signed() == other.number.is_signed()
+        )
+
+
+def _exact_decimal_call(function, number):
+    """Call function on a Decimal; return None if the call signalled."""
+    decimal = sys.modules["decimal"]
+    with decimal.localcontext() as probe:
+        probe.clear_flags()
+        probe.clear_traps()
+        result = function(number)
+    if any(probe.flags.values()):
+        return None
+    return result
@@ -0,0 +1,140 @@
+"""
+Command-line interface for package_trial_zenjiro.
+
+The ``add-one`` command reads numbers, one per line, from standard input or
+files and writes each number plus one to standard output. Input is read in
+large blocks, every block is parsed, incremented and formatted as a batch,
+and the result is written with a single call, so memory use depends on the
+block size only. With ``--csv`` or ``--ndjson`` the input is a table instead
+and only the named column or field is rewritten.
+"""
+
+import argparse
+import sys
+from functools import partial
+
+from ._literals import PARSERS, format_lines, parse_lines
+from .main import add_one_many
+from .records import add_one_csv, add_one_ndjson
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+
+def main(argv=None):
+    """
+    Run the add-one command.
+
+    Args:
+        argv: Command-line arguments without the program name; defaults to
+            sys.argv[1:]
+
+    Returns:
+        The process exit status: 0 on success, 1 on invalid input or when a
+        file cannot be read or written
+    """
+    parser = argparse.ArgumentParser(
+        prog="add-one",
+        description="Add one to every number read from files or standard input.",
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        default=["-"],
+        help="input files, one number per line; '-' is standard input",
+    )
+    parser.add_argument(
+        "-t",
+        "--type",
+        choices=sorted(PARSERS),
+        default="auto",
+        help="how to read literals; 'auto' tries int, float, then complex",
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help="output file; '-' is standard output"
+    )
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=DEFAULT_BLOCK_SIZE,
+        help="bytes read per block (default: %(default)s)",
+    )
+    records = parser.add_mutually_exclusive_group()
+    records.add_argument(
+        "--csv",
+        metavar="COLUMN",
+        help="read CSV with a header and add one to the named column only",
+    )
+    records.add_argument(
+        "--ndjson",
+        metavar="FIELD",
+        help="read one JSON object per line and add one to the named field only",
+    )
+    parser.add_argument(
+        "--delimiter", default=",", help="CSV field delimiter (default: ',')"
+    )
+    args = parser.parse_args(argv)
+    if args.block_size < 1:
+        parser.error("--block-size must be at least 1")
+    if args.csv is not None:
+        transform = partial(
+            add_one_csv,
+            column=args.csv,
+            delimiter=args.delimiter,
+            kind=args.type,
+            block_size=args.block_size,
+        )
+    elif args.ndjson is not None:
+        transform = partial(
+            add_one_ndjson, field=args.ndjson, block_size=args.block_size
+        )
+    else:
+        transform = partial(_transform, kind=args.type, block_size=args.block_size)
+
+    output = None
+    try:
+        output = _open(args.output, "wb", sys.stdout)
+        for name in args.files:
+            source = _open(name, "rb", sys.stdin)
+            try:
+                transform(source, output)
+            finally:
+                if source is not sys.stdin.buffer:
+                    source.close()
+    except (ValueError, OSError) as error:
+        print(f"add-one: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if output is not None:
+            output.flush()
+            if output is not sys.stdout.buffer:
+                output.close()
+    return 0
+
+
+def _open(name, mode, standard_stream):
+    if name == "-":
+        return standard_stream.buffer
+    return open(name, mode)
+
+
+def _transform(source, output, kind, block_size):
+    line_number = 1
+    for lines in _read_blocks(source, block_size):
+        numbers = parse_lines(lines, kind, line_number)
+        output.write(format_lines(add_one_many(numbers)))
+        line_number += len(lines)
+
+
+def _read_blocks(source, block_size):
+    """Yield lists of complete lines, keeping a partial last line for later."""
+    pending = b""
+    while True:
+        block = source.read(block_size)
+        if not block:
+            break
+        lines = (pending + block).split(b"\n")
+        pending = lines.pop()
+        if lines:
+            yield lines
+    if pending:
+        yield [pending]
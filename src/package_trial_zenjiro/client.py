@@ -0,0 +1,478 @@
+"""
+Client of the add_one server for package_trial_zenjiro.
+
+AddOneClient keeps a pool of connections to a server started with the
+server module. Scalar calls from any number of threads are queued and a
+sender thread packs whatever has accumulated into one frame, so many small
+calls cost one round trip; frames are pipelined, and each connection has a
+reader thread that resolves responses in order. The module also holds the
+load generator behind ``add-one-server --benchmark``.
+"""
+
+import ast
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import Future, wait
+from functools import partial
+
+from . import _wire
+from .main import add_one, add_one_many
+
+DEFAULT_CONNECTIONS = 2
+DEFAULT_MAX_BATCH = 4096
+
+# Values per frame when add_one_many splits a large batch.
+FRAME_VALUES = 1 << 16
+
+
+class AddOneClient:
+    """
+    Pooled, pipelining client of an add_one server.
+
+    add_one and submit are coalesced: calls queued while the previous frame
+    is being sent travel together in the next one, up to ``max_batch``
+    values, and ``linger`` can hold a frame back briefly to collect more.
+    If a coalesced frame fails on the server, its values are retried one by
+    one so that only the offending call sees the error. add_one_many sends
+    its own frames directly. The client can be shared between threads.
+
+    Args:
+        address: The server address, a (host, port) pair or a Unix socket
+            path
+        connections: Number of pooled connections
+        max_batch: Largest number of coalesced values in one frame
+        linger: Seconds the sender waits for more values before sending a
+            frame that is not full
+        timeout: Seconds to wait for a connection or a result; None waits
+            forever
+
+    Raises:
+        ValueError: If connections or max_batch is below one or linger is
+            negative
+
+    Examples:
+        >>> from package_trial_zenjiro.server import serve
+        >>> server = serve()
+        >>> with AddOneClient(server.server_address) as client:
+        ...     client.add_one(41)
+        42
+        >>> server.shutdown()
+        >>> server.server_close()
+    """
+
+    def __init__(
+        self,
+        address,
+        *,
+        connections=DEFAULT_CONNECTIONS,
+        max_batch=DEFAULT_MAX_BATCH,
+        linger=0.0,
+        timeout=None,
+    ):
+        if connections < 1 or max_batch < 1:
+            raise ValueError("connections and max_batch must be at least 1")
+        if linger < 0:
+            raise ValueError("linger must be non-negative")
+        self.address = address
+        self.max_batch = max_batch
+        self.linger = linger
+        self.timeout = timeout
+        self._size = connections
+        self._pool = []
+        self._pool_lock = threading.Lock()
+        # Entries are (number, future, coalesce); values retried after a
+        # failed frame are queued again with coalesce False.
+        self._queue = deque()
+        self._ready = threading.Condition()
+        # Coalesced frames awaiting a response, which may queue retries.
+        self._inflight = 0
+        self._closed = False
+        self._disconnected = False
+        self._sender = threading.Thread(target=self._send_loop, daemon=True)
+        self._sender.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, number):
+        """
+        Queue one number to be sent in the next coalesced frame.
+
+        Args:
+            number: An int, float, complex or Decimal
+
+        Returns:
+            A concurrent.futures.Future resolving to add_one(number)
+
+        Raises:
+            RuntimeError: If the client is closed
+        """
+        future = Future()
+        with self._ready:
+            if self._closed:
+                raise RuntimeError("client is closed")
+            self._queue.append((number, future, True))
+            self._ready.notify()
+        return future
+
+    def add_one(self, number):
+        """
+        Return add_one(number) computed by the server.
+
+        Raises:
+            TypeError: If the value cannot be sent
+            ConnectionError: If the connection to the server fails
+            concurrent.futures.TimeoutError: If the result takes longer
+                than the client timeout
+        """
+        return self.submit(number).result(self.timeout)
+
+    def add_one_many(self, numbers):
+        """
+        Return add_one_many(numbers) computed by the server.
+
+        Large batches are split into frames of FRAME_VALUES values, which
+        are all sent before the first response is read.
+
+        Args:
+            numbers: An iterable of ints, floats and complex numbers, or of
+                Decimals
+
+        Returns:
+            A list of results in input order
+
+        Raises:
+            TypeError: If the values cannot be sent
+            ConnectionError: If the connection to the server fails
+        """
+        numbers = list(numbers)
+        requests = [
+            self._connection().request(*_wire.encode(numbers[i : i + FRAME_VALUES]))
+            for i in range(0, len(numbers), FRAME_VALUES)
+        ]
+        results = []
+        for request in requests:
+            results.extend(_wire.decode(*request.result(self.timeout)))
+        return results
+
+    def close(self):
+        """
+        Send the queued calls, wait for their results and disconnect.
+        """
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        self._sender.join()
+        with self._pool_lock:
+            self._disconnected = True
+            pool, self._pool = self._pool, []
+        for connection in pool:
+            connection.close(self.timeout)
+
+    def _connection(self):
+        """Return the pooled connection with the fewest frames in flight."""
+        with self._pool_lock:
+            if self._disconnected:
+                raise RuntimeError("client is closed")
+            self._pool = [c for c in self._pool if c.error is None]
+            if len(self._pool) < self._size and all(c.pending for c in self._pool):
+                self._pool.append(_Connection(self.address, self.timeout))
+            return min(self._pool, key=lambda c: len(c.pending))
+
+    def _send_loop(self):
+        while True:
+            with self._ready:
+                while not self._queue and not (self._closed and not self._inflight):
+                    self._ready.wait()
+                if not self._queue:
+                    return
+                retry = self._queue[0][2]
+                if not retry:
+                    # A value whose coalesced frame failed is sent alone, so
+                    # that only the call that caused the error sees it.
+                    batch = [self._queue.popleft()[:2]]
+                else:
+                    if self.linger and not self._closed:
+                        deadline = time.monotonic() + self.linger
+                        while len(self._queue) < self.max_batch and not self._closed:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                break
+                            self._ready.wait(remaining)
+                    batch = []
+                    while self._queue and self._queue[0][2]:
+                        if len(batch) == self.max_batch:
+                            break
+                        batch.append(self._queue.popleft()[:2])
+            if retry:
+                batch = [(n, f) for n, f in batch if f.set_running_or_notify_cancel()]
+            self._dispatch(batch, retry)
+
+    def _dispatch(self, batch, retry=True):
+        """Send a coalesced batch, one frame per group of sendable types."""
+        if not batch:
+            return
+        try:
+            frames = [(batch, _wire.encode([number for number, _ in batch]))]
+        except TypeError:
+            # Types that cannot share a frame, such as Decimal and int, are
+            # sent separately; unsendable ones fail on their own.
+            groups = {}
+            for item in batch:
+                groups.setdefault(type(item[0]), []).append(item)
+            frames = []
+            for items in groups.values():
+                try:
+                    frames.append((items, _wire.encode([n for n, _ in items])))
+                except TypeError as error:
+                    _fail(items, error)
+        for items, (kind, payload) in frames:
+            try:
+                request = self._connection().request(kind, payload)
+            except Exception as error:
+                _fail(items, error)
+                continue
+            if retry:
+                with self._ready:
+                    self._inflight += 1
+            request.add_done_callback(partial(self._resolve, items, retry))
+
+    def _resolve(self, items, retry, request):
+        # Runs on the connection's reader thread, which must not send: the
+        # values of a failed coalesced frame go back to the sender thread.
+        retried = ()
+        try:
+            results = _wire.decode(*request.result())
+        except Exception as error:
+            if retry and len(items) > 1 and not isinstance(error, ConnectionError):
+                retried = items
+            else:
+                _fail(items, error)
+        else:
+            for (_, future), result in zip(items, results):
+                future.set_result(result)
+        if retry:
+            with self._ready:
+                self._queue.extendleft((n, f, False) for n, f in reversed(retried))
+                self._inflight -= 1
+                self._ready.notify()
+
+
+def _fail(items, error):
+    for _, future in items:
+        future.set_exception(error)
+
+
+class _Connection:
+    """One socket with a reader thread resolving pipelined requests in order."""
+
+    def __init__(self, address, timeout):
+        if isinstance(address, (str, os.PathLike)):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            sock.connect(os.fspath(address))
+        else:
+            sock = socket.create_connection(address, timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(None)
+        self.socket = sock
+        self.pending = deque()
+        self.error = None
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(
+            target=self._read_loop, args=(sock.makefile("rb"),), daemon=True
+        )
+        self._reader.start()
+
+    def request(self, kind, payload):
+        future = Future()
+        data = _wire.frame(kind, payload)
+        with self._lock:
+            if self.error is not None:
+                raise self.error
+            self.pending.append(future)
+            try:
+                self.socket.sendall(data)
+            except OSError as error:
+                self.pending.pop()
+                self.error = ConnectionError(f"add_one server unreachable: {error}")
+                raise self.error from error
+        return future
+
+    def close(self, timeout=None):
+        wait(list(self.pending), timeout)
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.socket.close()
+
+    def _read_loop(self, stream):
+        error = ConnectionError("connection to the add_one server closed")
+        try:
+            while True:
+                response = _wire.read_frame(stream)
+                if response is None:
+                    break
+                self.pending.popleft().set_result(response)
+        except (OSError, ValueError) as exc:
+            error = ConnectionError(f"connection to the add_one server failed: {exc}")
+        finally:
+            stream.close()
+        with self._lock:
+            self.error = error
+            while self.pending:
+                self.pending.popleft().set_exception(error)
+
+
+LoadResult = namedtuple("LoadResult", "mode threads calls values seconds latencies")
+LoadResult.__doc__ = """
+Outcome of one load-generator run.
+
+Attributes:
+    mode: Description of what was called
+    threads: Number of calling threads
+    calls: Number of completed calls
+    values: Number of values processed by those calls
+    seconds: Wall-clock duration of the run
+    latencies: Sorted per-call latencies in seconds
+"""
+
+
+def run_load(mode, call, *, threads=8, duration=1.0):
+    """
+    Call ``call(i)`` from several threads for a fixed time.
+
+    Args:
+        mode: Description stored in the result
+        call: Function of the call index returning the number of values
+            it processed
+        threads: Number of calling threads
+        duration: Seconds to run
+
+    Returns:
+        A LoadResult
+    """
+    latencies = []
+    counts = []
+    lock = threading.Lock()
+    start = threading.Barrier(threads + 1)
+
+    def worker():
+        local, values = [], 0
+        start.wait()
+        deadline = time.perf_counter() + duration
+        clock = time.perf_counter
+        index = 0
+        while True:
+            began = clock()
+            if began >= deadline:
+                break
+            values += call(index)
+            local.append(clock() - began)
+            index += 1
+        with lock:
+            latencies.extend(local)
+            counts.append(values)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    seconds = time.perf_counter() - began
+    latencies.sort()
+    return LoadResult(mode, threads, len(latencies), sum(counts), seconds, latencies)
+
+
+def format_load_result(result):
+    """
+    Format a LoadResult as one line of throughput and latency percentiles.
+    """
+
+    def percentile(fraction):
+        if not result.latencies:
+            return float("nan")
+        position = min(len(result.latencies) - 1, int(fraction * len(result.latencies)))
+        return result.latencies[position] * 1e6
+
+    return (
+        f"{result.mode:<34} {result.values / result.seconds:>12,.0f} values/s"
+        f"  p50 {percentile(0.5):>8.1f} us  p99 {percentile(0.99):>8.1f} us"
+        f"  p99.9 {percentile(0.999):>8.1f} us"
+    )
+
+
+def run_load_benchmark(*, unix=None, threads=8, duration=1.0, batch=1000):
+    """
+    Compare a server process with in-process calls under the same load.
+
+    A server is started as a separate process on a Unix socket (a temporary
+    one unless ``unix`` is given; TCP where Unix sockets are unavailable),
+    and each mode runs for ``duration`` seconds with ``threads`` callers:
+    scalar add_one in-process and through the coalescing client, then
+    add_one_many of ``batch`` values in-process and through the client.
+
+    Returns:
+        A list of LoadResult, one per mode
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        if unix is None and hasattr(socket, "AF_UNIX"):
+            unix = os.path.join(directory, "add_one.sock")
+        options = ["--unix", unix] if unix else ["--port", "0"]
+        package = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [package, environment.get("PYTHONPATH")])
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-m", f"{__package__}.server", *options],
+            stdout=subprocess.PIPE,
+            env=environment,
+            text=True,
+        )
+        try:
+            line = process.stdout.readline()
+            address = line.removeprefix("listening on ").strip()
+            address = unix or ast.literal_eval(address)
+            values = list(range(batch))
+            with AddOneClient(address, connections=threads) as client:
+                modes = [
+                    ("in-process add_one", partial(_scalar, add_one)),
+                    ("server add_one (coalesced)", partial(_scalar, client.add_one)),
+                    (
+                        f"in-process add_one_many x{batch}",
+                        partial(_batch, add_one_many, values),
+                    ),
+                    (
+                        f"server add_one_many x{batch}",
+                        partial(_batch, client.add_one_many, values),
+                    ),
+                ]
+                return [
+                    run_load(mode, call, threads=threads, duration=duration)
+                    for mode, call in modes
+                ]
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def _scalar(function, index):
+    function(index)
+    return 1
+
+
+def _batch(function, values, index):
+    return len(function(values))
@@ -0,0 +1,198 @@
+"""
+Cross-thread request coalescer for package_trial_zenjiro.
+
+Code that calls add_one one value at a time from many threads, such as web
+request handlers, never reaches the batch kernels. AddOneCoalescer collects
+concurrent scalar calls, runs them as one batch on a worker thread and hands
+every caller its own result through a future. Batches adapt to load by
+themselves: a call arriving at an idle worker runs at once, while calls
+arriving during a batch are collected into the next one, so a quiet system
+adds no waiting and a busy one runs fewer, larger batches. An optional
+window lets the worker also wait for more calls; it opens only under load
+and grows or closes depending on whether waiting brought in calls.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from .main import add_one, add_one_many
+
+DEFAULT_MAX_BATCH = 1024
+DEFAULT_MAX_WAIT = 0.0
+
+# The first window opened once calls queue up behind a running batch, as a
+# fraction of max_wait; windows below it close again.
+_MIN_WINDOW_FRACTION = 1 / 16
+
+
+class AddOneCoalescer:
+    """
+    Batch concurrent scalar add_one calls into calls of a batch function.
+
+    Every batch takes all queued calls, up to ``max_batch``. With a
+    positive ``max_wait``, the window is adapted after each batch: once
+    calls queue up behind a running batch, the next batch waits up to a
+    small window for more, and the window doubles, up to ``max_wait``, while
+    waiting at least doubles the batch and halves until it closes when
+    waiting brings in nothing. Waiting also ends early when a quarter of
+    the window passes without a new call. Callers that block on their
+    result cannot arrive during a window, so the default keeps it closed;
+    a window pays off for callers that submit without waiting. If the batch
+    function raises, the calls of that batch are retried one at a time
+    with ``scalar``, so only the offending call sees the error. The
+    coalescer can be shared between threads.
+
+    Args:
+        batch: Function mapping a list of numbers to the list of their
+            results; defaults to add_one_many
+        scalar: Function used to retry the calls of a failed batch one at a
+            time; defaults to add_one
+        max_batch: Largest number of calls in one batch
+        max_wait: Longest window in seconds that a batch waits for more
+            calls; 0 never waits
+
+    Raises:
+        ValueError: If max_batch is below one or max_wait is negative
+
+    Examples:
+        >>> with AddOneCoalescer() as coalescer:
+        ...     futures = [coalescer.submit(n) for n in (1, 2.5, 3j)]
+        ...     [future.result() for future in futures]
+        [2, 3.5, (1+3j)]
+    """
+
+    def __init__(
+        self,
+        batch=add_one_many,
+        scalar=add_one,
+        *,
+        max_batch=DEFAULT_MAX_BATCH,
+        max_wait=DEFAULT_MAX_WAIT,
+    ):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if max_wait < 0:
+            raise ValueError("max_wait must be non-negative")
+        self.batch = batch
+        self.scalar = scalar
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.window = 0.0
+        self._queue = deque()
+        self._ready = threading.Condition()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, number):
+        """
+        Queue one number for the next batch.
+
+        Args:
+            number: A value accepted by the batch function
+
+        Returns:
+            A concurrent.futures.Future resolving to the result for number
+
+        Raises:
+            RuntimeError: If the coalescer is closed
+        """
+        future = Future()
+        with self._ready:
+            if self._closed:
+                raise RuntimeError("coalescer is closed")
+            self._queue.append((number, future))
+            if len(self._queue) == 1 or len(self._queue) >= self.max_batch:
+                self._ready.notify()
+        return future
+
+    def add_one(self, number):
+        """
+        Return the result for number, computed in a shared batch.
+
+        Raises:
+            Whatever the batch function raises for number
+        """
+        return self.submit(number).result()
+
+    def close(self):
+        """
+        Run the queued calls and stop the worker thread.
+        """
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        self._worker.join()
+
+    def _run(self):
+        while True:
+            with self._ready:
+                while not self._queue and not self._closed:
+                    self._ready.wait()
+                if not self._queue:
+                    return
+                queued = len(self._queue)
+                if self.window and queued < self.max_batch and not self._closed:
+                    # The window closes early once a quarter of it passes
+                    # without a new call: blocked callers cannot add more.
+                    deadline = time.monotonic() + self.window
+                    gap = self.window / 4
+                    while len(self._queue) < self.max_batch and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        waiting = len(self._queue)
+                        self._ready.wait(min(gap, remaining))
+                        if len(self._queue) == waiting:
+                            break
+                count = min(len(self._queue), self.max_batch)
+                items = [self._queue.popleft() for _ in range(count)]
+            self._adapt(queued, count)
+            self._execute(
+                [(n, f) for n, f in items if f.set_running_or_notify_cancel()]
+            )
+
+    def _adapt(self, queued, count):
+        """Resize the window from the calls that arrived while it was open."""
+        floor = self.max_wait * _MIN_WINDOW_FRACTION
+        if not self.window:
+            # Calls that queued up behind the previous batch show that
+            # callers are arriving faster than batches complete.
+            if queued > 1:
+                self.window = floor
+        elif count >= 2 * queued:
+            self.window = min(self.window * 2, self.max_wait)
+        elif count == queued:
+            self.window /= 2
+            if self.window < floor:
+                self.window = 0.0
+
+    def _execute(self, items):
+        if not items:
+            return
+        try:
+            results = self.batch([number for number, _ in items])
+            if len(results) != len(items):
+                raise ValueError(
+                    f"batch function returned {len(results)} results "
+                    f"for {len(items)} values"
+                )
+        except Exception:
+            for number, future in items:
+                try:
+                    result = self.scalar(number)
+                except Exception as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            return
+        for (_, future), result in zip(items, results):
+            future.set_result(result)
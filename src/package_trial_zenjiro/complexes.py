@@ -0,0 +1,170 @@
+"""
+Interleaved complex engine for package_trial_zenjiro.
+
+This module adds one to complex numbers stored as float64 lanes, either
+interleaved (real, imag, real, imag, ...) in one buffer or as two parallel
+buffers of real and imaginary parts. Each lane is handled with slice
+operations on array('d') in bounded chunks instead of one heap object per
+complex number, and the results are bit-for-bit those of add_one.
+"""
+
+import math
+import sys
+from array import array
+from operator import attrgetter
+
+from .buffer import DEFAULT_CHUNK_BYTES, _byte_view
+
+# complex + int adds 0.0 to the imaginary part on interpreters that convert
+# the int to a complex first, turning -0.0 into 0.0 and quieting signalling
+# NaNs; newer interpreters leave the imaginary part alone. Mirror whichever
+# the running interpreter does so results match add_one exactly.
+IMAG_ADDS_ZERO = math.copysign(1.0, (complex(0.0, -0.0) + 1).imag) > 0
+
+# Adding 0.0 only changes -0.0 (top byte 0x80) and signalling NaNs (top byte
+# 0x7F or 0xFF). Lanes whose top byte is none of these can be left alone, so
+# a chunk is only boxed when one of its top bytes matches.
+_TOP_BYTE = 7 if sys.byteorder == "little" else 0
+_TOP_BYTES_CHANGED_BY_ZERO = (b"\x80", b"\x7f", b"\xff")
+
+
+def add_one_interleaved(source, out=None, *, chunk_bytes=None):
+    """
+    Add one to complex numbers stored as interleaved float64 pairs.
+
+    Args:
+        source: A C-contiguous buffer of float64 values, real part first
+        out: Optional writable buffer of the same size; without it
+            ``source`` is rewritten in place
+        chunk_bytes: Number of bytes processed per step
+
+    Returns:
+        The buffer that received the results (``out`` or ``source``)
+
+    Raises:
+        TypeError: If a buffer is not float64 or the target is read-only
+        ValueError: If the buffer does not hold whole (real, imag) pairs or
+            the buffers differ in size
+
+    Examples:
+        >>> add_one_interleaved(array("d", [1.0, 2.0, -0.5, 0.0]))
+        array('d', [2.0, 2.0, 0.5, 0.0])
+    """
+    _, src = _byte_view(source, "d")
+    dst = src
+    try:
+        if out is not None:
+            _, dst = _byte_view(out, "d")
+            if dst.nbytes != src.nbytes:
+                raise ValueError("output buffer size does not match the source")
+        if dst.readonly:
+            raise TypeError("cannot write add_one results to a read-only buffer")
+        if src.nbytes % 16:
+            raise ValueError("interleaved buffer must hold whole (real, imag) pairs")
+        step = max(16, (chunk_bytes or DEFAULT_CHUNK_BYTES) // 16 * 16)
+        for start in range(0, src.nbytes, step):
+            stop = min(start + step, src.nbytes)
+            values = array("d")
+            values.frombytes(src[start:stop])
+            values[0::2] = _plus_one(values[0::2])
+            if IMAG_ADDS_ZERO and _may_change(values, 8 + _TOP_BYTE, 16):
+                values[1::2] = _plus_zero(values[1::2])
+            dst[start:stop] = memoryview(values).cast("B")
+    finally:
+        src.release()
+        dst.release()
+    return source if out is None else out
+
+
+def add_one_complex_parts(real, imag):
+    """
+    Add one to complex numbers stored as parallel real and imaginary arrays.
+
+    Both arrays are updated in place.
+
+    Args:
+        real: array('d') of real parts
+        imag: array('d') of imaginary parts, the same length as ``real``
+
+    Returns:
+        The ``(real, imag)`` pair
+
+    Raises:
+        ValueError: If the arrays differ in length
+
+    Examples:
+        >>> add_one_complex_parts(array("d", [1.0]), array("d", [2.0]))
+        (array('d', [2.0]), array('d', [2.0]))
+    """
+    if len(real) != len(imag):
+        raise ValueError("real and imaginary parts must have the same length")
+    real[:] = _plus_one(real)
+    if IMAG_ADDS_ZERO and _may_change(imag, _TOP_BYTE, 8):
+        imag[:] = _plus_zero(imag)
+    return real, imag
+
+
+def pack_complex(numbers):
+    """
+    Convert complex numbers into an interleaved array('d').
+
+    Args:
+        numbers: An iterable of complex numbers
+
+    Returns:
+        array('d') holding real and imaginary parts alternately
+
+    Examples:
+        >>> pack_complex([1 + 2j, 3j])
+        array('d', [1.0, 2.0, 0.0, 3.0])
+    """
+    numbers = list(numbers)
+    packed = array("d", bytes(16 * len(numbers)))
+    packed[0::2] = array("d", map(_REAL, numbers))
+    packed[1::2] = array("d", map(_IMAG, numbers))
+    return packed
+
+
+def unpack_complex(buffer):
+    """
+    Convert an interleaved float64 buffer into a list of complex numbers.
+
+    The parts are passed to ``complex()`` as floats, which keeps their bits,
+    including signed zeros and NaN payloads.
+
+    Args:
+        buffer: A buffer of float64 values, real part first
+
+    Returns:
+        A list of complex numbers
+
+    Raises:
+        ValueError: If the buffer does not hold whole (real, imag) pairs
+
+    Examples:
+        >>> unpack_complex(array("d", [2.0, 2.0]))
+        [(2+2j)]
+    """
+    values = array("d")
+    values.frombytes(memoryview(buffer).cast("B"))
+    if len(values) % 2:
+        raise ValueError("interleaved buffer must hold whole (real, imag) pairs")
+    return list(map(complex, values[0::2], values[1::2]))
+
+
+_REAL = attrgetter("real")
+_IMAG = attrgetter("imag")
+
+
+def _plus_one(lane):
+    return array("d", [value + 1.0 for value in lane])
+
+
+def _plus_zero(lane):
+    return array("d", [value + 0.0 for value in lane])
+
+
+def _may_change(values, offset, stride):
+    """Tell whether adding 0.0 could change any lane of ``values``."""
+    top_bytes = memoryview(values).cast("B")[offset::stride].tobytes()
+    return any(byte in top_bytes for byte in _TOP_BYTES_CHANGED_BY_ZERO)
@@ -0,0 +1,153 @@
+"""
+Mutable big-integer counter for package_trial_zenjiro.
+
+Python ints are immutable, so every add_one on a huge int allocates a new
+int of the same size: incrementing a 10,000-digit counter costs time
+proportional to its digits at every step. BigCounter keeps the value as a
+large base that is left untouched and a small delta that absorbs the
+increments. An increment only touches the delta, and the two are added back
+together when the value is read or once the delta itself grows large, so
+increments cost O(1) amortized whatever the size of the counter.
+"""
+
+from functools import total_ordering
+from operator import index
+
+# The delta is folded into the base once its magnitude reaches this bound,
+# keeping it a machine-word-sized int.
+FOLD_AT = 1 << 60
+
+_new = object.__new__
+
+
+@total_ordering
+class BigCounter:
+    """
+    Arbitrary-precision integer that is incremented in place.
+
+    ``counter += n`` and increment() change the counter itself, while
+    ``counter + n`` (and so add_one) returns a new counter sharing the same
+    base, also in O(1). Reading the value with int(), str(), comparisons or
+    hash() folds the pending increments into the base once; later reads are
+    free until the next increment. Counters compare and hash like the int
+    they hold, so a counter must not be changed while it is a set member or
+    dictionary key. A counter is not safe to increment from several threads
+    at once.
+
+    Args:
+        value: The initial value, an int or any object with __index__
+
+    Raises:
+        TypeError: If value is not an integer
+
+    Examples:
+        >>> counter = BigCounter(10**10000)
+        >>> for _ in range(1000):
+        ...     counter += 1
+        >>> int(counter) == 10**10000 + 1000
+        True
+        >>> from package_trial_zenjiro.main import add_one
+        >>> add_one(BigCounter(41))
+        BigCounter(42)
+    """
+
+    __slots__ = ("_base", "_delta")
+
+    def __init__(self, value=0):
+        self._base = index(value)
+        self._delta = 0
+
+    def increment(self, amount=1):
+        """
+        Add an integer to the counter in place.
+
+        Args:
+            amount: The integer to add; defaults to one
+
+        Returns:
+            The counter itself
+
+        Raises:
+            TypeError: If amount is not an integer
+        """
+        delta = self._delta + index(amount)
+        if -FOLD_AT < delta < FOLD_AT:
+            self._delta = delta
+        else:
+            self._base += delta
+            self._delta = 0
+        return self
+
+    def __iadd__(self, other):
+        if other.__class__ is int:
+            # Fast path of increment() for the common ``counter += 1``.
+            delta = self._delta + other
+            if -FOLD_AT < delta < FOLD_AT:
+                self._delta = delta
+                return self
+        try:
+            return self.increment(other)
+        except TypeError:
+            return NotImplemented
+
+    def __isub__(self, other):
+        try:
+            return self.increment(-index(other))
+        except TypeError:
+            return NotImplemented
+
+    def __add__(self, other):
+        try:
+            amount = index(other)
+        except TypeError:
+            # Floats, Fractions and other numbers see the counter as an int.
+            return self.__index__() + other
+        result = _new(BigCounter)
+        result._base = self._base
+        result._delta = 0
+        return result.increment(self._delta + amount)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        try:
+            amount = index(other)
+        except TypeError:
+            return self.__index__() - other
+        return self + -amount
+
+    def __rsub__(self, other):
+        return other - self.__index__()
+
+    def __index__(self):
+        if self._delta:
+            self._base += self._delta
+            self._delta = 0
+        return self._base
+
+    __int__ = __index__
+
+    def __float__(self):
+        return float(self.__index__())
+
+    def __bool__(self):
+        return bool(self.__index__())
+
+    def __eq__(self, other):
+        return self.__index__() == _value(other)
+
+    def __lt__(self, other):
+        return self.__index__() < _value(other)
+
+    def __hash__(self):
+        return hash(self.__index__())
+
+    def __str__(self):
+        return str(self.__index__())
+
+    def __repr__(self):
+        return f"BigCounter({self.__index__()})"
+
+
+def _value(number):
+    return number.__index__() if isinstance(number, BigCounter) else number
@@ -0,0 +1,95 @@
+"""
+Batch engine for exact numeric types in package_trial_zenjiro.
+
+This module adds one to batches of Decimal and Fraction values faster than
+``number + 1`` while returning identical results. Decimal additions reuse a
+single pre-built Decimal(1) operand under the current context, so rounding
+and precision are exactly those of add_one. Fraction additions build the
+result directly: n/d + 1 is (n + d)/d, which is already in lowest terms when
+n/d is, so the gcd normalisation of the general path is skipped.
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+
+_DECIMAL_ONE = Decimal(1)
+
+# Fraction keeps its reduced numerator and denominator in these two slots on
+# every supported Python version; without them the generic path is used.
+_FRACTION_SLOTS = hasattr(Fraction(1), "_numerator") and hasattr(
+    Fraction(1), "_denominator"
+)
+
+
+def add_one_decimals(numbers):
+    """
+    Add one to every number of a batch of Decimal values.
+
+    The current decimal context applies to every element, exactly as in
+    add_one. Elements that are not exactly Decimal go through ``number + 1``.
+
+    Args:
+        numbers: An iterable of Decimal values
+
+    Returns:
+        A list with add_one applied to each element, in input order
+
+    Raises:
+        TypeError: If any element is not a numeric type
+        decimal.InvalidOperation: For signalling NaNs, as in add_one
+
+    Examples:
+        >>> add_one_decimals([Decimal("1.10"), Decimal("-0.5")])
+        [Decimal('2.10'), Decimal('0.5')]
+    """
+    one = _DECIMAL_ONE
+    return [
+        number + one if number.__class__ is Decimal else number + 1
+        for number in numbers
+    ]
+
+
+def add_one_fractions(numbers):
+    """
+    Add one to every number of a batch of Fraction values.
+
+    Adding an integer never changes whether a fraction is in lowest terms,
+    so each result is built from the input's numerator and denominator
+    without another gcd. Elements that are not exactly Fraction go through
+    ``number + 1``.
+
+    Args:
+        numbers: An iterable of Fraction values
+
+    Returns:
+        A list with add_one applied to each element, in input order
+
+    Raises:
+        TypeError: If any element is not a numeric type
+
+    Examples:
+        >>> add_one_fractions([Fraction(3, 2), Fraction(-1, 3)])
+        [Fraction(5, 2), Fraction(2, 3)]
+    """
+    if not _FRACTION_SLOTS:  # pragma: no cover
+        return [number + 1 for number in numbers]
+    return [
+        (
+            _coprime_fraction(
+                number._numerator + number._denominator, number._denominator
+            )
+            if number.__class__ is Fraction
+            else number + 1
+        )
+        for number in numbers
+    ]
+
+
+def _coprime_fraction(numerator, denominator, _new=object.__new__):
+    fraction = _new(Fraction)
+    fraction._numerator = numerator
+    fraction._denominator = denominator
+    return fraction
+
+
+BATCH_KERNELS = {Decimal: add_one_decimals, Fraction: add_one_fractions}
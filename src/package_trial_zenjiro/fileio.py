@@ -0,0 +1,138 @@
+"""
+Memory-mapped file engine for package_trial_zenjiro.
+
+This module applies add_one to binary files of fixed-width numbers, such as
+a raw dump of little-endian int64 or float64 values. The file is mapped one
+window at a time, each window is processed by the buffer engine and then
+unmapped, so only a window's worth of pages is touched at once however large
+the file is.
+"""
+
+import mmap
+import os
+import sys
+import time
+from array import array
+from collections import namedtuple
+from struct import calcsize
+
+from .buffer import TYPECODES, add_one_buffer
+
+DEFAULT_WINDOW_BYTES = 1 << 24
+
+
+class FileStats(namedtuple("FileStats", "bytes seconds")):
+    """Amount of data processed by add_one_file and the time it took."""
+
+    __slots__ = ()
+
+    @property
+    def bytes_per_second(self):
+        """Throughput in bytes per second, or 0.0 for an empty file."""
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+def add_one_file(
+    source,
+    destination=None,
+    *,
+    typecode="q",
+    byteorder="little",
+    window_bytes=DEFAULT_WINDOW_BYTES,
+):
+    """
+    Add one to every value of a binary file of fixed-width numbers.
+
+    Without ``destination`` the file is rewritten in place, as it is when
+    ``destination`` names the source file itself, for example through a
+    link. Otherwise the destination is created or truncated to the size of
+    the source and receives the results. Windows are rounded to the mapping
+    granularity of the platform so every mapping starts on a page boundary.
+
+    Args:
+        source: Path of the input file
+        destination: Optional path of the output file
+        typecode: Element type, one of the buffer engine's TYPECODES
+        byteorder: Byte order of the values in the file, "little" or "big"
+        window_bytes: Number of bytes mapped and processed at a time
+
+    Returns:
+        FileStats with the number of bytes processed and the elapsed time
+
+    Raises:
+        TypeError: If the typecode is not supported
+        ValueError: If the file size is not a multiple of the item size or
+            byteorder is invalid
+        OverflowError: If an integer value is already at its maximum; the
+            windows before it have been written at that point
+        OSError: If a file cannot be opened or mapped
+    """
+    if typecode not in TYPECODES:
+        raise TypeError(f"unsupported element type {typecode!r}")
+    if byteorder not in ("little", "big"):
+        raise ValueError("byteorder must be 'little' or 'big'")
+    itemsize = calcsize(typecode)
+    granularity = mmap.ALLOCATIONGRANULARITY
+    window = max(granularity, window_bytes // granularity * granularity)
+    swap = byteorder != sys.byteorder
+    if destination is not None and _same_file(source, destination):
+        # Opening the destination for writing would truncate the source
+        # before it is read.
+        destination = None
+
+    started = time.perf_counter()
+    with open(source, "rb" if destination is not None else "r+b") as src:
+        size = os.fstat(src.fileno()).st_size
+        if size % itemsize:
+            raise ValueError(f"file size is not a multiple of the {typecode!r} size")
+        if destination is None:
+            _process_windows(src, src, size, window, typecode, swap)
+        else:
+            with open(destination, "w+b") as dst:
+                dst.truncate(size)
+                _process_windows(src, dst, size, window, typecode, swap)
+    return FileStats(size, time.perf_counter() - started)
+
+
+def _same_file(source, destination):
+    try:
+        return os.path.samefile(source, destination)
+    except FileNotFoundError:
+        return False
+
+
+def _process_windows(src, dst, size, window, typecode, swap):
+    in_place = src is dst
+    for offset in range(0, size, window):
+        length = min(window, size - offset)
+        src_map = mmap.mmap(
+            src.fileno(),
+            length,
+            access=mmap.ACCESS_WRITE if in_place else mmap.ACCESS_READ,
+            offset=offset,
+        )
+        dst_map = (
+            src_map if in_place else mmap.mmap(dst.fileno(), length, offset=offset)
+        )
+        try:
+            if hasattr(src_map, "madvise"):
+                src_map.madvise(mmap.MADV_SEQUENTIAL)
+            if swap:
+                _add_one_swapped(src_map, dst_map, typecode)
+            else:
+                add_one_buffer(
+                    src_map, None if in_place else dst_map, typecode=typecode
+                )
+        finally:
+            if dst_map is not src_map:
+                dst_map.close()
+            src_map.close()
+
+
+def _add_one_swapped(src_map, dst_map, typecode):
+    values = array(typecode)
+    values.frombytes(src_map)
+    values.byteswap()
+    add_one_buffer(values)
+    values.byteswap()
+    dst_map[:] = values.tobytes()
@@ -0,0 +1,119 @@
+"""
+Fixed-width integer engine for package_trial_zenjiro.
+
+add_one promotes ``2**63 - 1`` to a wider Python int. This module instead
+adds one within a fixed-width integer type, int8 to int64 signed or
+unsigned, and applies an overflow policy to elements already at the maximum:
+wrap to the minimum, saturate at the maximum, or raise naming the index.
+Values go through the packed-lane buffer engine, so overflow is detected for
+a whole chunk with a few big-int operations, not per element.
+"""
+
+from array import array
+from struct import calcsize
+
+from .buffer import (
+    OVERFLOW_POLICIES,
+    SIGNED_TYPECODES,
+    UNSIGNED_TYPECODES,
+    add_one_buffer,
+)
+
+
+def _typecode(codes, bits):
+    return next(code for code in codes if calcsize(code) * 8 == bits)
+
+
+# Fixed-width type name -> array typecode of exactly that width.
+FIXED_TYPES = {
+    f"{prefix}{bits}": _typecode(codes, bits)
+    for prefix, codes in (("int", SIGNED_TYPECODES), ("uint", UNSIGNED_TYPECODES))
+    for bits in (8, 16, 32, 64)
+}
+
+
+def add_one_fixed(data, dtype, *, overflow="raise", out=None):
+    """
+    Add one to integers as values of a fixed-width type.
+
+    ``data`` is either a buffer or a sequence of Python ints. A typed buffer
+    (such as an array.array or a cast memoryview) must hold elements of
+    ``dtype``; a raw byte buffer (bytes-like, bytearray, mmap) is read as
+    packed values of ``dtype`` in native byte order. Buffers are rewritten
+    in place unless ``out`` is given, as with add_one_buffer.
+
+    Args:
+        data: A buffer, or a sequence of ints within the range of dtype
+        dtype: A key of FIXED_TYPES, such as "int32" or "uint8"
+        overflow: "raise", "wrap" (the maximum becomes the minimum) or
+            "saturate" (the maximum stays the maximum)
+        out: Optional writable buffer that receives the results
+
+    Returns:
+        The buffer that received the results, or a list of ints for a
+        sequence input
+
+    Raises:
+        KeyError: If dtype is unknown
+        TypeError: If a typed buffer does not hold dtype elements
+        ValueError: If the overflow policy is unknown
+        OverflowError: If an input value is out of range for dtype, or an
+            element overflows and overflow is "raise"; the message gives
+            the index
+
+    Examples:
+        >>> add_one_fixed([1, 2**31 - 1], "int32", overflow="wrap")
+        [2, -2147483648]
+        >>> add_one_fixed([254, 255], "uint8", overflow="saturate")
+        [255, 255]
+        >>> add_one_fixed([0, 127], "int8")
+        Traceback (most recent call last):
+            ...
+        OverflowError: add_one overflows 'b' element at index 1
+    """
+    typecode = FIXED_TYPES[dtype]
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+    try:
+        memoryview(data).release()
+    except TypeError:
+        source = _pack(data, typecode, dtype)
+    else:
+        source = data
+    for buffer in (source, out):
+        if buffer is not None:
+            with memoryview(buffer) as view:
+                _check_format(view.format, typecode, dtype)
+    result = add_one_buffer(source, out, typecode=typecode, overflow=overflow)
+    return result.tolist() if result is not data and out is None else result
+
+
+def _check_format(fmt, typecode, dtype):
+    code = fmt.lstrip("@=")
+    # Raw bytes are reinterpreted; typed elements must already be dtype.
+    if code in ("B", "c"):
+        return
+    if (
+        code not in SIGNED_TYPECODES + UNSIGNED_TYPECODES
+        or calcsize(code) != calcsize(typecode)
+        or (code in SIGNED_TYPECODES) != (typecode in SIGNED_TYPECODES)
+    ):
+        raise TypeError(f"buffer of {fmt!r} elements is not {dtype}")
+
+
+def _pack(data, typecode, dtype):
+    data = data if isinstance(data, (list, tuple)) else list(data)
+    try:
+        return array(typecode, data)
+    except OverflowError:
+        pass
+    # Only reached on error: find the offending value for the message.
+    probe = array(typecode, [0])
+    for index, value in enumerate(data):
+        try:
+            probe[0] = value
+        except OverflowError:
+            raise OverflowError(
+                f"value {value} at index {index} is out of range for {dtype}"
+            ) from None
+    raise AssertionError("unreachable")  # pragma: no cover
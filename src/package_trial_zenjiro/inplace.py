@@ -0,0 +1,66 @@
+"""
+In-place engine for package_trial_zenjiro.
+
+This module overwrites the elements of a mutable container with add_one
+of themselves instead of building a second container. Writable buffers
+go through the buffer engine; lists are rewritten one bounded slice at a
+time, so the old element objects are released while the new ones are
+created and peak memory stays close to that of the input alone.
+"""
+
+from struct import calcsize
+
+from .buffer import _byte_view, add_one_buffer
+from .main import add_one_many
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def add_one_inplace(data, *, chunk_size=DEFAULT_CHUNK_SIZE, typecode=None):
+    """
+    Add one to every element of a mutable sequence or writable buffer in place.
+
+    Args:
+        data: A list or other mutable sequence, or a writable C-contiguous
+            buffer such as bytearray, array.array or a memoryview
+        chunk_size: Number of list elements replaced per slice assignment
+        typecode: Element type used to reinterpret raw byte buffers, as in
+            add_one_buffer
+
+    Returns:
+        The number of elements overwritten
+
+    Raises:
+        TypeError: If data is immutable or an element is not numeric
+        ValueError: If chunk_size is smaller than 1
+        OverflowError: If a fixed-width buffer element is at its maximum
+
+    Examples:
+        >>> data = [1, 2.5, 3j]
+        >>> add_one_inplace(data)
+        3
+        >>> data
+        [2, 3.5, (1+3j)]
+        >>> add_one_inplace(bytearray(b"abc"))
+        3
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    try:
+        memoryview(data).release()
+    except TypeError:
+        pass
+    else:
+        code, raw = _byte_view(data, typecode)
+        count = raw.nbytes // calcsize(code)
+        raw.release()
+        add_one_buffer(data, typecode=typecode)
+        return count
+    if isinstance(data, list):
+        for start in range(0, len(data), chunk_size):
+            stop = start + chunk_size
+            data[start:stop] = add_one_many(data[start:stop])
+        return len(data)
+    for index in range(len(data)):
+        data[index] = data[index] + 1
+    return len(data)
@@ -1,3 +1,11 @@
+from operator import add
+
+from .registry import add_one_runs, has_increment
+
+# Metrics recorder installed by metrics.enable(); None while metrics are off.
+_probe = None
+
+
 def add_one(number):
     """
     Add one to the given number.
@@ -25,3 +33,111 @@ def add_one(number):
         (2+2j)
     """
     return number + 1
+
+
+# metrics.enable() swaps this code into add_one and metrics.disable() puts
+# the original back, so the disabled add_one carries no recorder check.
+_ADD_ONE_CODE = add_one.__code__
+
+
+def _add_one_recorded(number):
+    probe = _probe
+    if probe is None:
+        # disable() cleared the probe while this call was starting.
+        return number + 1
+    return probe.call("scalar", type(number), 1, 0, add, number, 1)
+
+
+def add_one_many(numbers):
+    """
+    Add one to every number in an iterable.
+
+    The batch is dispatched once on the type of its first element to a kernel
+    specialized for that type, so the per-element cost is a single addition
+    instead of a Python-level call to add_one. Every element still gets
+    exactly the result add_one would return for it, even in mixed batches.
+
+    Args:
+        numbers: An iterable or sequence of numeric values
+
+    Returns:
+        A list with add_one applied to each element, in input order
+
+    Raises:
+        TypeError: If any element is not a numeric type
+
+    Examples:
+        >>> add_one_many([1, 2, 3])
+        [2, 3, 4]
+        >>> add_one_many((0.5, -0.0))
+        [1.5, 1.0]
+        >>> add_one_many(x for x in [True, 1+2j])
+        [2, (2+2j)]
+    """
+    probe = _probe
+    if not isinstance(numbers, (list, tuple)):
+        if numbers.__class__ is range and probe is None:
+            # Shifting the bounds yields the same ints without an addition
+            # per element.
+            return list(range(numbers.start + 1, numbers.stop + 1, numbers.step))
+        numbers = list(numbers)
+    if not numbers:
+        return []
+    kind = type(numbers[0])
+    kernel = _BATCH_KERNELS.get(kind)
+    if kernel is None:
+        kernel = _resolve_kernel(kind)
+    if probe is not None:
+        return probe.call("many", kind, len(numbers), 0, kernel, numbers)
+    return kernel(numbers)
+
+
+# Each kernel is its own call site, so the interpreter's inline cache for the
+# addition stays specialized for the batch type instead of thrashing between
+# int, float and complex operands.
+
+
+def _add_one_ints(numbers):
+    return [number + 1 for number in numbers]
+
+
+def _add_one_floats(numbers):
+    # float + 1.0 skips the int-to-float coercion of float + 1 and gives the
+    # same IEEE result, including -0.0, inf and NaN payloads.
+    return [
+        number + 1.0 if number.__class__ is float else number + 1 for number in numbers
+    ]
+
+
+def _add_one_complexes(numbers):
+    return [number + 1 for number in numbers]
+
+
+def _add_one_generic(numbers):
+    return [number + 1 for number in numbers]
+
+
+_BATCH_KERNELS = {
+    bool: _add_one_ints,
+    int: _add_one_ints,
+    float: _add_one_floats,
+    complex: _add_one_complexes,
+}
+
+
+def _resolve_kernel(kind):
+    # Kernels for Decimal and Fraction live in the exact module. An element
+    # of either type means its module is already imported, so batches that
+    # never contain one do not pay for importing decimal or fractions.
+    # Other types with a registered increment handler are processed run by
+    # run, so each run of equal types shares one handler lookup.
+    if kind.__module__ in ("decimal", "fractions"):
+        from .exact import BATCH_KERNELS
+
+        kernel = BATCH_KERNELS.get(kind)
+        if kernel is not None:
+            _BATCH_KERNELS[kind] = kernel
+            return kernel
+    if has_increment(kind):
+        return add_one_runs
+    return _add_one_generic
@@ -0,0 +1,305 @@
+"""
+Metrics for package_trial_zenjiro.
+
+This module counts the calls, elements and bytes that go through the
+engines of the package, by engine and input type, and records the latency
+of every call in a log-linear histogram. Metrics are off by default: each
+instrumented module holds a ``_probe`` global that is None until enable()
+is called, so the disabled cost of a batch is one global lookup and
+comparison. add_one itself has no check at all; enable() swaps a recording
+code object into it and disable() restores the original.
+
+Engines that delegate to another engine are counted by both; for example
+a threaded batch also shows up as the add_one_many calls of its slices,
+and add_one_file shows up as add_one_buffer calls per window.
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from importlib import import_module
+from struct import calcsize
+from time import perf_counter_ns
+
+# Modules with a ``_probe`` global, and the engine labels they record.
+INSTRUMENTED = {
+    "main": ("scalar", "many"),
+    "buffer": ("buffer",),
+    "threaded": ("threaded",),
+    "parallel": ("parallel",),
+    "shared": ("shared",),
+}
+
+# Histogram bucket upper bounds in nanoseconds: 1..9 times every power of
+# ten from 100 ns to 10 s, linear within each decade.
+BUCKET_BOUNDS_NS = tuple(
+    step * 10**exponent for exponent in range(2, 11) for step in range(1, 10)
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_COUNTERS = (
+    ("calls", "Calls into the engine."),
+    ("elements", "Elements processed by the engine."),
+    ("bytes", "Buffer bytes processed by the engine."),
+    ("errors", "Calls that raised an exception."),
+)
+
+_enable_lock = threading.Lock()
+
+
+class _Series:
+    __slots__ = ("calls", "elements", "bytes", "errors", "nanoseconds", "buckets")
+
+    def __init__(self):
+        self.calls = self.elements = self.bytes = self.errors = 0
+        self.nanoseconds = 0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_NS) + 1)
+
+
+class _Recorder:
+    """The object installed as ``_probe`` in instrumented modules."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = {}
+
+    def call(self, engine, kind, elements, nbytes, func, *args):
+        started = perf_counter_ns()
+        try:
+            result = func(*args)
+        except BaseException:
+            self.record(engine, kind, elements, nbytes, started, failed=True)
+            raise
+        self.record(engine, kind, elements, nbytes, started)
+        return result
+
+    def call_buffer(self, engine, func, source, *args):
+        typecode = args[1] if len(args) > 1 else None
+        try:
+            with memoryview(source) as view:
+                kind = typecode or view.format.lstrip("@")
+                nbytes = view.nbytes
+            elements = nbytes // calcsize(kind)
+        except Exception:
+            # Invalid inputs are rejected by func itself and counted as errors.
+            kind, elements, nbytes = "invalid", 0, 0
+        return self.call(engine, kind, elements, nbytes, func, source, *args)
+
+    def record(self, engine, kind, elements, nbytes, started, failed=False):
+        elapsed = perf_counter_ns() - started
+        if isinstance(kind, type):
+            kind = kind.__name__
+        with self.lock:
+            series = self.series.get((engine, kind))
+            if series is None:
+                series = self.series[engine, kind] = _Series()
+            series.calls += 1
+            series.elements += elements
+            series.bytes += nbytes
+            series.errors += failed
+            series.nanoseconds += elapsed
+            series.buckets[bisect_left(BUCKET_BOUNDS_NS, elapsed)] += 1
+
+
+_recorder = _Recorder()
+
+
+def enable():
+    """
+    Start recording metrics.
+
+    Imports every instrumented module and installs the recorder in it.
+    Counters recorded before an earlier disable() are kept.
+    """
+    with _enable_lock:
+        for name in INSTRUMENTED:
+            import_module(f".{name}", __package__)._probe = _recorder
+        main = import_module(".main", __package__)
+        main.add_one.__code__ = main._add_one_recorded.__code__
+
+
+def disable():
+    """
+    Stop recording metrics; the hot paths go back to their unmeasured form.
+
+    Recorded values are kept until reset() is called.
+    """
+    with _enable_lock:
+        main = import_module(".main", __package__)
+        main.add_one.__code__ = main._ADD_ONE_CODE
+        for name in INSTRUMENTED:
+            import_module(f".{name}", __package__)._probe = None
+
+
+def enabled():
+    """
+    Tell whether metrics are being recorded.
+
+    Returns:
+        True if enable() was called and disable() has not been called since
+    """
+    main = import_module(".main", __package__)
+    return main._probe is _recorder
+
+
+def reset():
+    """
+    Discard all recorded values.
+    """
+    with _recorder.lock:
+        _recorder.series.clear()
+
+
+def snapshot():
+    """
+    Return the recorded metrics as plain data.
+
+    Returns:
+        A dict mapping engine names to dicts mapping input type names to
+        dicts with the keys ``calls``, ``elements``, ``bytes``, ``errors``,
+        ``seconds`` (total latency) and ``buckets``, a list of
+        ``(upper_bound_seconds, cumulative_count)`` pairs ending with
+        ``(inf, calls)``
+
+    Examples:
+        >>> from package_trial_zenjiro.main import add_one_many
+        >>> enable()
+        >>> add_one_many([1, 2, 3])
+        [2, 3, 4]
+        >>> snapshot()["many"]["int"]["elements"]
+        3
+    """
+    with _recorder.lock:
+        items = [
+            (
+                key,
+                series.calls,
+                series.elements,
+                series.bytes,
+                series.errors,
+                series.nanoseconds,
+                list(series.buckets),
+            )
+            for key, series in _recorder.series.items()
+        ]
+    result = {}
+    for (engine, kind), calls, elements, nbytes, errors, nanoseconds, buckets in sorted(
+        items
+    ):
+        cumulative = []
+        total = 0
+        for bound, count in zip(BUCKET_BOUNDS_NS + (None,), buckets):
+            total += count
+            cumulative.append((float("inf") if bound is None else bound / 1e9, total))
+        result.setdefault(engine, {})[kind] = {
+            "calls": calls,
+            "elements": elements,
+            "bytes": nbytes,
+            "errors": errors,
+            "seconds": nanoseconds / 1e9,
+            "buckets": cumulative,
+        }
+    return result
+
+
+def prometheus_text(prefix="add_one"):
+    """
+    Format the recorded metrics in the Prometheus text exposition format.
+
+    Args:
+        prefix: Prefix of every metric name
+
+    Returns:
+        The exposition text; counters are ``<prefix>_<name>_total`` and the
+        latency histogram is ``<prefix>_call_seconds``, all labelled with
+        ``engine`` and ``type``
+    """
+    data = snapshot()
+    series = [
+        (f'engine="{_escape(engine)}",type="{_escape(kind)}"', values)
+        for engine, kinds in data.items()
+        for kind, values in kinds.items()
+    ]
+    lines = []
+    for name, help_text in _COUNTERS:
+        metric = f"{prefix}_{name}_total"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        lines.extend(
+            f"{metric}{{{labels}}} {values[name]}" for labels, values in series
+        )
+    metric = f"{prefix}_call_seconds"
+    lines.append(f"# HELP {metric} Latency of one call into the engine.")
+    lines.append(f"# TYPE {metric} histogram")
+    for labels, values in series:
+        for bound, count in values["buckets"]:
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+        lines.append(f"{metric}_sum{{{labels}}} {values['seconds']!r}")
+        lines.append(f"{metric}_count{{{labels}}} {values['calls']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path, prefix="add_one"):
+    """
+    Write the Prometheus exposition text to a file.
+
+    The file is replaced atomically, so a collector reading it (such as the
+    node exporter's textfile collector) never sees a partial write.
+
+    Args:
+        path: Destination file name
+        prefix: Prefix of every metric name
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as stream:
+        stream.write(prometheus_text(prefix))
+    os.replace(temporary, path)
+
+
+def serve_prometheus(address=("127.0.0.1", 0), prefix="add_one"):
+    """
+    Serve the Prometheus exposition text over HTTP on a local socket.
+
+    Every GET request is answered with the current metrics. The server runs
+    in a daemon thread; call ``shutdown()`` and ``server_close()`` on the
+    returned object to stop it.
+
+    Args:
+        address: A (host, port) pair for TCP, or a file system path for a
+            Unix domain socket
+        prefix: Prefix of every metric name
+
+    Returns:
+        The running socketserver server; ``server_address`` holds the bound
+        address
+    """
+    import socketserver
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = prometheus_text(prefix).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    if isinstance(address, (str, os.PathLike)):
+        base = socketserver.UnixStreamServer
+    else:
+        base = socketserver.TCPServer
+    server_class = type("MetricsServer", (socketserver.ThreadingMixIn, base), {})
+    server_class.daemon_threads = True
+    server = server_class(address, Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,142 @@
+"""
+Process-pool engine for package_trial_zenjiro.
+
+This module spreads add_one over a persistent pool of worker processes.
+Batches are cut by estimated cost rather than element count, so a few
+multi-thousand-digit integers weigh as much as many small numbers and the
+workers finish at about the same time.
+
+Sending a number to a worker and back costs more than adding one to it
+for every built-in numeric type: pickling an int is O(bits), like the
+addition itself, and Decimal or Fraction values take longer to pickle than
+to add. Elements of those types therefore never count towards min_cost, and
+batches made only of them stay in the calling process. The pool pays off
+for types with an expensive ``__add__``; for plain ints see the
+shared-memory and buffer engines instead.
+"""
+
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from fractions import Fraction
+
+from ._pools import PoolSlot, usable_cpus
+from .main import add_one_many
+
+# Rough per-element overhead, in bits of integer payload, of dispatching one
+# number through a worker: anything that is not an int costs this much.
+ELEMENT_COST = 64
+
+# Types whose add_one costs less than sending them to a worker and back.
+LOCAL_TYPES = frozenset({int, bool, float, complex, Decimal, Fraction})
+
+DEFAULT_MIN_COST = 1 << 24
+DEFAULT_CHUNKS_PER_WORKER = 4
+
+# Metrics recorder installed by metrics.enable(); None while metrics are off.
+_probe = None
+
+_pool = PoolSlot(ProcessPoolExecutor)
+
+
+def add_one_parallel(
+    numbers,
+    *,
+    max_workers=None,
+    min_cost=DEFAULT_MIN_COST,
+    chunks_per_worker=DEFAULT_CHUNKS_PER_WORKER,
+):
+    """
+    Add one to every number of a batch using a pool of worker processes.
+
+    Each element is weighted by its estimated cost (the bit length for ints)
+    and the batch is split into contiguous slices of roughly equal total
+    cost, which keeps results in input order. Only elements whose type is
+    not in LOCAL_TYPES count towards min_cost, so batches of built-in
+    numbers stay in the calling process unless min_cost is 0. The pool is
+    created on first use and reused by later calls; call shutdown_pool to
+    release it.
+
+    Args:
+        numbers: An iterable of numeric values
+        max_workers: Number of worker processes; defaults to the usable CPUs
+        min_cost: Total ELEMENT_COST of elements outside LOCAL_TYPES below
+            which the batch is processed in the calling process; 0 sends
+            every batch of two or more elements to the pool
+        chunks_per_worker: Number of slices per worker, so a slow slice can
+            be balanced by the others
+
+    Returns:
+        A list with add_one applied to each element, in input order
+
+    Raises:
+        TypeError: If any element is not a numeric type
+        ValueError: If max_workers or chunks_per_worker is smaller than 1
+
+    Examples:
+        >>> add_one_parallel([10**500, 2**4000, 7])[2]
+        8
+    """
+    numbers = list(numbers)
+    workers = usable_cpus() if max_workers is None else max_workers
+    if workers < 1 or chunks_per_worker < 1:
+        raise ValueError("max_workers and chunks_per_worker must be at least 1")
+    if workers == 1 or len(numbers) < 2:
+        return add_one_many(numbers)
+    if min_cost > 0:
+        remote = sum(type(number) not in LOCAL_TYPES for number in numbers)
+        if remote * ELEMENT_COST < min_cost:
+            return add_one_many(numbers)
+    costs = [
+        number.bit_length() + ELEMENT_COST if type(number) is int else ELEMENT_COST
+        for number in numbers
+    ]
+    total = sum(costs)
+    slices = _split_by_cost(numbers, costs, total, workers * chunks_per_worker)
+    probe = _probe
+    if probe is not None:
+        return probe.call(
+            "parallel", type(numbers[0]), len(numbers), 0, _map, slices, workers
+        )
+    return _map(slices, workers)
+
+
+def shutdown_pool():
+    """
+    Shut down the worker pool used by add_one_parallel, if one is running.
+
+    The pool is also shut down automatically when the interpreter exits.
+    """
+    _pool.shutdown()
+
+
+def _map(slices, workers):
+    results = []
+    for part in _pool.get(workers).map(_add_one_slice, slices):
+        results.extend(part)
+    return results
+
+
+def _add_one_slice(numbers):
+    # Workers receive this module-level function by reference, so it must
+    # not be an alias that a reload of the main module could replace.
+    return add_one_many(numbers)
+
+
+def _split_by_cost(numbers, costs, total, parts):
+    """Cut numbers into at most ``parts`` contiguous slices of similar cost."""
+    slices = []
+    target = total / parts
+    start = 0
+    running = 0
+    for index, cost in enumerate(costs):
+        running += cost
+        if running >= target * (len(slices) + 1):
+            slices.append(numbers[start : index + 1])
+            start = index + 1
+    if start < len(numbers):
+        slices.append(numbers[start:])
+    return slices
+
+
+atexit.register(shutdown_pool)
@@ -0,0 +1,131 @@
+"""
+Arithmetic progression engine for package_trial_zenjiro.
+
+Inputs that are ranges or arithmetic progressions need not be expanded to
+add one to every element. add_one_progression returns a shifted range for
+a range, and for a Progression (an arithmetic progression with any numeric
+start and step, such as floats or Fractions) a Progression that applies
+the pending add_one calls to each element when it is read. Both take
+constant time and memory, and every element equals what element-wise
+add_one would have produced.
+"""
+
+from collections.abc import Sequence
+from operator import index
+
+from .repeat import add_n
+
+
+class Progression(Sequence):
+    """
+    Read-only arithmetic progression computed element by element.
+
+    Element ``i`` is ``start + i * step``, computed directly from ``i``
+    rather than by adding ``step`` repeatedly, so float elements do not
+    accumulate rounding errors. Creating, slicing or shifting a
+    progression takes constant time and memory.
+
+    Args:
+        start: The first element, any numeric value
+        step: The difference between consecutive elements
+        length: The number of elements, a non-negative integer
+
+    Raises:
+        TypeError: If length is not an integer
+        ValueError: If length is negative
+
+    Examples:
+        >>> progression = Progression(0.0, 0.1, 10**12)
+        >>> progression[3]
+        0.30000000000000004
+        >>> list(progression[:3])
+        [0.0, 0.1, 0.2]
+        >>> len(progression[::2])
+        500000000000
+    """
+
+    __slots__ = ("start", "step", "_indices", "_shift")
+
+    def __init__(self, start, step, length, *, _indices=None, _shift=0):
+        length = index(length)
+        if length < 0:
+            raise ValueError("length must be non-negative")
+        self.start = start
+        self.step = step
+        self._indices = range(length) if _indices is None else _indices
+        self._shift = _shift
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return self._derive(self._indices[position], self._shift)
+        value = self.start + self._indices[position] * self.step
+        return add_n(value, self._shift) if self._shift else value
+
+    def __iter__(self):
+        start, step, shift = self.start, self.step, self._shift
+        if not shift:
+            return (start + i * step for i in self._indices)
+        return (add_n(start + i * step, shift) for i in self._indices)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(<{len(self)} elements>)"
+
+    def _derive(self, indices, shift):
+        return Progression(
+            self.start, self.step, len(indices), _indices=indices, _shift=shift
+        )
+
+
+def add_one_progression(sequence):
+    """
+    Add one to every element of a range or Progression in constant time.
+
+    A range becomes the range shifted by one. A Progression becomes a
+    Progression whose elements are the add_one of the original elements;
+    for int and Fraction progressions the shift is folded into the start,
+    while float, complex and Decimal elements are shifted when read, with
+    the same rounding as repeated add_one.
+
+    Args:
+        sequence: A range or a Progression
+
+    Returns:
+        A range or Progression of the same length
+
+    Raises:
+        TypeError: If sequence is neither a range nor a Progression
+
+    Examples:
+        >>> add_one_progression(range(0, 10**18, 3))
+        range(1, 1000000000000000001, 3)
+        >>> from fractions import Fraction
+        >>> list(add_one_progression(Progression(Fraction(1, 3), 1, 3)))
+        [Fraction(4, 3), Fraction(7, 3), Fraction(10, 3)]
+        >>> add_one_progression(Progression(1e16, 1.0, 2))[0]
+        1e+16
+    """
+    if isinstance(sequence, range):
+        return range(sequence.start + 1, sequence.stop + 1, sequence.step)
+    if not isinstance(sequence, Progression):
+        raise TypeError(
+            f"expected a range or Progression, not {type(sequence).__name__}"
+        )
+    if not sequence._shift and _exact(sequence.start) and _exact(sequence.step):
+        # start + 1 + i * step equals (start + i * step) + 1 exactly.
+        return Progression(
+            sequence.start + 1,
+            sequence.step,
+            len(sequence),
+            _indices=sequence._indices,
+        )
+    return sequence._derive(sequence._indices, sequence._shift + 1)
+
+
+def _exact(number):
+    kind = type(number)
+    return kind is int or (
+        kind.__module__ == "fractions" and kind.__qualname__ == "Fraction"
+    )
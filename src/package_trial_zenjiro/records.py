@@ -0,0 +1,461 @@
+"""
+Record engine for package_trial_zenjiro.
+
+This module applies add_one to one column of a CSV file or one field of a
+newline-delimited JSON file. Input is read in large blocks of complete
+records; only the byte span of the target field is located and parsed, the
+whole block of values is incremented at once, and the new text is spliced
+into the record, so every other byte passes through unchanged and memory
+use depends on the block size only.
+"""
+
+import csv
+import io
+import json
+import re
+
+from ._literals import format_lines, format_number, parse_int, parse_lines
+from .main import add_one_many
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+_JSON_NUMBER = rb"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?"
+_JSON_SPACE = re.compile(r"[ \t\n\r]*")
+_QUOTE = b'"'
+_INFINITIES = (float("inf"), float("-inf"))
+# A member of a JSON object followed by a comma, when its value is a string
+# without escapes or a scalar.
+_JSON_MEMBER = rb'[ \t]*"[^"\n]*"[ \t]*:[ \t]*(?:"[^"\n]*"|[^"{}\[\],\n]*)[ \t]*,'
+
+
+def add_one_csv(
+    source,
+    output,
+    column,
+    *,
+    delimiter=",",
+    kind="auto",
+    block_size=DEFAULT_BLOCK_SIZE,
+):
+    """
+    Add one to a named column of a CSV stream.
+
+    The first record is the header and is copied unchanged. In every other
+    record the target field is rewritten, inside its quotes if it is
+    quoted and keeping any surrounding whitespace; the other fields, the
+    quoting and the line endings are copied byte for byte. Quoted fields may
+    contain delimiters and newlines. Records whose target field is empty or
+    missing are copied unchanged.
+
+    Args:
+        source: Binary file object to read, positioned at the header
+        output: Binary file object to write
+        column: Name of the column, as written in the header
+        delimiter: Single-character field delimiter
+        kind: How to read the values; a key of the command-line ``--type``
+            choices: "auto", "int", "float", "complex" or "decimal"
+        block_size: Number of bytes read at a time
+
+    Returns:
+        The number of records whose field was rewritten
+
+    Raises:
+        ValueError: If the column is not in the header or a value is not a
+            valid number; the message gives the record number
+        KeyError: If kind is unknown
+
+    Examples:
+        >>> import io
+        >>> source = io.BytesIO(b'id,n,note\\n1,41,"a, b"\\n2,-1,\\n')
+        >>> output = io.BytesIO()
+        >>> add_one_csv(source, output, "n")
+        2
+        >>> output.getvalue()
+        b'id,n,note\\n1,42,"a, b"\\n2,0,\\n'
+    """
+    if len(delimiter) != 1 or delimiter in '\r\n"':
+        raise ValueError("delimiter must be one character other than a quote")
+    separator = delimiter.encode()
+    patterns = None
+    record_number = 1
+    rewritten = 0
+    for chunk in _read_chunks(source, block_size, _QUOTE):
+        if patterns is None:
+            end = _header_end(chunk)
+            index = _column_index(chunk[:end], column, delimiter)
+            patterns = _csv_patterns(separator, index)
+            output.write(chunk[: end + 1])
+            chunk = chunk[end + 1 :]
+            record_number += 1
+            if not chunk:
+                continue
+        chunk, records, count = _rewrite_csv(chunk, patterns, kind, record_number)
+        output.write(chunk)
+        record_number += records
+        rewritten += count
+    return rewritten
+
+
+def add_one_ndjson(source, output, field, *, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Add one to a top-level field of a newline-delimited JSON stream.
+
+    Only the number that is the value of the field is rewritten; keys,
+    other values, whitespace and key order are copied byte for byte.
+    Integers stay integers and floats stay floats. Lines without the field,
+    or where its value is null, and blank lines are copied unchanged, as
+    are values too large for a float, such as 1e400, which add_one would
+    leave at infinity.
+
+    Args:
+        source: Binary file object of UTF-8 JSON objects, one per line
+        output: Binary file object to write
+        field: Name of the top-level field
+        block_size: Number of bytes read at a time
+
+    Returns:
+        The number of lines whose field was rewritten
+
+    Raises:
+        ValueError: If a line holding the field is not a JSON object or the
+            value is not a number; the message gives the line number
+
+    Examples:
+        >>> import io
+        >>> source = io.BytesIO(b'{"id": "a", "n": 41}\\n{"n": 1.5, "x": [1]}\\n')
+        >>> output = io.BytesIO()
+        >>> add_one_ndjson(source, output, "n")
+        2
+        >>> output.getvalue()
+        b'{"id": "a", "n": 42}\\n{"n": 2.5, "x": [1]}\\n'
+    """
+    key = json.dumps(field, ensure_ascii=False).encode()
+    escaped = re.escape(key)
+    # Whole-block pattern: the field preceded, from the start of the line,
+    # only by members whose values are strings or scalars. It is used for
+    # blocks without escape sequences, where "[^"\n]*" is exactly a string.
+    block_pattern = re.compile(
+        rb"^([ \t]*\{(?:%s)*?[ \t]*%s[ \t]*:[ \t]*)(%s)(?=[ \t\r]*[,}])"
+        % (_JSON_MEMBER, escaped, _JSON_NUMBER),
+        re.MULTILINE,
+    )
+    line_pattern = re.compile(
+        rb"[{,][ \t\r]*%s[ \t\r]*:[ \t\r]*(%s)(?=[ \t\r]*[,}])"
+        % (escaped, _JSON_NUMBER)
+    )
+    line_number = 1
+    rewritten = 0
+    for chunk in _read_chunks(source, block_size):
+        parts = None
+        if b"\\" not in chunk:
+            parts = block_pattern.split(chunk)
+            # Every occurrence of the key must be a matched field; otherwise
+            # some line needs the careful path.
+            if len(parts) // 3 != chunk.count(key):
+                parts = None
+        if parts is not None:
+            count = len(parts) // 3
+            if count:
+                parts[2::3] = _increment_json(parts[2::3])
+                chunk = b"".join(parts)
+        else:
+            chunk, count = _rewrite_ndjson(chunk, field, key, line_pattern, line_number)
+        output.write(chunk)
+        line_number += chunk.count(b"\n")
+        rewritten += count
+    return rewritten
+
+
+def _read_chunks(source, block_size, quote=None):
+    """
+    Yield chunks of source that end at a record boundary.
+
+    Every chunk but the last ends with a newline. With a quote character,
+    newlines inside quoted fields are not record boundaries.
+    """
+    pending = b""
+    while True:
+        block = source.read(block_size)
+        if not block:
+            break
+        data = pending + block
+        end = data.rfind(b"\n")
+        if quote is not None and end >= 0 and quote in data:
+            # Back off to the last newline outside quotes: one with an even
+            # number of quote characters before it.
+            odd = data.count(quote, 0, end) % 2
+            while odd and end >= 0:
+                previous = data.rfind(b"\n", 0, end)
+                odd ^= data.count(quote, max(previous, 0), end) % 2
+                end = previous
+        if end < 0:
+            pending = data
+            continue
+        pending = data[end + 1 :]
+        yield data[: end + 1]
+    if pending:
+        yield pending
+
+
+def _split_records(chunk, quote=None):
+    """Split a chunk into records and its final newline, if any."""
+    newline = b"\n" if chunk.endswith(b"\n") else b""
+    records = chunk[: len(chunk) - len(newline)].split(b"\n")
+    if quote is not None and quote in chunk:
+        records = _join_quoted(records, quote)
+    return records, newline
+
+
+def _join_quoted(lines, quote):
+    """Join lines that end inside a quoted field with the following lines."""
+    records = []
+    parts = None
+    for line in lines:
+        odd = line.count(quote) % 2
+        if parts is None:
+            if odd:
+                parts = [line]
+            else:
+                records.append(line)
+        else:
+            parts.append(line)
+            if odd:
+                records.append(b"\n".join(parts))
+                parts = None
+    if parts is not None:
+        records.append(b"\n".join(parts))
+    return records
+
+
+def _header_end(chunk):
+    """Return the position of the newline ending the first record."""
+    end = chunk.find(b"\n")
+    while end >= 0 and chunk.count(_QUOTE, 0, end) % 2:
+        end = chunk.find(b"\n", end + 1)
+    return len(chunk) if end < 0 else end
+
+
+def _column_index(header, column, delimiter):
+    text = header.decode("utf-8-sig")
+    names = next(csv.reader(io.StringIO(text, newline=""), delimiter=delimiter))
+    names = [name.strip() for name in names]
+    try:
+        return names.index(column)
+    except ValueError:
+        raise ValueError(f"column {column!r} not found in CSV header") from None
+
+
+def _csv_patterns(separator, index):
+    """
+    Return the patterns that find the target field, with their parameters.
+
+    The first splits a whole chunk without quotes into (text, prefix, field)
+    triples in one call; the second matches the start of one record whose
+    fields may be quoted.
+    """
+    sep = re.escape(separator)
+    plain = rb"[^\n%s]*" % sep
+    field = rb'(?:"(?:[^"]|"")*"|[^"\n%s]*)' % sep
+    return (
+        re.compile(rb"^((?:%s%s){%d})(%s)" % (plain, sep, index, plain), re.M),
+        re.compile(
+            rb"((?:%s%s){%d})(%s)(?=%s|\r|\Z)" % (field, sep, index, field, sep)
+        ),
+        separator,
+        index,
+    )
+
+
+def _rewrite_csv(chunk, patterns, kind, first_record):
+    """Rewrite the records of a chunk; return it, its record count and hits."""
+    chunk_pattern, record_pattern, separator, index = patterns
+    if _QUOTE not in chunk:
+        parts = chunk_pattern.split(chunk)
+        records = chunk.count(b"\n") + (not chunk.endswith(b"\n"))
+        try:
+            parts[2::3], count = _increment_fields(parts[2::3], kind, first_record)
+        except ValueError:
+            # Rows without the field are not in parts, so redo the chunk
+            # record by record to report the right record number.
+            pass
+        else:
+            return b"".join(parts), records, count
+    records, newline = _split_records(chunk, _QUOTE)
+    spans = []
+    for record, match in zip(records, map(record_pattern.match, records)):
+        if match is None:
+            spans.append(_field_span(record, index, separator, _QUOTE))
+            continue
+        start, end = match.span(2)
+        if record.startswith(_QUOTE, start):
+            start, end = start + 1, end - 1
+        spans.append((start, end))
+    fields = [
+        b"" if span is None else record[span[0] : span[1]]
+        for record, span in zip(records, spans)
+    ]
+    texts, count = _increment_fields(fields, kind, first_record)
+    records = [
+        record if span is None else record[: span[0]] + text + record[span[1] :]
+        for record, span, text in zip(records, spans, texts)
+    ]
+    return b"\n".join(records) + newline, len(records), count
+
+
+def _field_span(record, index, separator, quote):
+    """Return the (start, end) of a field's text, inside any quotes."""
+    start = 0
+    for _ in range(index):
+        if record.startswith(quote, start):
+            start = _after_quoted(record, start, quote)
+        start = record.find(separator, start)
+        if start < 0:
+            return None
+        start += len(separator)
+    if record.startswith(quote, start):
+        end = _after_quoted(record, start, quote)
+        return start + 1, max(end - 1, start + 1)
+    end = record.find(separator, start)
+    return start, len(record) if end < 0 else end
+
+
+def _after_quoted(record, start, quote):
+    """Return the position after the quoted field starting at start."""
+    position = start + 1
+    while True:
+        position = record.find(quote, position)
+        if position < 0:
+            return len(record)
+        if not record.startswith(quote, position + 1):
+            return position + 1
+        position += 2
+
+
+def _increment_fields(fields, kind, first_record):
+    """
+    Add one to a batch of field texts.
+
+    Returns the new texts, where blank fields are returned unchanged and
+    the whitespace around a value is kept, and the number of values.
+    """
+    stripped = [field.strip() for field in fields]
+    try:
+        numbers = parse_lines(stripped, kind, first_record)
+    except ValueError as error:
+        raise ValueError(f"record {str(error).removeprefix('line ')}") from None
+    texts = _format(add_one_many(numbers))
+    if len(numbers) == len(fields) and stripped == fields:
+        return texts, len(numbers)
+    if len(numbers) < len(fields):
+        values = iter(texts)
+        texts = [next(values) if value else b"" for value in stripped]
+    return [
+        text if field is value else (field.replace(value, text, 1) if value else field)
+        for field, value, text in zip(fields, stripped, texts)
+    ], len(numbers)
+
+
+def _format(numbers):
+    if not numbers:
+        return []
+    return format_lines(numbers)[:-1].split(b"\n")
+
+
+def _rewrite_ndjson(chunk, field, key, pattern, first_line):
+    """Rewrite a chunk line by line; return it and the number of hits."""
+    lines, newline = _split_records(chunk)
+    spans = []
+    for line_number, (line, match) in enumerate(
+        zip(lines, map(pattern.search, lines)), first_line
+    ):
+        if match is not None:
+            start = match.start(1)
+            # Accept the match only when the field is the sole occurrence of
+            # the key at the top level; anything else goes to the scanner.
+            if (
+                line.count(b"{", 0, start) == 1
+                and line.find(b"[", 0, start) < 0
+                and line.count(key) == 1
+            ):
+                spans.append((start, match.end(1)))
+                continue
+        if key in line or b"\\" in line:
+            spans.append(_json_field_span(line, field, line_number))
+        else:
+            spans.append(None)
+    texts = [line[span[0] : span[1]] for line, span in zip(lines, spans) if span]
+    if not texts:
+        return chunk, 0
+    values = iter(_increment_json(texts))
+    lines = [
+        line if span is None else line[: span[0]] + next(values) + line[span[1] :]
+        for line, span in zip(lines, spans)
+    ]
+    return b"\n".join(lines) + newline, len(texts)
+
+
+def _increment_json(texts):
+    # One C-level decode and encode for the whole batch; the dumped list
+    # separates items with ", ", which no number contains.
+    batch = b"[" + b",".join(texts) + b"]"
+    try:
+        numbers = json.loads(batch)
+    except ValueError:
+        # json.loads uses int(), which refuses literals longer than
+        # sys.get_int_max_str_digits(); parse_int reads them exactly.
+        numbers = json.loads(batch, parse_int=parse_int)
+    numbers = add_one_many(numbers)
+    try:
+        return json.dumps(numbers, allow_nan=False)[1:-1].encode("ascii").split(b", ")
+    except ValueError:
+        pass
+    # A literal beyond the float range, such as 1e400, decodes to infinity,
+    # which JSON cannot represent; add_one leaves it as it is, so does this.
+    # Integers too long for str() are formatted through Decimal instead.
+    return [
+        text if number in _INFINITIES else format_number(number).encode("ascii")
+        for text, number in zip(texts, numbers)
+    ]
+
+
+def _json_field_span(line, field, line_number):
+    """
+    Locate the value of a top-level field by scanning the object's members.
+
+    Returns the byte span of the value, or None if the field is missing or
+    null. Every member is decoded by the json module, so this is the slow
+    path for lines the fast pattern cannot vouch for.
+    """
+    decoder = json.JSONDecoder(parse_int=parse_int)
+    text = line.decode("utf-8")
+    try:
+        position = _JSON_SPACE.match(text).end()
+        if text[position : position + 1] != "{":
+            raise ValueError("expected a JSON object")
+        position = _JSON_SPACE.match(text, position + 1).end()
+        span = None
+        while text[position : position + 1] != "}":
+            name, position = decoder.raw_decode(text, position)
+            if not isinstance(name, str):
+                raise ValueError("expected a member name")
+            position = _JSON_SPACE.match(text, position).end()
+            if text[position : position + 1] != ":":
+                raise ValueError("expected ':'")
+            position = _JSON_SPACE.match(text, position + 1).end()
+            value, end = decoder.raw_decode(text, position)
+            if name == field:
+                span = None if value is None else (position, end, value)
+            position = _JSON_SPACE.match(text, end).end()
+            if text[position : position + 1] == ",":
+                position = _JSON_SPACE.match(text, position + 1).end()
+            elif text[position : position + 1] != "}":
+                raise ValueError("expected ',' or '}'")
+    except ValueError as error:
+        raise ValueError(f"line {line_number}: {error}") from None
+    if span is None:
+        return None
+    start, end, value = span
+    if type(value) not in (int, float):
+        raise ValueError(f"line {line_number}: field {field!r} is not a number")
+    start = len(text[:start].encode())
+    return start, start + len(text[span[0] : end].encode())
@@ -0,0 +1,159 @@
+"""
+Per-type increment registry for package_trial_zenjiro.
+
+This module lets numeric types register a handler that computes
+``number + 1`` more cheaply than the generic binary-operator protocol, for
+example by building the result from the object's internals directly.
+Handlers are resolved along the method resolution order of the concrete
+type, falling back to registered abstract base classes, and the resolved
+handler is cached per concrete type so dispatch is a single dict lookup.
+"""
+
+from itertools import groupby
+
+_handlers = {}
+_resolved = {}
+
+
+def _plus_one(number):
+    return number + 1
+
+
+def register_increment(kind, handler=None):
+    """
+    Register an increment handler for a type and its subclasses.
+
+    A handler takes one number and must return exactly what ``number + 1``
+    returns for it; the registry only changes how fast the result is
+    computed, never what it is. Can be used as a decorator.
+
+    Args:
+        kind: The class the handler applies to; abstract base classes such
+            as numbers.Integral also match their virtual subclasses
+        handler: Callable taking the number; omitted when used as a
+            decorator
+
+    Returns:
+        The handler, or a decorator registering the decorated function
+
+    Raises:
+        TypeError: If kind is not a class
+
+    Examples:
+        >>> class Counter(int):
+        ...     pass
+        >>> @register_increment(Counter)
+        ... def _(number):
+        ...     return int(number) + 1
+        >>> dispatch_add_one(Counter(41))
+        42
+    """
+    if not isinstance(kind, type):
+        raise TypeError(f"register_increment expects a class, not {kind!r}")
+    if handler is None:
+        return lambda function: register_increment(kind, function)
+    _handlers[kind] = handler
+    _resolved.clear()
+    return handler
+
+
+def unregister_increment(kind):
+    """
+    Remove the increment handler registered for exactly this type.
+
+    Args:
+        kind: A class previously passed to register_increment
+
+    Raises:
+        KeyError: If no handler is registered for kind
+    """
+    del _handlers[kind]
+    _resolved.clear()
+
+
+def resolve_increment(kind):
+    """
+    Return the increment handler that applies to a concrete type.
+
+    The first class on ``kind.__mro__`` with a registered handler wins;
+    otherwise the first registered abstract base class that ``kind`` is a
+    subclass of; otherwise a plain ``number + 1``. The answer is cached
+    until the registry changes.
+
+    Args:
+        kind: A concrete class
+
+    Returns:
+        A callable taking one number of that type
+    """
+    try:
+        return _resolved[kind]
+    except KeyError:
+        pass
+    handler = _lookup(kind)
+    _resolved[kind] = handler
+    return handler
+
+
+def has_increment(kind):
+    """
+    Tell whether a registered handler (not the plain fallback) covers a type.
+
+    Args:
+        kind: A concrete class
+
+    Returns:
+        True if resolve_increment(kind) returns a registered handler
+    """
+    return resolve_increment(kind) is not _plus_one
+
+
+def dispatch_add_one(number):
+    """
+    Add one to a number through its registered increment handler.
+
+    Args:
+        number: A numeric value
+
+    Returns:
+        The same value add_one would return
+
+    Raises:
+        TypeError: If the input is not a numeric type
+    """
+    handler = _resolved.get(type(number))
+    if handler is None:
+        handler = resolve_increment(type(number))
+    return handler(number)
+
+
+def add_one_runs(numbers):
+    """
+    Add one to a batch, resolving the handler once per run of equal types.
+
+    Consecutive elements of the same concrete type share one handler
+    lookup, and each run is mapped through its handler at C speed.
+
+    Args:
+        numbers: An iterable of numeric values
+
+    Returns:
+        A list with add_one applied to each element, in input order
+
+    Raises:
+        TypeError: If any element is not a numeric type
+    """
+    results = []
+    for kind, run in groupby(numbers, type):
+        results.extend(map(resolve_increment(kind), run))
+    return results
+
+
+def _lookup(kind):
+    for base in kind.__mro__:
+        if base in _handlers:
+            return _handlers[base]
+    for base, handler in _handlers.items():
+        if issubclass(kind, base):
+            return handler
+    return _plus_one
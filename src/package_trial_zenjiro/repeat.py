@@ -0,0 +1,198 @@
+"""
+Repeated application engine for package_trial_zenjiro.
+
+This module computes add_one applied k times to a value without running k
+additions. Exact types collapse to a single addition of k. Floats round
+at every step, so they are advanced in runs of steps that are provably
+exact, with one rounded step at each binade boundary; the number of
+iterations grows with the number of binades crossed, that is with log(k).
+Decimals are advanced the same way under the current context: exact runs
+at once, then whole decades of rounded steps, until a step no longer
+changes the value.
+"""
+
+from math import isfinite
+from operator import index
+
+from .complexes import IMAG_ADDS_ZERO
+from .main import add_one
+
+# Every integer multiple of 2**-e with magnitude up to 2**53 is a float, so
+# while the numerator of x + i stays within this bound no step rounds.
+_EXACT_LIMIT = 1 << 53
+
+
+def add_n(number, k):
+    """
+    Apply add_one to a number k times.
+
+    The result is bit-identical to calling add_one in a loop k times,
+    including the rounding floats and Decimals accumulate at each step and
+    the signals the Decimal context records or raises, but the cost is
+    constant for int and Fraction and logarithmic in k for floats, complex
+    numbers and Decimals. Other types fall back to the loop.
+
+    Args:
+        number: A numeric value
+        k: Number of applications, a non-negative integer
+
+    Returns:
+        The value add_one(add_one(...add_one(number)...)) with k calls
+
+    Raises:
+        TypeError: If k is not an integer or number is not numeric
+        ValueError: If k is negative
+
+    Examples:
+        >>> add_n(5, 10**20)
+        100000000000000000005
+        >>> add_n(0.1, 3)
+        3.1
+        >>> add_n(2.0**53, 1000)
+        9007199254740992.0
+    """
+    k = index(k)
+    if k < 0:
+        raise ValueError("k must be non-negative")
+    if not k:
+        return number
+    repeater = _REPEATERS.get(type(number))
+    if repeater is None:
+        repeater = _resolve_repeater(type(number))
+    return repeater(number, k)
+
+
+def _add_n_exact(number, k):
+    return number + k
+
+
+def _add_n_float(x, k):
+    while k:
+        if not isfinite(x) or x + 1.0 == x:
+            # Once x + 1.0 no longer changes x (large floats) or x is inf
+            # or NaN, further additions return the same bits.
+            return x + 1.0
+        n, d = x.as_integer_ratio()
+        if n >= -_EXACT_LIMIT:
+            run = min(k, (_EXACT_LIMIT - n) // d)
+            if run > 0:
+                x = (n + run * d) / d
+                k -= run
+                continue
+        x += 1.0
+        k -= 1
+    return x
+
+
+def _add_n_complex(z, k):
+    # The real part follows the float rules. The imaginary part only sees
+    # "+ 0.0" (or nothing), which is idempotent after the first step.
+    imag = z.imag + 0.0 if IMAG_ADDS_ZERO else z.imag
+    return complex(_add_n_float(z.real, k), imag)
+
+
+def _add_n_decimal(x, k):
+    from decimal import getcontext, localcontext
+
+    # Steps are taken with the caller's precision and rounding but without
+    # traps. Each one is either a fixed point, after which every further
+    # step returns the same value, or the first of a run of steps that all
+    # round the same way and raise the same signals, taken at once.
+    context = getcontext()
+    raised = set()
+    with localcontext(context) as local:
+        local.clear_traps()
+        while k:
+            local.clear_flags()
+            y = x + 1
+            signals = {signal for signal, flag in local.flags.items() if flag}
+            if any(context.traps[signal] for signal in signals):
+                break
+            raised |= signals
+            if y.as_tuple() == x.as_tuple():
+                k = 0
+                break
+            run, x = _decimal_run(x, y, k, signals, local)
+            k -= run
+    for signal in raised:
+        context.flags[signal] = True
+    if k:
+        # This step raises under the caller's traps, as add_one would.
+        return x + 1
+    return x
+
+
+def _decimal_run(x, y, k, signals, ctx):
+    """
+    Take up to k steps from x that behave like the step x -> y just taken.
+
+    Returns the number of steps taken, at least one, and the value reached.
+    """
+    from decimal import ROUND_05UP, Decimal
+
+    if k == 1 or not x.is_finite():
+        return 1, y
+    sign, digits, exponent = x.as_tuple()
+    coefficient = int("".join(map(str, digits)))
+    prec = ctx.prec
+    if not signals:
+        # x + 1 is exact, and so is every later value on the grid of
+        # x + 1's exponent until the precision or Emax is exceeded.
+        scale = y.as_tuple().exponent
+        if scale < ctx.Emin or (ctx.clamp and scale > ctx.Emax - prec + 1):
+            return 1, y
+        start = (-coefficient if sign else coefficient) * 10 ** (exponent - scale)
+        bound = 10 ** min(prec, ctx.Emax + 1 - scale)
+        run = min(k, (bound - 1 - start) // 10**-scale)
+        return run, x + Decimal(run)
+    if ctx.rounding == ROUND_05UP or exponent < 1 or len(digits) != prec:
+        return 1, y
+    if y.as_tuple().exponent != exponent or y != x + Decimal((0, (1,), exponent)):
+        return 1, y
+    # x + 1 lies strictly between x and its neighbour one unit further, so
+    # with a full coefficient every step rounds the same way and moves by
+    # one unit, and crossing into the next power of ten takes one more
+    # such step. A whole decade, from its first value to the first value
+    # of the next, is therefore always the same number of steps.
+    decade = 9 * 10 ** (prec - 1)
+    if not sign:
+        if coefficient == 10 ** (prec - 1) and k >= decade:
+            decades = min(k // decade, ctx.Emax - prec + 1 - exponent)
+            if decades > 0:
+                return decades * decade, x.scaleb(decades)
+        run = min(k, 10**prec - 1 - coefficient)
+    else:
+        # Towards zero, the step out of a decade rounds only from an
+        # exponent of 2 up.
+        if coefficient == 10**prec - 1 and k >= decade:
+            decades = min(k // decade, exponent - 1)
+            if decades > 0:
+                return decades * decade, x.scaleb(-decades)
+        run = min(k, coefficient - 10 ** (prec - 1))
+    return run, x + Decimal(f"{run}E{exponent}")
+
+
+def _add_n_loop(number, k):
+    for _ in range(k):
+        number = add_one(number)
+    return number
+
+
+_REPEATERS = {
+    bool: _add_n_exact,
+    int: _add_n_exact,
+    float: _add_n_float,
+    complex: _add_n_complex,
+}
+
+
+def _resolve_repeater(kind):
+    # Only the exact classes are known to add k in one step; subclasses may
+    # override __add__, so they use the loop.
+    if kind.__module__ == "fractions" and kind.__qualname__ == "Fraction":
+        repeater = _REPEATERS[kind] = _add_n_exact
+        return repeater
+    if kind.__module__ == "decimal" and kind.__qualname__ == "Decimal":
+        repeater = _REPEATERS[kind] = _add_n_decimal
+        return repeater
+    return _add_n_loop
@@ -0,0 +1,138 @@
+"""
+Batching server for package_trial_zenjiro.
+
+This module serves add_one over a Unix domain socket or a localhost TCP
+port, so that several processes can share one deployment and one set of
+metrics. Each connection sends length-prefixed frames (see the _wire
+module) and may pipeline any number of them before reading the responses,
+which come back in request order. Numeric batches are processed by the
+buffer engine, everything else by add_one_many.
+
+Run ``python -m package_trial_zenjiro.server --unix PATH`` (or ``--port``)
+to start a server, or add ``--benchmark`` to compare it against in-process
+calls with a load generator on the same machine.
+"""
+
+import argparse
+import os
+import socket
+import socketserver
+import sys
+import threading
+
+from . import _wire
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        if self.connection.family != socket.AF_UNIX:
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        while True:
+            try:
+                request = _wire.read_frame(self.rfile)
+            except (ValueError, ConnectionError):
+                # The stream cannot be resynchronized after a bad header.
+                return
+            if request is None:
+                return
+            self.wfile.write(_wire.frame(*_wire.process(*request)))
+
+
+def serve(address=("127.0.0.1", 0)):
+    """
+    Start an add_one server in a daemon thread.
+
+    Every connection is handled by its own thread. Call ``shutdown()`` and
+    ``server_close()`` on the returned object to stop the server; for a
+    Unix socket the caller removes the socket file.
+
+    Args:
+        address: A (host, port) pair for TCP, or a file system path for a
+            Unix domain socket
+
+    Returns:
+        The running socketserver server; ``server_address`` holds the bound
+        address
+
+    Examples:
+        >>> from package_trial_zenjiro.client import AddOneClient
+        >>> server = serve()
+        >>> with AddOneClient(server.server_address) as client:
+        ...     client.add_one_many([1, 2.5, 2**70])
+        [2, 3.5, 1180591620717411303425]
+        >>> server.shutdown()
+        >>> server.server_close()
+    """
+    server = _make_server(address)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _make_server(address):
+    if isinstance(address, (str, os.PathLike)):
+        base = socketserver.UnixStreamServer
+    else:
+        base = socketserver.TCPServer
+    server_class = type("AddOneServer", (socketserver.ThreadingMixIn, base), {})
+    server_class.daemon_threads = True
+    server_class.allow_reuse_address = True
+    return server_class(address, _Handler)
+
+
+def main(argv=None):
+    """
+    Run the add_one server, or its load-generator benchmark.
+
+    Args:
+        argv: Command-line arguments without the program name; defaults to
+            sys.argv[1:]
+
+    Returns:
+        The process exit status
+    """
+    parser = argparse.ArgumentParser(
+        prog="add-one-server", description="Serve add_one over a local socket."
+    )
+    parser.add_argument("--unix", metavar="PATH", help="Unix domain socket path")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host")
+    parser.add_argument("--port", type=int, default=0, help="TCP port")
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="start a server process and compare it with in-process calls",
+    )
+    parser.add_argument(
+        "--threads", type=int, default=8, help="benchmark client threads"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=1.0, help="seconds per benchmark"
+    )
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        from .client import format_load_result, run_load_benchmark
+
+        for result in run_load_benchmark(
+            unix=args.unix, threads=args.threads, duration=args.duration
+        ):
+            print(format_load_result(result))
+        return 0
+
+    address = args.unix or (args.host, args.port)
+    server = _make_server(address)
+    print(f"listening on {server.server_address}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.unix:
+            os.unlink(args.unix)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
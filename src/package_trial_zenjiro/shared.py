@@ -0,0 +1,219 @@
+"""
+Shared-memory process engine for package_trial_zenjiro.
+
+add_one_parallel pickles every element to a worker process and every result
+back, which costs more than the additions themselves for fixed-width
+numbers. This module instead places a numeric buffer in a
+multiprocessing.shared_memory segment; worker processes attach to the
+segment by name and run the buffer engine on disjoint slices in place, so
+only the segment name and slice bounds cross the process boundary.
+
+Segments are unlinked in a ``finally`` block, so an exception, a crashed
+worker or Ctrl-C in the caller leaves nothing behind in /dev/shm. Workers
+ignore SIGINT, so Ctrl-C reaches the caller only. If the caller itself is
+killed, the multiprocessing resource tracker unlinks the segment it
+registered.
+"""
+
+import atexit
+import os
+import signal
+import sys
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from struct import calcsize
+
+from ._pools import PoolSlot, usable_cpus
+from .buffer import OVERFLOW_POLICIES, _add_one_buffer, _add_one_bytes, _byte_view
+
+# Buffers smaller than this are processed in the calling process, where
+# they take less time than starting the slices in the workers.
+DEFAULT_MIN_BYTES = 1 << 20
+
+SEGMENT_PREFIX = "add_one_"
+
+# Metrics recorder installed by metrics.enable(); None while metrics are off.
+_probe = None
+
+
+def _ignore_interrupts():
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _new_pool(workers):
+    resource_tracker.ensure_running()
+    return ProcessPoolExecutor(workers, initializer=_ignore_interrupts)
+
+
+_pool = PoolSlot(_new_pool)
+
+
+def add_one_shared(
+    source,
+    out=None,
+    *,
+    typecode=None,
+    overflow="raise",
+    max_workers=None,
+    min_bytes=DEFAULT_MIN_BYTES,
+):
+    """
+    Add one to every element of a numeric buffer using worker processes.
+
+    The buffer is copied once into a shared memory segment, every worker
+    rewrites its own slice of the segment in place, and the segment is
+    copied into ``out`` (or back into ``source``). A SharedMemory object
+    given as ``source`` without ``out`` is rewritten directly, without any
+    copy. The worker pool is created on first use and reused by later
+    calls; call shutdown_pool to release it.
+
+    Args:
+        source: A C-contiguous buffer with one of the buffer module's
+            TYPECODES, or a multiprocessing.shared_memory.SharedMemory
+        out: Optional writable buffer of the same size and element type
+        typecode: Element type used to reinterpret raw byte buffers, such
+            as bytearray, mmap or SharedMemory objects
+        overflow: One of OVERFLOW_POLICIES, as for add_one_buffer
+        max_workers: Number of worker processes; defaults to the usable
+            CPUs
+        min_bytes: Buffer size below which the calling process does the
+            work
+
+    Returns:
+        The buffer that received the results (``out`` or ``source``)
+
+    Raises:
+        TypeError: If the element type is not supported or the target
+            buffer is read-only
+        ValueError: If the buffers differ in size, max_workers is below
+            one or the overflow policy is unknown
+        OverflowError: If an integer element is at its maximum and overflow
+            is "raise"; other slices may have been written at that point
+        concurrent.futures.process.BrokenProcessPool: If a worker died
+
+    Examples:
+        >>> from array import array
+        >>> add_one_shared(array("q", range(5)), max_workers=2, min_bytes=0)
+        array('q', [1, 2, 3, 4, 5])
+    """
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+    workers = usable_cpus() if max_workers is None else max_workers
+    if workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    name = source.name if isinstance(source, SharedMemory) else None
+    target = source.buf if name else source
+    result = out.buf if isinstance(out, SharedMemory) else out
+    with memoryview(target) as view:
+        nbytes = view.nbytes
+    probe = _probe
+    if workers == 1 or nbytes < min_bytes:
+        _add_one_buffer(target, result, typecode, None, overflow)
+    elif probe is not None:
+        probe.call_buffer(
+            "shared", _add_one_shared, target, result, typecode, workers, overflow, name
+        )
+    else:
+        _add_one_shared(target, result, typecode, workers, overflow, name)
+    return source if out is None else out
+
+
+def shutdown_pool():
+    """
+    Shut down the worker pool used by add_one_shared, if one is running.
+
+    The pool is also shut down automatically when the interpreter exits.
+    """
+    _pool.shutdown()
+
+
+def _add_one_shared(source, out, typecode, workers, overflow, name=None):
+    code, src = _byte_view(source, typecode)
+    dst = src
+    segment = None
+    try:
+        if out is not None:
+            out_code, dst = _byte_view(out, typecode, raw_as=code)
+            if out_code != code:
+                raise TypeError(f"output typecode {out_code!r} does not match {code!r}")
+            if dst.nbytes != src.nbytes:
+                raise ValueError("output buffer size does not match the source")
+        if dst.readonly:
+            raise TypeError("cannot write add_one results to a read-only buffer")
+        if name is not None and out is None:
+            # The source already is a segment: rewrite it where it is.
+            _run_slices(name, code, src.nbytes, workers, overflow)
+        elif src.nbytes:
+            segment = _create_segment(src.nbytes)
+            with segment.buf[: src.nbytes] as data:
+                data[:] = src
+                _run_slices(segment.name, code, src.nbytes, workers, overflow)
+                dst[:] = data
+    finally:
+        src.release()
+        dst.release()
+        if segment is not None:
+            segment.close()
+            segment.unlink()
+
+
+def _create_segment(size):
+    # The resource tracker has to be running before the pool starts, so
+    # that workers share it instead of starting trackers of their own,
+    # which would unlink the segments they attached to when they exit.
+    resource_tracker.ensure_running()
+    return SharedMemory(
+        name=f"{SEGMENT_PREFIX}{os.getpid()}_{os.urandom(4).hex()}",
+        create=True,
+        size=size,
+    )
+
+
+def _run_slices(name, code, nbytes, workers, overflow):
+    """Process ``nbytes`` of segment ``name`` as one slice per worker."""
+    itemsize = calcsize(code)
+    count = nbytes // itemsize
+    bounds = [count * i // workers * itemsize for i in range(workers + 1)]
+    pool = _pool.get(workers)
+    try:
+        futures = [
+            pool.submit(_add_one_segment, name, code, begin, end, overflow)
+            for begin, end in zip(bounds, bounds[1:])
+            if begin < end
+        ]
+    except BrokenProcessPool:
+        _pool.discard(pool)
+        raise
+    try:
+        wait(futures, return_when=FIRST_EXCEPTION)
+    finally:
+        # On an error or Ctrl-C, slices not yet started are dropped; the
+        # running ones finish on the segment, which stays mapped in their
+        # processes even once the caller has unlinked it.
+        for future in futures:
+            future.cancel()
+    for future in futures:
+        if not future.cancelled() and future.exception() is not None:
+            if isinstance(future.exception(), BrokenProcessPool):
+                _pool.discard(pool)
+            raise future.exception()
+
+
+def _add_one_segment(name, code, begin, end, overflow):
+    """Worker task: process bytes [begin, end) of a segment in place."""
+    if sys.version_info >= (3, 13):  # pragma: no cover
+        segment = SharedMemory(name, track=False)
+    else:
+        # Attaching registers the name again with the tracker shared with
+        # the caller, which keeps a set of names, so this adds nothing;
+        # unregistering here would drop the caller's own registration.
+        segment = SharedMemory(name)
+    try:
+        _add_one_bytes(segment.buf, segment.buf, code, begin, end, None, overflow)
+    finally:
+        segment.close()
+
+
+atexit.register(shutdown_pool)
@@ -0,0 +1,87 @@
+"""
+Streaming pipeline for package_trial_zenjiro.
+
+This module applies add_one to unbounded iterators. Input is pulled in
+fixed-size chunks, each chunk goes through add_one_many, and results are
+yielded lazily, so memory use depends on the chunk size only and not on
+the length of the stream.
+"""
+
+from itertools import islice
+
+from .main import add_one_many
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def add_one_chunks(numbers, chunk_size=DEFAULT_CHUNK_SIZE, *, before=None, after=None):
+    """
+    Lazily add one to a stream of numbers, yielding one list per chunk.
+
+    Yielding whole chunks lets a downstream writer stage emit a chunk with a
+    single call (``file.writelines``, ``socket.sendall``) instead of once per
+    element.
+
+    Args:
+        numbers: Any iterable, possibly infinite
+        chunk_size: Maximum number of elements pulled and processed at once
+        before: Optional hook called with each raw input chunk (a list) that
+            returns the list of numbers to process, e.g. a parser
+        after: Optional hook called with each result chunk that returns the
+            object to yield, e.g. a formatter
+
+    Yields:
+        The result of ``after`` for every chunk, or the list of results
+
+    Raises:
+        ValueError: If chunk_size is smaller than 1
+        TypeError: If an element is not a numeric type
+
+    Examples:
+        >>> list(add_one_chunks(range(5), chunk_size=2))
+        [[1, 2], [3, 4], [5]]
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    iterator = iter(numbers)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        if before is not None:
+            chunk = before(chunk)
+        results = add_one_many(chunk)
+        yield results if after is None else after(results)
+
+
+def add_one_stream(numbers, chunk_size=DEFAULT_CHUNK_SIZE, *, before=None, after=None):
+    """
+    Lazily add one to every number of a stream, yielding one result at a time.
+
+    This is the element-wise counterpart of add_one_chunks and takes the same
+    hooks; ``after`` must return an iterable for each chunk. Because it is a
+    generator over an iterator, it composes directly with reader and writer
+    stages: ``writer(add_one_stream(reader()))``.
+
+    Args:
+        numbers: Any iterable, possibly infinite
+        chunk_size: Maximum number of elements pulled and processed at once
+        before: Optional hook applied to each raw input chunk
+        after: Optional hook applied to each result chunk
+
+    Yields:
+        add_one of every input element, in order
+
+    Raises:
+        ValueError: If chunk_size is smaller than 1
+        TypeError: If an element is not a numeric type
+
+    Examples:
+        >>> from itertools import count, islice
+        >>> list(islice(add_one_stream(count()), 3))
+        [1, 2, 3]
+        >>> list(add_one_stream(["1", "2"], before=lambda c: [int(s) for s in c]))
+        [2, 3]
+    """
+    for results in add_one_chunks(numbers, chunk_size, before=before, after=after):
+        yield from results
@@ -0,0 +1,92 @@
+"""
+Thread-pool engine for package_trial_zenjiro.
+
+This module splits large batches across threads. On a free-threaded
+(no-GIL) CPython build such as 3.13t the threads run add_one in parallel;
+on a regular build the GIL serialises them, so the engine uses a single
+thread unless told otherwise. Every thread works on its own copy of a
+slice and returns its own result list, so no mutable state is shared.
+"""
+
+import sys
+import sysconfig
+from concurrent.futures import ThreadPoolExecutor
+
+from ._pools import PoolSlot, usable_cpus
+from .main import add_one_many
+
+DEFAULT_MIN_BATCH = 1 << 14
+
+_pool = PoolSlot(ThreadPoolExecutor)
+
+# Metrics recorder installed by metrics.enable(); None while metrics are off.
+_probe = None
+
+
+def free_threaded():
+    """
+    Tell whether the running interpreter executes Python threads in parallel.
+
+    Returns:
+        True on a free-threaded build with the GIL disabled, False otherwise
+    """
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        return False
+    return not sys._is_gil_enabled()  # pragma: no cover
+
+
+def add_one_threaded(numbers, *, max_workers=None, min_batch=DEFAULT_MIN_BATCH):
+    """
+    Add one to every number of a batch using a pool of threads.
+
+    The batch is cut into one contiguous slice per thread and the results are
+    concatenated in input order. The pool is created on first use and reused
+    by later calls.
+
+    Args:
+        numbers: An iterable of numeric values
+        max_workers: Number of threads; defaults to the usable CPUs on a
+            free-threaded build and to 1 when the GIL is enabled
+        min_batch: Batch size below which the calling thread does the work
+
+    Returns:
+        A list with add_one applied to each element, in input order
+
+    Raises:
+        TypeError: If any element is not a numeric type
+        ValueError: If max_workers is smaller than 1
+
+    Examples:
+        >>> add_one_threaded(range(5), max_workers=2, min_batch=0)
+        [1, 2, 3, 4, 5]
+    """
+    numbers = list(numbers)
+    if max_workers is None:
+        max_workers = usable_cpus() if free_threaded() else 1
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    workers = min(max_workers, len(numbers))
+    if workers <= 1 or len(numbers) < min_batch:
+        return add_one_many(numbers)
+    size = -(-len(numbers) // workers)
+    slices = [numbers[start : start + size] for start in range(0, len(numbers), size)]
+    probe = _probe
+    if probe is not None:
+        return probe.call(
+            "threaded", type(numbers[0]), len(numbers), 0, _map, slices, max_workers
+        )
+    return _map(slices, max_workers)
+
+
+def shutdown_pool():
+    """
+    Shut down the thread pool used by add_one_threaded, if one is running.
+    """
+    _pool.shutdown()
+
+
+def _map(slices, workers):
+    results = []
+    for part in _pool.get(workers).map(add_one_many, slices):
+        results.extend(part)
+    return results
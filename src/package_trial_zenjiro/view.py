@@ -0,0 +1,96 @@
+"""
+Lazy view engine for package_trial_zenjiro.
+
+This module provides AddOneView, a read-only sequence over another
+sequence whose elements are add_one of the underlying elements. Nothing
+is computed when the view is created or sliced; add_one runs only for the
+elements that are actually read.
+"""
+
+from array import array
+from collections.abc import Sequence
+
+from .buffer import TYPECODES, add_one_buffer
+from .main import add_one
+
+
+class AddOneView(Sequence):
+    """
+    Read-only sequence that applies add_one to elements on access.
+
+    The view keeps a reference to the input and a range of indices into it,
+    so creating or slicing a view takes constant time and memory. Reads see
+    the current contents of the input; the length is fixed when the view is
+    created.
+
+    Args:
+        sequence: Any object supporting len() and integer indexing
+
+    Examples:
+        >>> view = AddOneView(range(10**12))
+        >>> view[5]
+        6
+        >>> list(view[2:8:2])
+        [3, 5, 7]
+        >>> len(view[::-1])
+        1000000000000
+    """
+
+    __slots__ = ("_sequence", "_indices")
+
+    def __init__(self, sequence, _indices=None):
+        self._sequence = sequence
+        self._indices = range(len(sequence)) if _indices is None else _indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return AddOneView(self._sequence, self._indices[index])
+        return add_one(self._sequence[self._indices[index]])
+
+    def __iter__(self):
+        # Element by element, so an iterator abandoned early reads nothing
+        # more and every element reflects the input when it is reached.
+        sequence = self._sequence
+        return (add_one(sequence[i]) for i in self._indices)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(<{len(self)} elements>)"
+
+    def to_array(self):
+        """
+        Compute the view into a new array.array.
+
+        Only available when the input exports a one-dimensional numeric
+        buffer; the elements are selected from the raw buffer and updated
+        with add_one_buffer, without creating per-element objects for
+        integer types.
+
+        Returns:
+            An array.array with the input's typecode
+
+        Raises:
+            TypeError: If the input is not a supported numeric buffer
+            OverflowError: If an integer element is already at its maximum
+
+        Examples:
+            >>> AddOneView(array("i", [1, 2, 3]))[::2].to_array()
+            array('i', [2, 4])
+        """
+        indices = self._indices
+        with memoryview(self._sequence) as view:
+            code = view.format.lstrip("@")
+            if view.ndim != 1 or code not in TYPECODES:
+                raise TypeError(f"unsupported buffer element type {code!r}")
+            if not indices:
+                return array(code)
+            stop = indices.stop if indices.stop >= 0 else None
+            with view[indices.start : stop : indices.step] as selected:
+                result = array(code, selected.tobytes())
+        return add_one_buffer(result)
+
+    def __buffer__(self, flags):
+        # Buffer export from Python classes needs Python 3.12 (PEP 688).
+        return memoryview(self.to_array())
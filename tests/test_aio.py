@@ -0,0 +1,193 @@
+"""
+Tests for the aio module of package_trial_zenjiro.
+
+This module contains tests for the asyncio API, covering async iterables,
+queue sources, executor offloading, backpressure and error propagation.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.package_trial_zenjiro.aio import (
+    add_one_async_chunks,
+    add_one_async_stream,
+    add_one_queue_worker,
+)
+from src.package_trial_zenjiro.main import add_one
+
+
+async def _aiter(values):
+    for value in values:
+        yield value
+
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+
+class TestAsyncAPI:
+    """Test class for the asyncio API."""
+
+    def test_async_stream_matches_scalar(self):
+        """Results equal element-wise add_one in input order."""
+        data = [1, -2.5, 3j, True, 10**20] * 1000
+        results = asyncio.run(_collect(add_one_async_stream(_aiter(data))))
+        assert results == [add_one(x) for x in data]
+
+    def test_chunks_respect_max_batch(self):
+        """No micro-batch is larger than max_batch."""
+        chunks = asyncio.run(
+            _collect(add_one_async_chunks(_aiter(range(5000)), max_batch=300))
+        )
+        assert max(len(chunk) for chunk in chunks) <= 300
+        assert [x for chunk in chunks for x in chunk] == list(range(1, 5001))
+
+    def test_large_batches_run_in_executor(self):
+        """Batches above the threshold are computed by the given executor."""
+        calls = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                calls.append(len(args[0]))
+                return super().submit(fn, *args, **kwargs)
+
+        async def run():
+            queue = asyncio.Queue()
+            for value in range(100):
+                queue.put_nowait(value)
+            queue.put_nowait(None)
+            with RecordingExecutor(1) as executor:
+                return await _collect(
+                    add_one_async_chunks(queue, offload_threshold=50, executor=executor)
+                )
+
+        chunks = asyncio.run(run())
+        assert chunks == [list(range(1, 101))]
+        assert calls == [100]
+
+    def test_queue_source_stops_at_sentinel(self):
+        """Items queued after the sentinel are left in the queue."""
+        done = object()
+
+        async def run():
+            queue = asyncio.Queue()
+            for value in [1, 2, done, 3]:
+                queue.put_nowait(value)
+            results = await _collect(add_one_async_stream(queue, sentinel=done))
+            return results, queue.qsize()
+
+        assert asyncio.run(run()) == ([2, 3], 1)
+
+    def test_queue_source_batches_what_is_ready(self):
+        """Queue batches end when the queue runs dry or max_batch is hit."""
+
+        async def run():
+            queue = asyncio.Queue()
+            stream = add_one_async_chunks(queue, max_batch=2)
+            for value in range(3):
+                queue.put_nowait(value)
+            first = await stream.__anext__()
+            second = await stream.__anext__()
+            queue.put_nowait(None)
+            rest = await _collect(stream)
+            return first, second, rest
+
+        assert asyncio.run(run()) == ([1, 2], [3], [])
+
+    def test_queue_worker_forwards_sentinel(self):
+        """The queue worker puts every result and then the sentinel."""
+
+        async def run():
+            inbox, outbox = asyncio.Queue(), asyncio.Queue(2)
+            worker = asyncio.create_task(add_one_queue_worker(inbox, outbox))
+            for value in range(5):
+                await inbox.put(value)
+            await inbox.put(None)
+            received = []
+            while (item := await outbox.get()) is not None:
+                received.append(item)
+            return received, await worker
+
+        assert asyncio.run(run()) == ([1, 2, 3, 4, 5], 5)
+
+    def test_backpressure_bounds_read_ahead(self):
+        """A stalled consumer stops the reader after buffer_size items."""
+        pulled = []
+
+        async def source():
+            for value in range(10000):
+                pulled.append(value)
+                yield value
+
+        async def run():
+            stream = add_one_async_chunks(source(), buffer_size=64, max_batch=8)
+            first = await stream.__anext__()
+            for _ in range(20):
+                await asyncio.sleep(0)
+            await stream.aclose()
+            return first
+
+        assert asyncio.run(run()) == list(range(1, 9))
+        assert len(pulled) <= 64 + 8 + 1
+
+    def test_slow_source_items_arrive_without_delay(self):
+        """An item is delivered while the source waits for the next one."""
+
+        async def run():
+            release = asyncio.Event()
+
+            async def source():
+                for value in range(3):
+                    yield value
+                    await release.wait()
+
+            stream = add_one_async_stream(source())
+            first = await asyncio.wait_for(stream.__anext__(), timeout=5)
+            release.set()
+            return [first] + await _collect(stream)
+
+        assert asyncio.run(run()) == [1, 2, 3]
+
+    def test_event_loop_keeps_running(self):
+        """Other tasks get scheduled while a long stream is processed."""
+
+        async def run():
+            ticks = 0
+            stop = asyncio.Event()
+
+            async def ticker():
+                nonlocal ticks
+                while not stop.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.create_task(ticker())
+            async for _ in add_one_async_chunks(_aiter(range(50000))):
+                pass
+            stop.set()
+            await task
+            return ticks
+
+        assert asyncio.run(run()) > 10
+
+    def test_errors_propagate(self):
+        """Source errors and type errors reach the consumer."""
+
+        async def failing():
+            yield 1
+            raise RuntimeError("source failed")
+
+        with pytest.raises(RuntimeError, match="source failed"):
+            asyncio.run(_collect(add_one_async_stream(failing())))
+
+        with pytest.raises(TypeError):
+            asyncio.run(_collect(add_one_async_stream(_aiter([1, "string"]))))
+
+        with pytest.raises(ValueError):
+            asyncio.run(_collect(add_one_async_stream(_aiter([1]), max_batch=0)))
+
+    def test_empty_source(self):
+        """Empty sources yield nothing."""
+        assert asyncio.run(_collect(add_one_async_stream(_aiter([])))) == []
@@ -0,0 +1,225 @@
+"""
+Tests for the bench module of package_trial_zenjiro.
+
+This module contains tests for the benchmark suite: the benchmark matrix,
+calibration and statistics, JSON result files, baseline comparison and the
+command line.
+"""
+
+import json
+from timeit import Timer
+
+import pytest
+
+from src.package_trial_zenjiro import bench, registry
+from src.package_trial_zenjiro.bench import (
+    Measurement,
+    benchmarks,
+    calibrate,
+    compare,
+    format_comparison,
+    format_measurement,
+    load_results,
+    main,
+    measure,
+    run,
+    save_results,
+)
+
+
+def fake(median, spread=0.01, count=11):
+    """Build a Measurement whose samples are spread evenly around median."""
+    step = median * spread
+    samples = tuple(median + step * (i - count // 2) for i in range(count))
+    return Measurement(100, samples)
+
+
+class TestBenchmarkMatrix:
+    """Test class for the benchmark matrix."""
+
+    def test_names_cover_engines_types_and_sizes(self):
+        """The default matrix spans every engine, type and size."""
+        names = list(benchmarks())
+        assert "scalar/int/1" in names
+        assert "many/fraction/10000" in names
+        assert "threaded-4/decimal/100" in names
+        assert "parallel-2/complex/1" in names
+        assert "buffer/float/10000" in names
+        assert "buffer/decimal/1" not in names
+        assert "shared-2/int/100" in names
+        assert "shared-2/fraction/100" not in names
+        assert "plus/int/100" in names
+        assert "dispatch/fixed/10000" in names
+        assert "many/fixed/100" in names
+        assert "buffer/fixed/1" not in names
+
+    def test_patterns_and_sizes_select(self):
+        """Patterns and sizes narrow the matrix."""
+        names = benchmarks(("many/*", "buffer/int/*"), sizes=(5,))
+        assert list(names) == [
+            f"many/{t}/5"
+            for t in ("int", "float", "complex", "decimal", "fraction", "fixed")
+        ] + ["buffer/int/5"]
+
+    def test_benchmarks_compute_add_one(self):
+        """Every selected callable runs its engine on the prepared data."""
+        selected = benchmarks(("*/int/*",), sizes=(3,))
+        for name, func in selected.items():
+            result = func()
+            assert list(result) == [1, 2, 3], name
+
+    def test_fixed_input_uses_registered_handler(self, monkeypatch):
+        """The custom input type reaches its handler through the registry."""
+        calls = []
+        handler = bench._increment_fixed
+        monkeypatch.setitem(
+            registry._handlers,
+            bench._Fixed,
+            lambda number: calls.append(number) or handler(number),
+        )
+        monkeypatch.setattr(registry, "_resolved", {})
+        selected = benchmarks(("dispatch/fixed/*", "many/fixed/*"), sizes=(3,))
+        for name, func in selected.items():
+            assert [number.raw for number in func()] == [1000, 1250, 1500], name
+        assert len(calls) == 6
+
+
+class TestMeasurement:
+    """Test class for timing and statistics."""
+
+    def test_statistics(self):
+        """Median and interquartile range are computed from the samples."""
+        result = Measurement(10, (1.0, 2.0, 3.0, 4.0, 100.0))
+        assert result.median == 3.0
+        assert result.iqr == pytest.approx(52.0 - 1.5)
+
+    def test_calibrate_reaches_min_time(self):
+        """Calibration grows the loop count until min_time is reached."""
+        timer = Timer(lambda: None)
+        loops = calibrate(timer, 0.001)
+        assert loops > 1
+        assert timer.timeit(loops) >= 0.0005
+
+    def test_calibrate_handles_zero_timings(self):
+        """A timer reporting zero elapsed time still terminates."""
+        readings = iter([0.0, 0.0, 0.0, 1.0])
+        timer = Timer(lambda: None, timer=lambda: next(readings))
+        assert calibrate(timer, 0.5) == 10
+
+    def test_measure(self):
+        """measure returns one per-call sample per repetition."""
+        calls = []
+        result = measure(lambda: calls.append(1), repeat=3, min_time=0.0005)
+        assert len(result.samples) == 3
+        assert len(calls) >= 1 + 3 * result.loops
+        assert all(sample > 0 for sample in result.samples)
+
+    def test_run_reports_every_benchmark(self):
+        """run measures each benchmark and reports it once."""
+        reported = []
+        results = run(
+            {"a": lambda: None, "b": lambda: sum(range(10))},
+            repeat=3,
+            min_time=0.0005,
+            report=lambda name, result: reported.append(name),
+        )
+        assert list(results) == ["a", "b"] == reported
+        assert all(len(result.samples) == 3 for result in results.values())
+
+    @pytest.mark.parametrize("func", [measure, run])
+    def test_repeat_must_allow_quartiles(self, func):
+        """At least three samples are required."""
+        with pytest.raises(ValueError):
+            func({} if func is run else (lambda: None), repeat=2)
+
+
+class TestResults:
+    """Test class for JSON files and comparisons."""
+
+    def test_round_trip(self, tmp_path):
+        """Saved results load back as equal Measurements."""
+        path = tmp_path / "results.json"
+        results = {"many/int/1": fake(1e-6), "scalar/int/1": fake(2e-6)}
+        save_results(path, results)
+        assert load_results(path) == results
+        document = json.loads(path.read_text())
+        assert document["results"]["many/int/1"]["median"] == pytest.approx(1e-6)
+        assert {"python", "machine", "created"} <= set(document)
+
+    def test_load_rejects_other_files(self, tmp_path):
+        """Files that are not results files are rejected."""
+        path = tmp_path / "other.json"
+        path.write_text("[1, 2, 3]")
+        with pytest.raises(ValueError):
+            load_results(path)
+
+    def test_compare_flags_significant_slowdown(self):
+        """A clear slowdown beyond the threshold is a regression."""
+        (comparison,) = compare({"x": fake(1.0)}, {"x": fake(1.5)})
+        assert comparison.regressed
+        assert comparison.change == pytest.approx(0.5)
+        assert comparison.p_value < 0.001
+        assert "REGRESSION" in format_comparison(comparison)
+
+    def test_compare_ignores_noise_and_small_changes(self):
+        """Overlapping samples or changes under the threshold pass."""
+        noisy = compare({"x": fake(1.0, spread=0.2)}, {"x": fake(1.15, spread=0.2)})
+        small = compare({"x": fake(1.0)}, {"x": fake(1.05)})
+        faster = compare({"x": fake(1.0)}, {"x": fake(0.5)})
+        assert not noisy[0].regressed and noisy[0].p_value > 0.01
+        assert not small[0].regressed and small[0].p_value < 0.01
+        assert not faster[0].regressed and faster[0].p_value > 0.99
+
+    def test_compare_identical_samples(self):
+        """Identical constant samples have no evidence of a slowdown."""
+        flat = Measurement(1, (1.0,) * 5)
+        (comparison,) = compare({"x": flat}, {"x": flat})
+        assert comparison.p_value == 1.0 and not comparison.regressed
+
+    def test_compare_skips_unmatched_names(self):
+        """Benchmarks missing on either side are not compared."""
+        assert compare({"a": fake(1.0)}, {"b": fake(1.0)}) == []
+
+    def test_format_measurement_units(self):
+        """Report lines use readable time units."""
+        assert "ns" in format_measurement("x", fake(5e-8))
+        assert "us" in format_measurement("x", fake(5e-6))
+        assert "ms" in format_measurement("x", fake(5e-3))
+        assert " s " in format_measurement("x", fake(2.0))
+
+
+class TestBenchCommand:
+    """Test class for the command line."""
+
+    def test_list(self, capsys):
+        """--list prints the selected names without measuring."""
+        assert main(["--list", "-k", "stream/*", "--size", "7"]) == 0
+        assert capsys.readouterr().out.split() == [
+            f"stream/{t}/7"
+            for t in ("int", "float", "complex", "decimal", "fraction", "fixed")
+        ]
+
+    def test_run_and_compare(self, tmp_path, capsys):
+        """Results can be written and compared against a baseline."""
+        output = tmp_path / "current.json"
+        args = ["-k", "many/int/*", "--size", "10", "--repeat", "5"]
+        assert main([*args, "--min-time", "0.0005", "-o", str(output)]) == 0
+        assert "many/int/10" in capsys.readouterr().out
+        assert list(load_results(output)) == ["many/int/10"]
+
+        baseline = tmp_path / "baseline.json"
+        save_results(baseline, {"many/int/10": Measurement(1, (1e-12,) * 5)})
+        assert main([*args, "--min-time", "0.0005", "--compare", str(baseline)]) == 1
+        assert "REGRESSION" in capsys.readouterr().out
+
+        save_results(baseline, {"many/int/10": Measurement(1, (1.0,) * 5)})
+        assert main([*args, "--min-time", "0.0005", "--compare", str(baseline)]) == 0
+
+    @pytest.mark.parametrize(
+        "argv", [["--repeat", "2"], ["--compare", "/nonexistent/baseline.json"]]
+    )
+    def test_invalid_arguments(self, argv, capsys):
+        """Bad options and unreadable baselines are usage errors."""
+        with pytest.raises(SystemExit) as info:
+            main(argv)
+        assert info.value.code == 2
@@ -0,0 +1,141 @@
+"""
+Tests for the buffer module of package_trial_zenjiro.
+
+This module contains tests for add_one_buffer, covering every supported
+typecode, in-place and out-of-place operation, raw byte buffers and
+overflow handling.
+"""
+
+import math
+import mmap
+import struct
+from array import array
+
+import pytest
+
+from src.package_trial_zenjiro.buffer import TYPECODES, add_one_buffer
+from src.package_trial_zenjiro.main import add_one
+
+
+def _limits(typecode):
+    bits = struct.calcsize(typecode) * 8
+    if typecode.isupper():
+        return 0, (1 << bits) - 1
+    return -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+
+
+class TestAddOneBuffer:
+    """Test class for the add_one_buffer function."""
+
+    @pytest.mark.parametrize("typecode", [c for c in TYPECODES if c not in "fd"])
+    def test_integer_typecodes_match_scalar(self, typecode):
+        """Integer lanes are incremented independently up to their limits."""
+        low, high = _limits(typecode)
+        values = sorted({low, low + 1, 0, 1, 2, high - 1, max(low, -1)})
+        data = array(typecode, values)
+        add_one_buffer(data)
+        assert list(data) == [add_one(v) for v in values]
+
+    @pytest.mark.parametrize("typecode", ["f", "d"])
+    def test_float_typecodes_match_scalar(self, typecode):
+        """Float buffers keep the scalar semantics for special values."""
+        values = [0.5, -0.0, -1.0, 1e30, float("inf"), float("-inf")]
+        data = array(typecode, values)
+        add_one_buffer(data)
+        expected = array(typecode, [add_one(v) for v in array(typecode, values)])
+        assert data == expected
+        assert math.copysign(1.0, data[1]) == 1.0
+
+        nan_data = array(typecode, [float("nan")])
+        add_one_buffer(nan_data)
+        assert math.isnan(nan_data[0])
+
+    def test_out_buffer_leaves_source_untouched(self):
+        """Results go to the caller-supplied output buffer."""
+        source = array("q", [1, 2, 3])
+        out = array("q", [0, 0, 0])
+        assert add_one_buffer(source, out) is out
+        assert list(out) == [2, 3, 4]
+        assert list(source) == [1, 2, 3]
+
+    def test_read_only_source_with_out(self):
+        """A read-only source is fine as long as the output is writable."""
+        source = bytes(array("i", [7, 8]))
+        out = bytearray(len(source))
+        add_one_buffer(source, out, typecode="i")
+        assert list(array("i", bytes(out))) == [8, 9]
+
+        out = bytearray(len(source))
+        add_one_buffer(array("i", [1, 2]), out)
+        assert list(array("i", bytes(out))) == [2, 3]
+
+    def test_memoryview_and_mmap(self):
+        """Memoryviews and anonymous mmaps are reinterpreted via typecode."""
+        data = array("q", range(1000))
+        with mmap.mmap(-1, len(data) * data.itemsize) as mapped:
+            mapped[:] = data.tobytes()
+            add_one_buffer(memoryview(mapped), typecode="q")
+            assert list(array("q", mapped[:])) == list(range(1, 1001))
+
+    @pytest.mark.parametrize("chunk_bytes", [1, 8, 24, 1000, None])
+    def test_chunking_does_not_change_results(self, chunk_bytes):
+        """Chunk boundaries are aligned to whole elements."""
+        data = array("l", range(-500, 500))
+        add_one_buffer(data, chunk_bytes=chunk_bytes)
+        assert list(data) == list(range(-499, 501))
+
+        floats = array("d", [x / 3 for x in range(100)])
+        expected = [x / 3 + 1 for x in range(100)]
+        add_one_buffer(floats, chunk_bytes=chunk_bytes)
+        assert list(floats) == expected
+
+    @pytest.mark.parametrize("typecode", list("bBhHiIlLqQ"))
+    def test_overflow_reports_index(self, typecode):
+        """An element at its maximum raises OverflowError with its index."""
+        _, high = _limits(typecode)
+        data = array(typecode, [0, 0, 0, high, 0])
+        with pytest.raises(OverflowError, match="index 3"):
+            add_one_buffer(data, chunk_bytes=data.itemsize * 2)
+
+    @pytest.mark.parametrize("typecode", list("bBhHiIlLqQ"))
+    @pytest.mark.parametrize("overflow", ["wrap", "saturate"])
+    def test_overflow_policies(self, typecode, overflow):
+        """wrap and saturate act on the overflowing lanes only."""
+        low, high = _limits(typecode)
+        data = array(typecode, [high, low, high - 1, high, 0] * 7)
+        replacement = low if overflow == "wrap" else high
+        expected = [replacement if x == high else x + 1 for x in data]
+        add_one_buffer(data, chunk_bytes=data.itemsize * 3, overflow=overflow)
+        assert list(data) == expected
+
+    def test_unknown_overflow_policy(self):
+        """Only the policies in OVERFLOW_POLICIES are accepted."""
+        with pytest.raises(ValueError, match="overflow"):
+            add_one_buffer(array("q", [1]), overflow="clamp")
+
+    def test_empty_buffer(self):
+        """Empty buffers are accepted."""
+        assert list(add_one_buffer(array("d"))) == []
+
+    def test_errors(self):
+        """Unsupported or mismatched buffers are rejected."""
+        with pytest.raises(TypeError):
+            add_one_buffer(bytes(8), typecode="q")
+
+        with pytest.raises(TypeError):
+            add_one_buffer(array("u", "ab"))
+
+        with pytest.raises(TypeError):
+            add_one_buffer(array("q", [1]), array("d", [0.0]))
+
+        with pytest.raises(ValueError):
+            add_one_buffer(array("q", [1]), array("q", [0, 0]))
+
+        with pytest.raises(ValueError):
+            add_one_buffer(bytearray(3), typecode="h")
+
+        with pytest.raises(ValueError):
+            add_one_buffer(memoryview(array("q", [1, 2, 3, 4]))[::2])
+
+        with pytest.raises(TypeError):
+            add_one_buffer("string")
@@ -0,0 +1,219 @@
+"""
+Tests for the cache module of package_trial_zenjiro.
+
+This module contains tests for AddOneCache, covering hits and misses,
+values that must not be cached, Decimal contexts, eviction under the
+memory cap, statistics and concurrent use.
+"""
+
+import math
+import threading
+from decimal import Decimal, Inexact, localcontext
+from fractions import Fraction
+
+import pytest
+
+from src.package_trial_zenjiro.cache import ENTRY_OVERHEAD, AddOneCache
+from src.package_trial_zenjiro.main import add_one
+
+
+class Expensive:
+    """Hashable numeric type that counts its additions."""
+
+    additions = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __add__(self, other):
+        Expensive.additions += 1
+        return Expensive(self.value + other)
+
+    def __eq__(self, other):
+        return isinstance(other, Expensive) and self.value == other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+class Unhashable:
+    """Numeric type without a hash."""
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return "added"
+
+
+class TestAddOneCache:
+    """Test class for the result cache."""
+
+    def test_hits_return_cached_results(self):
+        """Repeated values are computed once."""
+        Expensive.additions = 0
+        cached = AddOneCache()
+        results = [cached(Expensive(5)) for _ in range(10)]
+        assert Expensive.additions == 1
+        assert all(result == Expensive(6) for result in results)
+        stats = cached.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (9, 1, 1)
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            [True, 1, 1.0, Fraction(1), 1 + 1j],
+            [Decimal("1.0"), Decimal("1.00"), Decimal("1")],
+            [Decimal("-0"), Decimal("0")],
+        ],
+    )
+    def test_equal_values_of_other_types_or_forms_are_separate(self, values):
+        """Keys include the type and the exact Decimal representation."""
+        cached = AddOneCache()
+        for _ in range(2):
+            for value in values:
+                result = cached(value)
+                expected = add_one(value)
+                assert type(result) is type(expected)
+                assert repr(result) == repr(expected)
+        assert cached.stats().entries == len(values)
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            math.nan,
+            0.0,
+            -0.0,
+            complex(0.0, 1.0),
+            complex(1.0, -0.0),
+            complex(math.nan, 1.0),
+            Decimal("NaN"),
+        ],
+    )
+    def test_ambiguous_values_are_not_cached(self, value):
+        """NaNs and signed zeros bypass the cache."""
+        cached = AddOneCache()
+        result = cached(value)
+        assert repr(result) == repr(add_one(value))
+        assert cached.stats().uncacheable == 1
+        assert len(cached) == 0
+
+    def test_signed_zero_results_stay_exact(self):
+        """-0.0 and 0.0 each get add_one of themselves."""
+        cached = AddOneCache()
+        assert math.copysign(1, cached(-1.0) - 1) == -1
+        assert repr(cached(complex(-1.0, -0.0))) == repr(add_one(complex(-1.0, -0.0)))
+
+    def test_self_unequal_values_are_not_cached(self):
+        """Values that do not equal themselves behave like NaN."""
+
+        class Unequal(Expensive):
+            def __eq__(self, other):
+                return False
+
+            __hash__ = Expensive.__hash__
+
+        cached = AddOneCache()
+        cached(Unequal(1))
+        assert cached.stats().uncacheable == 1
+
+    def test_unhashable_values_are_not_cached(self):
+        """Unhashable inputs are computed every time."""
+        cached = AddOneCache()
+        assert cached(Unhashable()) == "added"
+        assert cached.stats().uncacheable == 1
+
+    def test_errors_are_not_cached(self):
+        """Exceptions propagate and leave no entry behind."""
+        cached = AddOneCache()
+        with pytest.raises(TypeError):
+            cached("1")
+        assert len(cached) == 0
+
+    def test_decimal_context_is_part_of_the_key(self):
+        """The same Decimal under another precision is a different entry."""
+        cached = AddOneCache()
+        value = Decimal("123.45")
+        assert cached(value) == Decimal("124.45")
+        with localcontext() as ctx:
+            ctx.prec = 4
+            ctx.traps[Inexact] = False
+            assert cached(value) == Decimal("124.4")
+        assert cached(value) == Decimal("124.45")
+
+    def test_inexact_decimals_signal_as_without_cache(self):
+        """Rounding additions are not cached and still raise their traps."""
+        cached = AddOneCache()
+        with localcontext() as ctx:
+            ctx.prec = 3
+            ctx.traps[Inexact] = True
+            for _ in range(2):
+                with pytest.raises(Inexact):
+                    cached(Decimal("123.4"))
+            ctx.traps[Inexact] = False
+            ctx.clear_flags()
+            assert cached(Decimal("123.4")) == Decimal("124")
+            assert ctx.flags[Inexact]
+        assert len(cached) == 0
+        assert cached.stats().uncacheable == 3
+
+    def test_eviction_is_least_recently_used(self):
+        """The oldest unused entry is evicted first to respect the cap."""
+        cached = AddOneCache(max_bytes=3 * (ENTRY_OVERHEAD + 56))
+        for value in (10**3, 10**4, 10**5):
+            cached(value)
+        cached(10**3)
+        cached(10**6)
+        stats = cached.stats()
+        assert stats.evictions >= 1
+        assert stats.bytes <= stats.max_bytes
+        hits = stats.hits
+        cached(10**3)
+        assert cached.stats().hits == hits + 1
+        cached(10**4)
+        assert cached.stats().hits == hits + 1
+
+    def test_oversized_entries_are_skipped(self):
+        """An entry larger than the cap is computed but not stored."""
+        cached = AddOneCache(max_bytes=100)
+        assert cached(10**1000) == 10**1000 + 1
+        assert len(cached) == 0 and cached.stats().misses == 1
+
+    def test_clear(self):
+        """clear drops entries and counters."""
+        cached = AddOneCache()
+        cached(5)
+        cached(5)
+        cached.clear()
+        assert cached.stats() == (0, 0, 0, 0, 0, 0, cached.max_bytes)
+
+    def test_custom_function(self):
+        """Any single-argument function can be memoized."""
+        cached = AddOneCache(function=lambda number: number * 2)
+        assert cached(21) == 42
+
+    def test_invalid_cap(self):
+        """A negative cap is rejected."""
+        with pytest.raises(ValueError):
+            AddOneCache(max_bytes=-1)
+
+    def test_thread_safety(self):
+        """Concurrent callers get correct results and consistent counters."""
+        cached = AddOneCache(max_bytes=20 * (ENTRY_OVERHEAD + 64))
+        errors = []
+
+        def worker(offset):
+            for i in range(2000):
+                value = (i + offset) % 50
+                if cached(value) != value + 1:
+                    errors.append(value)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cached.stats()
+        assert not errors
+        assert stats.hits + stats.misses == 8000
+        assert stats.bytes <= stats.max_bytes
+        assert stats.entries == len(cached)
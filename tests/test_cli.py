@@ -0,0 +1,186 @@
+"""
+Tests for the command-line interface of package_trial_zenjiro.
+
+This module contains tests for the add-one command and the batch literal
+parser behind it, covering every literal kind, block boundaries, standard
+streams and error reporting.
+"""
+
+import io
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from src.package_trial_zenjiro._literals import format_lines, parse_lines
+from src.package_trial_zenjiro.cli import main
+
+
+def _run(tmp_path, text, *options):
+    source = tmp_path / "in.txt"
+    target = tmp_path / "out.txt"
+    source.write_text(text)
+    status = main([str(source), "-o", str(target), *options])
+    return status, target.read_text()
+
+
+class TestCommandLine:
+    """Test class for the add-one command."""
+
+    def test_integers(self, tmp_path):
+        """Integer lines are incremented and keep their type."""
+        assert _run(tmp_path, "1\n-5\n99999999999999999999\n") == (
+            0,
+            "2\n-4\n100000000000000000000\n",
+        )
+
+    def test_auto_detects_each_line(self, tmp_path):
+        """Mixed blocks fall back to per-line detection."""
+        status, output = _run(tmp_path, "1\n2.5\n(1+2j)\n \n-0.0\ninf\n")
+        assert status == 0
+        assert output == "2\n3.5\n(2+2j)\n1.0\ninf\n"
+
+    def test_float_only_block(self, tmp_path):
+        """Blocks without integer lines are read as floats in one pass."""
+        assert _run(tmp_path, "0.5\n1e3\nnan\n") == (0, "1.5\n1001.0\nnan\n")
+
+    @pytest.mark.parametrize(
+        "kind,text,expected",
+        [
+            ("int", "7\n", "8\n"),
+            ("float", "7\n", "8.0\n"),
+            ("complex", "1j\n", "(1+1j)\n"),
+            ("decimal", "1.10\n-0.5\n", "2.10\n0.5\n"),
+        ],
+    )
+    def test_explicit_types(self, tmp_path, kind, text, expected):
+        """--type selects how every literal is read."""
+        assert _run(tmp_path, text, "--type", kind) == (0, expected)
+
+    def test_integers_beyond_the_digit_limit(self, tmp_path):
+        """Integers longer than int()'s digit limit stay exact."""
+        huge = "9" * 5000
+        expected = "1" + "0" * 5000
+        assert _run(tmp_path, f"{huge}\n") == (0, f"{expected}\n")
+        assert _run(tmp_path, f"{huge}\n1.5\n") == (0, f"{expected}\n2.5\n")
+        assert _run(tmp_path, f"{huge}\n", "--type", "int") == (0, f"{expected}\n")
+
+    def test_lines_split_across_blocks(self, tmp_path):
+        """A line cut by the block boundary is joined before parsing."""
+        numbers = "\n".join(str(n) for n in range(1000))
+        status, output = _run(tmp_path, numbers, "--block-size", "7")
+        assert status == 0
+        assert output.split() == [str(n) for n in range(1, 1001)]
+
+    def test_multiple_files(self, tmp_path):
+        """Files are processed in order into one output."""
+        first, second, target = (tmp_path / n for n in ("a", "b", "out"))
+        first.write_text("1\n")
+        second.write_text("2\n")
+        assert main([str(first), str(second), "-o", str(target)]) == 0
+        assert target.read_text() == "2\n3\n"
+
+    def test_standard_streams(self, monkeypatch):
+        """Without arguments the command filters stdin to stdout."""
+        stdout = io.TextIOWrapper(io.BytesIO())
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(b"41\n")))
+        monkeypatch.setattr(sys, "stdout", stdout)
+        assert main([]) == 0
+        assert stdout.buffer.getvalue() == b"42\n"
+
+    def test_invalid_line_reports_line_number(self, tmp_path, capsys):
+        """Invalid input exits with status 1 and names the line."""
+        status, _ = _run(tmp_path, "1\n2\nabc\n", "--block-size", "2")
+        assert status == 1
+        assert "line 3" in capsys.readouterr().err
+
+        status, _ = _run(tmp_path, "1.5\n", "--type", "decimal")
+        assert status == 0
+        status, _ = _run(tmp_path, "x\n", "--type", "decimal")
+        assert status == 1
+
+    def test_file_errors_are_reported(self, tmp_path, capsys):
+        """Missing inputs and unwritable outputs exit with status 1."""
+        missing = tmp_path / "missing.txt"
+        assert main([str(missing), "-o", str(tmp_path / "out.txt")]) == 1
+        assert capsys.readouterr().err.startswith("add-one: ")
+
+        source = tmp_path / "in.txt"
+        source.write_text("1\n")
+        assert main([str(source), "-o", str(tmp_path / "no" / "out.txt")]) == 1
+        assert "No such file" in capsys.readouterr().err
+
+    def test_invalid_block_size(self, tmp_path):
+        """A block size below one is a usage error."""
+        with pytest.raises(SystemExit):
+            main(["--block-size", "0"])
+
+    def test_csv_column(self, tmp_path):
+        """--csv rewrites one column and copies everything else."""
+        text = 'id;n;note\n1;41;"a; b"\n2;;x\n'
+        assert _run(tmp_path, text, "--csv", "n", "--delimiter", ";") == (
+            0,
+            'id;n;note\n1;42;"a; b"\n2;;x\n',
+        )
+        assert _run(tmp_path, "n\n1.10\n", "--csv", "n", "-t", "decimal") == (
+            0,
+            "n\n2.10\n",
+        )
+
+    def test_ndjson_field(self, tmp_path, capsys):
+        """--ndjson rewrites one field; bad values exit with status 1."""
+        text = '{"n": 41, "m": 1}\n{"m": 1}\n'
+        assert _run(tmp_path, text, "--ndjson", "n") == (
+            0,
+            '{"n": 42, "m": 1}\n{"m": 1}\n',
+        )
+        status, _ = _run(tmp_path, '{"n": "x"}\n', "--ndjson", "n")
+        assert status == 1
+        assert "line 1" in capsys.readouterr().err
+        with pytest.raises(SystemExit):
+            main(["--csv", "a", "--ndjson", "b"])
+
+    def test_module_entry_point(self, tmp_path):
+        """python -m package_trial_zenjiro runs the same command."""
+        source = Path(__file__).parent.parent / "src"
+        completed = subprocess.run(
+            [sys.executable, "-m", "package_trial_zenjiro"],
+            input=b"1\n2\n",
+            capture_output=True,
+            cwd=source,
+            check=True,
+        )
+        assert completed.stdout == b"2\n3\n"
+
+
+class TestLiterals:
+    """Test class for the batch literal helpers."""
+
+    def test_parse_lines_kinds(self):
+        """Each kind produces the matching Python type."""
+        assert parse_lines([b"1", b"2"]) == [1, 2]
+        assert parse_lines([b"1", b"2"], "float") == [1.0, 2.0]
+        assert parse_lines([b"1.5"], "decimal") == [Decimal("1.5")]
+        assert parse_lines([b"1_000", b"  "], "auto") == [1000]
+
+    def test_parse_lines_errors(self):
+        """Unknown kinds and bad literals are reported."""
+        with pytest.raises(KeyError):
+            parse_lines([b"1"], "roman")
+
+        with pytest.raises(ValueError, match="line 5"):
+            parse_lines([b"1", b"\xff"], "complex", first_line=4)
+
+        with pytest.raises(ValueError, match="line 2"):
+            parse_lines([b"1", b"1__2"], "int")
+
+        with pytest.raises(ValueError, match="line 1"):
+            parse_lines([b"9" * 5000 + b"_"])
+
+    def test_format_lines(self):
+        """Numbers become newline-terminated ASCII lines."""
+        assert format_lines([2, 1.5, 1j]) == b"2\n1.5\n1j\n"
+        assert format_lines([]) == b""
+        assert format_lines([10**5000, 1.5]) == b"1" + b"0" * 5000 + b"\n1.5\n"
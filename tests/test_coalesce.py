@@ -0,0 +1,188 @@
+"""
+Tests for the coalesce module of package_trial_zenjiro.
+
+This module contains tests for AddOneCoalescer, covering results, batching
+of calls that queue up, the adaptive window, error isolation, cancellation
+and shutdown.
+"""
+
+import threading
+import time
+from concurrent.futures import CancelledError
+from decimal import Decimal
+
+import pytest
+
+from src.package_trial_zenjiro.coalesce import AddOneCoalescer
+from src.package_trial_zenjiro.main import add_one, add_one_many
+
+
+class Recorder:
+    """Batch function recording batch sizes, optionally held until released."""
+
+    def __init__(self, hold=False):
+        self.sizes = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def __call__(self, numbers):
+        self.sizes.append(len(numbers))
+        self.started.set()
+        self.release.wait()
+        return add_one_many(numbers)
+
+
+def queue_behind_first(coalescer, recorder, values):
+    """Submit values while the batch of a first call is held."""
+    first = coalescer.submit(0)
+    recorder.started.wait()
+    futures = [coalescer.submit(v) for v in values]
+    recorder.release.set()
+    return [first] + futures
+
+
+class TestAddOneCoalescer:
+    """Test class for AddOneCoalescer."""
+
+    def test_results_match_add_one(self):
+        """Every caller receives add_one of its own value."""
+        values = [1, 2.5, 3j, True, Decimal("1.10"), 2**70]
+        with AddOneCoalescer() as coalescer:
+            assert [coalescer.add_one(v) for v in values] == [
+                add_one(v) for v in values
+            ]
+
+    def test_quiet_calls_run_alone_without_window(self):
+        """Calls from one thread run at once, each in its own batch."""
+        recorder = Recorder()
+        with AddOneCoalescer(recorder, max_wait=1.0) as coalescer:
+            began = time.perf_counter()
+            assert [coalescer.add_one(i) for i in range(20)] == list(range(1, 21))
+            elapsed = time.perf_counter() - began
+            assert coalescer.window == 0.0
+        assert recorder.sizes == [1] * 20
+        assert elapsed < 1.0
+
+    def test_calls_queued_during_a_batch_share_the_next(self):
+        """Calls arriving while a batch runs form the next batch."""
+        recorder = Recorder(hold=True)
+        with AddOneCoalescer(recorder) as coalescer:
+            futures = queue_behind_first(coalescer, recorder, range(1, 50))
+            assert [f.result() for f in futures] == list(range(1, 51))
+        assert recorder.sizes == [1, 49]
+
+    def test_max_batch(self):
+        """Batches never exceed max_batch."""
+        recorder = Recorder(hold=True)
+        with AddOneCoalescer(recorder, max_batch=16) as coalescer:
+            futures = queue_behind_first(coalescer, recorder, range(1, 50))
+            assert [f.result() for f in futures] == list(range(1, 51))
+        assert recorder.sizes == [1, 16, 16, 16, 1]
+
+    def test_calls_from_many_threads(self):
+        """The coalescer can be shared between threads."""
+        results = {}
+
+        def call(start):
+            results[start] = [coalescer.add_one(start + i) for i in range(100)]
+
+        with AddOneCoalescer() as coalescer:
+            threads = [
+                threading.Thread(target=call, args=(n * 1000,)) for n in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert results == {
+            n * 1000: list(range(n * 1000 + 1, n * 1000 + 101)) for n in range(8)
+        }
+
+    def test_window_adapts_to_load(self):
+        """The window opens under load, grows, shrinks and closes."""
+        coalescer = AddOneCoalescer(max_wait=0.016)
+        coalescer.close()
+        coalescer._adapt(1, 1)
+        assert coalescer.window == 0.0
+        coalescer._adapt(2, 2)
+        assert coalescer.window == 0.001
+        coalescer._adapt(3, 6)
+        assert coalescer.window == 0.002
+        for _ in range(5):
+            coalescer._adapt(3, 8)
+        assert coalescer.window == 0.016
+        coalescer._adapt(3, 5)
+        assert coalescer.window == 0.016
+        coalescer._adapt(3, 3)
+        assert coalescer.window == 0.008
+        for _ in range(3):
+            coalescer._adapt(3, 3)
+        assert coalescer.window == 0.001
+        coalescer._adapt(3, 3)
+        assert coalescer.window == 0.0
+
+    def test_window_collects_submissions(self):
+        """Submitters that do not wait get fewer, larger batches."""
+
+        def batches(max_wait):
+            recorder = Recorder()
+            with AddOneCoalescer(recorder, max_wait=max_wait) as coalescer:
+                futures = []
+                for i in range(2000):
+                    futures.append(coalescer.submit(i))
+                    if i % 4 == 0:
+                        time.sleep(0)
+                assert [f.result() for f in futures] == list(range(1, 2001))
+            return len(recorder.sizes)
+
+        assert batches(0.05) < batches(0.0)
+
+    def test_failing_value_is_isolated(self):
+        """A value the batch rejects only fails its own call."""
+        recorder = Recorder(hold=True)
+        with AddOneCoalescer(recorder) as coalescer:
+            good, bad, other = queue_behind_first(coalescer, recorder, ["x", 2.5])
+            assert good.result() == 1
+            with pytest.raises(TypeError):
+                bad.result()
+            assert other.result() == 3.5
+
+    def test_wrong_result_count_falls_back_to_scalar(self):
+        """A batch function returning too few results is not trusted."""
+        with AddOneCoalescer(lambda numbers: [], lambda n: n * 10) as coalescer:
+            assert coalescer.add_one(4) == 40
+
+    def test_cancelled_calls_are_skipped(self):
+        """A future cancelled before its batch runs is dropped."""
+        recorder = Recorder(hold=True)
+        with AddOneCoalescer(recorder) as coalescer:
+            first = coalescer.submit(0)
+            recorder.started.wait()
+            cancelled = coalescer.submit(1)
+            kept = coalescer.submit(2)
+            assert cancelled.cancel()
+            recorder.release.set()
+            assert first.result() == 1
+            assert kept.result() == 3
+            with pytest.raises(CancelledError):
+                cancelled.result()
+        assert recorder.sizes == [1, 1]
+
+    def test_close_runs_queued_calls(self):
+        """Calls queued before close still complete."""
+        recorder = Recorder(hold=True)
+        coalescer = AddOneCoalescer(recorder)
+        futures = queue_behind_first(coalescer, recorder, [5, 6])
+        coalescer.close()
+        assert [f.result() for f in futures] == [1, 6, 7]
+        with pytest.raises(RuntimeError, match="closed"):
+            coalescer.submit(1)
+
+    def test_invalid_arguments(self):
+        """max_batch and max_wait are validated."""
+        with pytest.raises(ValueError):
+            AddOneCoalescer(max_batch=0)
+        with pytest.raises(ValueError):
+            AddOneCoalescer(max_wait=-1)
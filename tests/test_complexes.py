@@ -0,0 +1,86 @@
+"""
+Tests for the complexes module of package_trial_zenjiro.
+
+This module contains tests for the interleaved and parallel-array complex
+paths, checking bit-for-bit agreement with add_one including signed
+zeros and NaN payloads.
+"""
+
+import struct
+from array import array
+
+import pytest
+
+from src.package_trial_zenjiro.complexes import (
+    add_one_complex_parts,
+    add_one_interleaved,
+    pack_complex,
+    unpack_complex,
+)
+from src.package_trial_zenjiro.main import add_one
+
+NAN_WITH_PAYLOAD = struct.unpack("<d", struct.pack("<Q", 0x7FF8_0000_0000_1234))[0]
+
+VALUES = [
+    1 + 2j,
+    complex(-0.0, -0.0),
+    complex(0.0, -0.0),
+    complex(-1.0, 0.0),
+    complex(1e308, -1e-308),
+    complex(float("inf"), float("-inf")),
+    complex(NAN_WITH_PAYLOAD, NAN_WITH_PAYLOAD),
+]
+
+
+def _bits(numbers):
+    return [struct.pack("<dd", z.real, z.imag) for z in numbers]
+
+
+class TestComplexLanes:
+    """Test class for the complex lane engine."""
+
+    @pytest.mark.parametrize("chunk_bytes", [16, 48, None])
+    def test_interleaved_in_place_matches_scalar_bits(self, chunk_bytes):
+        """Interleaved results equal add_one bit for bit."""
+        packed = pack_complex(VALUES)
+        add_one_interleaved(packed, chunk_bytes=chunk_bytes)
+        assert _bits(unpack_complex(packed)) == _bits(add_one(z) for z in VALUES)
+
+    def test_interleaved_into_out_buffer(self):
+        """Results can go to a separate buffer, including raw bytes."""
+        source = pack_complex(VALUES)
+        out = bytearray(len(source) * 8)
+        assert add_one_interleaved(source, out) is out
+        assert _bits(unpack_complex(out)) == _bits(add_one(z) for z in VALUES)
+        assert _bits(unpack_complex(source)) == _bits(VALUES)
+
+    def test_parallel_parts_match_scalar_bits(self):
+        """Separate real and imaginary arrays are updated in place."""
+        real = array("d", [z.real for z in VALUES])
+        imag = array("d", [z.imag for z in VALUES])
+        assert add_one_complex_parts(real, imag) == (real, imag)
+        results = [complex(r, i) for r, i in zip(real, imag)]
+        assert _bits(results) == _bits(add_one(z) for z in VALUES)
+
+    def test_pack_and_unpack_round_trip(self):
+        """Packing keeps the exact bits of both parts."""
+        assert _bits(unpack_complex(pack_complex(VALUES))) == _bits(VALUES)
+        assert pack_complex([]) == array("d")
+        assert unpack_complex(array("d")) == []
+
+    def test_errors(self):
+        """Odd lane counts, mismatched sizes and read-only targets fail."""
+        with pytest.raises(ValueError):
+            add_one_interleaved(array("d", [1.0, 2.0, 3.0]))
+
+        with pytest.raises(ValueError):
+            add_one_interleaved(array("d", [1.0, 2.0]), array("d", [0.0] * 4))
+
+        with pytest.raises(TypeError):
+            add_one_interleaved(bytes(16))
+
+        with pytest.raises(ValueError):
+            add_one_complex_parts(array("d", [1.0]), array("d"))
+
+        with pytest.raises(ValueError):
+            unpack_complex(array("d", [1.0]))
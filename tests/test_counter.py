@@ -0,0 +1,134 @@
+"""
+Tests for the counter module of package_trial_zenjiro.
+
+This module contains tests for BigCounter, covering in-place increments,
+folding of the delta, arithmetic with other numbers, comparison and
+hashing, interoperability with add_one and the cost of increments on huge
+values.
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from src.package_trial_zenjiro.bench import compare, measure
+from src.package_trial_zenjiro.counter import FOLD_AT, BigCounter
+from src.package_trial_zenjiro.main import add_one, add_one_many
+
+
+class TestBigCounter:
+    """Test class for BigCounter."""
+
+    def test_increments_in_place(self):
+        """+= and increment() change the counter itself."""
+        counter = BigCounter(10**100)
+        same = counter
+        for _ in range(1000):
+            counter += 1
+        counter.increment(-10)
+        counter -= 5
+        assert counter is same
+        assert int(counter) == 10**100 + 985
+        assert counter.increment() is counter
+        assert int(counter) == 10**100 + 986
+
+    def test_large_delta_is_folded(self):
+        """Deltas reaching FOLD_AT are added to the base."""
+        counter = BigCounter(7)
+        counter += FOLD_AT - 1
+        assert counter._delta == FOLD_AT - 1
+        counter += 1
+        assert counter._delta == 0
+        counter.increment(-2 * FOLD_AT)
+        assert counter._delta == 0
+        counter += 2**200
+        assert int(counter) == 7 - FOLD_AT + 2**200
+
+    def test_reading_folds_pending_increments(self):
+        """int(), str() and repr() show the current value."""
+        counter = BigCounter(-3)
+        counter += 5
+        assert int(counter) == 2
+        assert counter._delta == 0
+        counter += 1
+        assert str(counter) == "3"
+        assert repr(counter) == "BigCounter(3)"
+        assert float(counter) == 3.0
+        assert bool(counter) and not BigCounter()
+        assert list(range(counter)) == [0, 1, 2]
+        assert hex(counter) == "0x3"
+
+    def test_add_one_returns_new_counter(self):
+        """add_one and + leave the counter unchanged."""
+        counter = BigCounter(10**50)
+        counter += 2
+        result = add_one(counter)
+        assert isinstance(result, BigCounter)
+        assert result._base is counter._base
+        assert result == 10**50 + 3
+        assert counter == 10**50 + 2
+        assert 1 + counter == counter + 1
+        assert add_one_many([counter, BigCounter(1)]) == [10**50 + 3, 2]
+        assert counter - 2 == 10**50
+        assert isinstance(counter - 2, BigCounter)
+        assert 10**50 - counter == -2
+
+    def test_mixed_arithmetic(self):
+        """Non-integer operands see the counter as an int."""
+        counter = BigCounter(4)
+        assert counter + 0.5 == 4.5
+        assert 0.5 + counter == 4.5
+        assert counter + Fraction(1, 3) == Fraction(13, 3)
+        assert counter + Decimal("0.25") == Decimal("4.25")
+        assert counter - 0.5 == 3.5
+        assert 4.5 - counter == 0.5
+        with pytest.raises(TypeError):
+            counter + "1"
+        with pytest.raises(TypeError):
+            counter += "1"
+        with pytest.raises(TypeError):
+            counter -= "1"
+        with pytest.raises(TypeError):
+            counter.increment(1.0)
+        with pytest.raises(TypeError):
+            BigCounter(1.5)
+
+    def test_comparison_and_hashing(self):
+        """Counters compare and hash like the int they hold."""
+        counter = BigCounter(10**30)
+        counter += 1
+        assert counter == 10**30 + 1
+        assert counter == BigCounter(10**30 + 1)
+        assert counter != 10**30
+        assert counter < 10**30 + 2 and counter > 10**30
+        assert counter <= BigCounter(10**30 + 1) <= counter
+        assert BigCounter(2) >= 1.5
+        assert BigCounter(2) == 2.0
+        assert counter != "x"
+        assert hash(counter) == hash(10**30 + 1)
+        assert {10**30 + 1: "found"}[counter] == "found"
+        assert len({BigCounter(1), 1, 1.0}) == 1
+        assert sorted([BigCounter(3), 1, BigCounter(2)]) == [1, 2, 3]
+        with pytest.raises(TypeError):
+            counter < "x"
+
+    def test_increment_cost_does_not_grow_with_size(self):
+        """Incrementing a 100,000-digit counter beats rebuilding the int."""
+        huge = 10**100_000
+
+        def counter_steps():
+            counter = BigCounter(huge)
+            for _ in range(100):
+                counter += 1
+
+        def int_steps():
+            value = huge
+            for _ in range(100):
+                value = add_one(value)
+
+        counter = measure(counter_steps, repeat=9)
+        baseline = measure(int_steps, repeat=9)
+        (comparison,) = compare({"run": counter}, {"run": baseline}, alpha=0.05)
+        assert comparison.regressed
+        assert baseline.median > 5 * counter.median
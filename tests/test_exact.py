@@ -0,0 +1,98 @@
+"""
+Tests for the exact module of package_trial_zenjiro.
+
+This module contains tests for the Decimal and Fraction batch paths,
+checking that they agree with add_one under every context setting and
+that add_one_many dispatches to them.
+"""
+
+import decimal
+from decimal import Decimal, localcontext
+from fractions import Fraction
+
+import pytest
+
+from src.package_trial_zenjiro.exact import add_one_decimals, add_one_fractions
+from src.package_trial_zenjiro.main import add_one, add_one_many
+
+DECIMALS = [
+    Decimal("1.10"),
+    Decimal("-0.5"),
+    Decimal("-0"),
+    Decimal("1E+30"),
+    Decimal("123456789.123456789"),
+    Decimal("Infinity"),
+    Decimal("-Infinity"),
+]
+
+FRACTIONS = [
+    Fraction(3, 2),
+    Fraction(-1, 3),
+    Fraction(0),
+    Fraction(-7, 1),
+    Fraction(10**40 + 1, 3**50),
+]
+
+
+class TestExactBatches:
+    """Test class for the Decimal and Fraction batch paths."""
+
+    @pytest.mark.parametrize("prec", [3, 9, 28])
+    @pytest.mark.parametrize(
+        "rounding", [decimal.ROUND_HALF_EVEN, decimal.ROUND_DOWN, decimal.ROUND_UP]
+    )
+    def test_decimals_match_scalar_under_context(self, prec, rounding):
+        """Results and signalled flags are those of add_one."""
+        with localcontext() as context:
+            context.prec = prec
+            context.rounding = rounding
+            context.clear_flags()
+            expected = [add_one(x) for x in DECIMALS]
+            expected_flags = dict(context.flags)
+            context.clear_flags()
+            results = add_one_decimals(DECIMALS)
+            assert dict(context.flags) == expected_flags
+        assert [str(r) for r in results] == [str(e) for e in expected]
+
+    def test_decimal_traps_are_honoured(self):
+        """A trapped condition raises just like add_one."""
+        with localcontext() as context:
+            context.prec = 2
+            context.traps[decimal.Inexact] = True
+            with pytest.raises(decimal.Inexact):
+                add_one(Decimal("1.23"))
+            with pytest.raises(decimal.Inexact):
+                add_one_decimals([Decimal("1.23")])
+
+        with pytest.raises(decimal.InvalidOperation):
+            add_one_decimals([Decimal("sNaN")])
+        assert add_one_decimals([Decimal("NaN")])[0].is_nan()
+
+    def test_fractions_match_scalar(self):
+        """Results are equal, reduced and of type Fraction."""
+        results = add_one_fractions(FRACTIONS)
+        assert results == [add_one(x) for x in FRACTIONS]
+        for result in results:
+            assert type(result) is Fraction
+            assert result == Fraction(result.numerator, result.denominator)
+            assert hash(result) == hash(Fraction(result.numerator, result.denominator))
+
+    def test_other_types_use_generic_addition(self):
+        """Non-exact and subclassed elements fall back to number + 1."""
+
+        class CustomFraction(Fraction):
+            """Custom fraction subclass."""
+
+        mixed_decimals = [Decimal("1.5"), 2, 0.5]
+        assert add_one_decimals(mixed_decimals) == [Decimal("2.5"), 3, 1.5]
+        custom = CustomFraction(1, 2)
+        assert add_one_fractions([custom, 2]) == [add_one(custom), 3]
+
+        with pytest.raises(TypeError):
+            add_one_fractions([Fraction(1), "string"])
+
+    def test_add_one_many_dispatches_exact_types(self):
+        """add_one_many uses the exact paths for Decimal and Fraction batches."""
+        assert add_one_many(DECIMALS) == [add_one(x) for x in DECIMALS]
+        assert add_one_many(FRACTIONS) == [add_one(x) for x in FRACTIONS]
+        assert add_one_many([Fraction(1, 2), 1.5]) == [Fraction(3, 2), 2.5]
@@ -0,0 +1,112 @@
+"""
+Tests for the fileio module of package_trial_zenjiro.
+
+This module contains tests for add_one_file, covering in-place and
+out-of-place rewriting, window boundaries, byte order and error handling.
+"""
+
+import mmap
+from array import array
+
+import pytest
+
+from src.package_trial_zenjiro.fileio import FileStats, add_one_file
+
+
+def _write(path, typecode, values):
+    path.write_bytes(array(typecode, values).tobytes())
+
+
+def _read(path, typecode):
+    values = array(typecode)
+    values.frombytes(path.read_bytes())
+    return list(values)
+
+
+class TestAddOneFile:
+    """Test class for the memory-mapped file engine."""
+
+    def test_in_place_int64(self, tmp_path):
+        """The file is rewritten in place by default."""
+        path = tmp_path / "data.bin"
+        _write(path, "q", range(-10, 10))
+        stats = add_one_file(path)
+        assert _read(path, "q") == list(range(-9, 11))
+        assert stats.bytes == 20 * 8
+
+    def test_destination_float64(self, tmp_path):
+        """A destination file receives the results and the source is kept."""
+        source, destination = tmp_path / "in.bin", tmp_path / "out.bin"
+        destination.write_bytes(b"stale contents that are longer than the result")
+        _write(source, "d", [0.5, -0.0, float("inf")])
+        add_one_file(source, destination, typecode="d")
+        assert _read(destination, "d") == [1.5, 1.0, float("inf")]
+        assert _read(source, "d") == [0.5, -0.0, float("inf")]
+
+    def test_destination_is_the_source(self, tmp_path):
+        """A destination naming the source file rewrites it in place."""
+        path = tmp_path / "data.bin"
+        _write(path, "q", [1, 2, 3])
+        add_one_file(path, path)
+        assert _read(path, "q") == [2, 3, 4]
+
+        link = tmp_path / "link.bin"
+        link.hardlink_to(path)
+        add_one_file(str(path), link)
+        assert _read(path, "q") == [3, 4, 5]
+
+    def test_many_windows(self, tmp_path):
+        """Values spanning several mapping windows are all processed once."""
+        count = mmap.ALLOCATIONGRANULARITY * 3 // 8 + 5
+        path = tmp_path / "data.bin"
+        _write(path, "q", range(count))
+        add_one_file(path, window_bytes=1)
+        assert _read(path, "q") == list(range(1, count + 1))
+
+    def test_big_endian_file(self, tmp_path):
+        """Values stored in the other byte order are handled."""
+        values = array("i", [1, 255, -2])
+        values.byteswap()
+        path = tmp_path / "data.bin"
+        path.write_bytes(values.tobytes())
+        add_one_file(path, typecode="i", byteorder="big")
+        result = array("i")
+        result.frombytes(path.read_bytes())
+        result.byteswap()
+        assert list(result) == [2, 256, -1]
+
+    def test_empty_file(self, tmp_path):
+        """Empty files are accepted and report zero throughput."""
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+        stats = add_one_file(path)
+        assert stats.bytes == 0
+        assert stats.bytes_per_second >= 0.0
+
+    def test_stats(self):
+        """Throughput is derived from bytes and seconds."""
+        assert FileStats(100, 2.0).bytes_per_second == 50.0
+        assert FileStats(0, 0.0).bytes_per_second == 0.0
+
+    def test_overflow_leaves_file_closable(self, tmp_path):
+        """Overflow is reported as such, not as an mmap close failure."""
+        path = tmp_path / "data.bin"
+        _write(path, "b", [1, 127])
+        with pytest.raises(OverflowError, match="index 1"):
+            add_one_file(path, typecode="b")
+
+    def test_errors(self, tmp_path):
+        """Bad typecodes, byte orders and truncated files are rejected."""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"\x00" * 12)
+        with pytest.raises(ValueError):
+            add_one_file(path)
+
+        with pytest.raises(TypeError):
+            add_one_file(path, typecode="u")
+
+        with pytest.raises(ValueError):
+            add_one_file(path, typecode="i", byteorder="middle")
+
+        with pytest.raises(OSError):
+            add_one_file(tmp_path / "missing.bin")
@@ -0,0 +1,97 @@
+"""
+Tests for the fixed-width integer engine of package_trial_zenjiro.
+
+This module contains tests for add_one_fixed, covering every fixed-width
+type under each overflow policy, typed and raw buffers, sequence inputs and
+the error reporting of out-of-range values.
+"""
+
+from array import array
+
+import pytest
+
+from src.package_trial_zenjiro.fixed import FIXED_TYPES, add_one_fixed
+
+
+def _limits(dtype):
+    bits = int(dtype.lstrip("uint"))
+    if dtype.startswith("u"):
+        return 0, (1 << bits) - 1
+    return -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+
+
+class TestAddOneFixed:
+    """Test class for the add_one_fixed function."""
+
+    @pytest.mark.parametrize("dtype", sorted(FIXED_TYPES))
+    def test_types_have_exact_widths(self, dtype):
+        """Each name maps to a typecode of the named width."""
+        low, high = _limits(dtype)
+        values = array(FIXED_TYPES[dtype], [low, high])
+        assert values.itemsize * 8 == int(dtype.lstrip("uint"))
+
+    @pytest.mark.parametrize("dtype", sorted(FIXED_TYPES))
+    @pytest.mark.parametrize("overflow", ["wrap", "saturate"])
+    def test_policies(self, dtype, overflow):
+        """The maximum wraps to the minimum or stays; others add one."""
+        low, high = _limits(dtype)
+        values = [low, high, 0, high - 1, high] * 20
+        replacement = low if overflow == "wrap" else high
+        assert add_one_fixed(values, dtype, overflow=overflow) == [
+            replacement if x == high else x + 1 for x in values
+        ]
+
+    @pytest.mark.parametrize("dtype", sorted(FIXED_TYPES))
+    def test_raise_reports_index(self, dtype):
+        """The default policy raises with the index of the first overflow."""
+        low, high = _limits(dtype)
+        with pytest.raises(OverflowError, match="index 2"):
+            add_one_fixed([low, 0, high, high], dtype)
+        assert add_one_fixed([low, high - 1], dtype) == [low + 1, high]
+
+    def test_boundary_of_int64(self):
+        """2**63 - 1 does not promote to a wider int."""
+        assert add_one_fixed([2**63 - 1], "int64", overflow="wrap") == [-(2**63)]
+        assert add_one_fixed((2**63 - 1,), "int64", overflow="saturate") == [2**63 - 1]
+        assert add_one_fixed(iter([1]), "int64") == [2]
+
+    def test_typed_buffer_in_place_and_out(self):
+        """Typed buffers are rewritten in place or into out."""
+        values = array(FIXED_TYPES["int32"], [1, 2**31 - 1])
+        assert add_one_fixed(values, "int32", overflow="wrap") is values
+        assert list(values) == [2, -(2**31)]
+        out = array(FIXED_TYPES["int32"], [0, 0])
+        assert add_one_fixed(values, "int32", out=out) is out
+        assert list(out) == [3, -(2**31) + 1]
+
+    def test_raw_buffer(self):
+        """Raw bytes are read as packed values of dtype."""
+        raw = bytearray(array(FIXED_TYPES["uint16"], [1, 0xFFFF]).tobytes())
+        add_one_fixed(raw, "uint16", overflow="saturate")
+        assert list(array(FIXED_TYPES["uint16"], bytes(raw))) == [2, 0xFFFF]
+        assert add_one_fixed(bytearray(b"\x01\xff"), "int8") == bytearray(b"\x02\x00")
+
+    def test_sequence_into_buffer(self):
+        """A sequence can be written straight into an out buffer."""
+        out = array(FIXED_TYPES["uint8"], [0, 0])
+        assert add_one_fixed([1, 255], "uint8", overflow="wrap", out=out) is out
+        assert list(out) == [2, 0]
+
+    def test_errors(self):
+        """Mismatched buffers, bad values and unknown names are rejected."""
+        with pytest.raises(TypeError, match="not int64"):
+            add_one_fixed(array(FIXED_TYPES["int32"], [1]), "int64")
+        with pytest.raises(TypeError, match="not uint32"):
+            add_one_fixed(array(FIXED_TYPES["int32"], [1]), "uint32")
+        with pytest.raises(TypeError):
+            add_one_fixed(array("d", [1.0]), "int64")
+        with pytest.raises(TypeError, match="not int8"):
+            add_one_fixed([1], "int8", out=array(FIXED_TYPES["int16"], [0]))
+        with pytest.raises(OverflowError, match="value 300 at index 1"):
+            add_one_fixed([1, 300], "uint8")
+        with pytest.raises(OverflowError, match="value -1 at index 0"):
+            add_one_fixed([-1], "uint64")
+        with pytest.raises(KeyError):
+            add_one_fixed([1], "int128")
+        with pytest.raises(ValueError, match="overflow"):
+            add_one_fixed([1], "int8", overflow="ignore")
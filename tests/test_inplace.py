@@ -0,0 +1,100 @@
+"""
+Tests for the inplace module of package_trial_zenjiro.
+
+This module contains tests for add_one_inplace, covering lists, generic
+mutable sequences, writable buffers, error handling and bounded memory use.
+"""
+
+import tracemalloc
+from array import array
+from collections import UserList
+
+import pytest
+
+from src.package_trial_zenjiro.inplace import add_one_inplace
+from src.package_trial_zenjiro.main import add_one
+
+
+class TestAddOneInplace:
+    """Test class for the in-place engine."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 4096])
+    def test_list_matches_scalar(self, chunk_size):
+        """Lists are rewritten with add_one of each element."""
+        original = [1, -2.5, 3j, True, 10**20]
+        data = list(original)
+        assert add_one_inplace(data, chunk_size=chunk_size) == len(original)
+        assert data == [add_one(x) for x in original]
+
+    def test_list_identity_is_kept(self):
+        """The list object itself is modified, not replaced."""
+        data = [1, 2, 3]
+        alias = data
+        add_one_inplace(data)
+        assert alias == [2, 3, 4]
+
+    def test_empty_list(self):
+        """An empty list reports zero elements."""
+        assert add_one_inplace([]) == 0
+
+    def test_generic_mutable_sequence(self):
+        """Mutable sequences without buffer support are updated by index."""
+        data = UserList([1, 2.5])
+        assert add_one_inplace(data) == 2
+        assert data == [2, 3.5]
+
+    @pytest.mark.parametrize("typecode", ["b", "H", "q", "d"])
+    def test_array(self, typecode):
+        """array.array objects go through the buffer engine."""
+        data = array(typecode, [0, 1, 2])
+        assert add_one_inplace(data) == 3
+        assert data == array(typecode, [1, 2, 3])
+
+    def test_bytearray_with_typecode(self):
+        """Raw byte buffers can be reinterpreted with a typecode."""
+        data = bytearray(array("q", [5, 6]).tobytes())
+        assert add_one_inplace(data, typecode="q") == 2
+        assert array("q", bytes(data)) == array("q", [6, 7])
+
+    def test_bytearray_bytes(self):
+        """Without a typecode, bytearray elements are unsigned bytes."""
+        data = bytearray(b"abc")
+        assert add_one_inplace(data) == 3
+        assert data == bytearray(b"bcd")
+
+    def test_memoryview(self):
+        """Writable memoryviews update the underlying object."""
+        backing = array("i", [1, 2])
+        assert add_one_inplace(memoryview(backing)) == 2
+        assert backing == array("i", [2, 3])
+
+    def test_immutable_inputs_rejected(self):
+        """Tuples and read-only buffers cannot be rewritten."""
+        with pytest.raises(TypeError):
+            add_one_inplace((1, 2))
+        with pytest.raises(TypeError):
+            add_one_inplace(b"abc")
+
+    def test_buffer_overflow(self):
+        """Fixed-width overflow is reported like add_one_buffer."""
+        with pytest.raises(OverflowError):
+            add_one_inplace(bytearray(b"\x00\xff"))
+
+    def test_invalid_chunk_size(self):
+        """A chunk size below one is rejected."""
+        with pytest.raises(ValueError):
+            add_one_inplace([1], chunk_size=0)
+
+    def test_peak_memory_is_bounded(self):
+        """Rewriting a list needs far less memory than building a copy."""
+        tracemalloc.start()
+        try:
+            data = list(range(10**6, 10**6 + 200_000))
+            baseline = tracemalloc.get_traced_memory()[0]
+            add_one_inplace(data)
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+        # A new list alone would need 8 bytes per element.
+        assert peak < len(data) * 8 // 4
+        assert data[0] == 10**6 + 1 and data[-1] == 10**6 + 200_000
@@ -5,9 +5,11 @@ This module contains comprehensive tests for the add_one function,
 including normal cases, edge cases, and error handling.
 """
 
+import math
+
 import pytest
 
-from src.package_trial_zenjiro.main import add_one
+from src.package_trial_zenjiro.main import add_one, add_one_many
 
 
 class TestAddOne:
@@ -119,3 +121,79 @@ class TestAddOne:
         result = add_one(original_value)
         assert original_value == 42  # Original value unchanged
         assert result == 43
+
+
+class TestAddOneMany:
+    """Test class for the add_one_many batch function."""
+
+    @pytest.mark.parametrize(
+        "numbers",
+        [
+            [1, 5, -1, 0, 10**30],
+            [1.5, -2.7, 0.0, 1e-300, 1e300],
+            [1 + 2j, -1j, complex(0.0, -0.0)],
+            [True, False, True],
+            [1, 2.5, 3j, True],
+        ],
+    )
+    def test_add_one_many_matches_scalar(self, numbers):
+        """Every element gets exactly the result of add_one."""
+        results = add_one_many(numbers)
+        expected = [add_one(x) for x in numbers]
+        assert results == expected
+        assert [type(r) for r in results] == [type(e) for e in expected]
+
+    def test_add_one_many_accepts_iterables(self):
+        """Tuples, generators and ranges are accepted and order is preserved."""
+        assert add_one_many((1, 2, 3)) == [2, 3, 4]
+        assert add_one_many(x for x in [4, 5]) == [5, 6]
+        assert add_one_many(range(3)) == [1, 2, 3]
+
+    @pytest.mark.parametrize(
+        "numbers",
+        [range(0), range(-5, 5), range(10, -10, -3), range(2**70, 2**71, 2**68)],
+    )
+    def test_add_one_many_shifts_ranges(self, numbers):
+        """Ranges are shifted instead of added to element by element."""
+        assert add_one_many(numbers) == [add_one(x) for x in numbers]
+
+    def test_add_one_many_empty(self):
+        """Empty input gives an empty list."""
+        assert add_one_many([]) == []
+        assert add_one_many(iter(())) == []
+
+    def test_add_one_many_special_floats(self):
+        """Signed zero, infinities and NaN behave as in add_one."""
+        results = add_one_many([-0.0, float("inf"), float("-inf"), float("nan")])
+        assert results[0] == 1.0 and math.copysign(1.0, results[0]) == 1.0
+        assert results[1] == float("inf")
+        assert results[2] == float("-inf")
+        assert math.isnan(results[3])
+
+    def test_add_one_many_bool_becomes_int(self):
+        """Booleans are promoted to int like add_one does."""
+        results = add_one_many([True, False])
+        assert results == [2, 1]
+        assert all(type(r) is int for r in results)
+
+    def test_add_one_many_subclasses(self):
+        """Numeric subclasses go through their own __add__."""
+
+        class CustomFloat(float):
+            """Custom float subclass."""
+
+            def __add__(self, other):
+                return "custom"
+
+        assert add_one_many([1.0, CustomFloat(2.0)]) == [2.0, "custom"]
+
+    def test_add_one_many_type_errors(self):
+        """Non-numeric elements raise TypeError."""
+        with pytest.raises(TypeError):
+            add_one_many([1, "string"])
+
+        with pytest.raises(TypeError):
+            add_one_many(["string"])
+
+        with pytest.raises(TypeError):
+            add_one_many(None)
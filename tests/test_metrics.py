@@ -0,0 +1,243 @@
+"""
+Tests for the metrics module of package_trial_zenjiro.
+
+This module contains tests for the opt-in metrics: enabling and disabling,
+counters and histograms per engine and type, error counting, and the
+snapshot, Prometheus text, file and socket exports.
+"""
+
+import http.client
+import socket
+from array import array
+from decimal import Decimal
+
+import pytest
+
+from src.package_trial_zenjiro import buffer, main, metrics, parallel, shared, threaded
+from src.package_trial_zenjiro.buffer import add_one_buffer
+from src.package_trial_zenjiro.main import add_one_many
+from src.package_trial_zenjiro.threaded import add_one_threaded
+
+
+@pytest.fixture
+def recording():
+    """Enable metrics with empty counters, and disable them afterwards."""
+    metrics.enable()
+    metrics.reset()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+# add_one is looked up on the module at call time: metrics swap the code of
+# the current main.add_one, which a reload in another test replaces.
+
+
+class TestSwitch:
+    """Test class for enabling and disabling metrics."""
+
+    def test_disabled_by_default(self):
+        """No recorder is installed until metrics are enabled."""
+        assert not metrics.enabled()
+        for module in (main, buffer, threaded, parallel):
+            assert module._probe is None
+        assert main.add_one.__code__ is main._ADD_ONE_CODE
+
+    def test_enable_and_disable(self, recording):
+        """enable installs the recorder everywhere; disable removes it."""
+        assert metrics.enabled()
+        assert main._probe is buffer._probe is threaded._probe is parallel._probe
+        assert main.add_one.__code__ is not main._ADD_ONE_CODE
+        metrics.disable()
+        assert not metrics.enabled()
+        assert parallel._probe is None
+        assert main.add_one.__code__ is main._ADD_ONE_CODE
+
+    def test_recording_add_one_survives_disable(self):
+        """A recording add_one running while disable() clears the probe."""
+        assert main._probe is None
+        assert main._add_one_recorded(41) == 42
+        assert metrics.snapshot() == {}
+
+    def test_add_one_keeps_its_interface(self, recording):
+        """The recording add_one has the same name and signature."""
+        import inspect
+
+        assert main.add_one.__name__ == "add_one"
+        assert str(inspect.signature(main.add_one)) == "(number)"
+        assert main.add_one(41) == 42
+
+    def test_disabled_calls_are_not_recorded(self, recording):
+        """Calls made while disabled leave the counters alone."""
+        metrics.disable()
+        main.add_one(1)
+        add_one_many([1, 2])
+        assert metrics.snapshot() == {}
+
+    def test_values_survive_disable(self, recording):
+        """Recorded values are kept until reset."""
+        main.add_one(1)
+        metrics.disable()
+        assert metrics.snapshot()["scalar"]["int"]["calls"] == 1
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+
+class TestRecording:
+    """Test class for counters and histograms."""
+
+    def test_scalar_and_batch(self, recording):
+        """Calls and elements are counted by engine and input type."""
+        assert main.add_one(1.5) == 2.5
+        assert main.add_one(2) == 3
+        assert add_one_many([Decimal(1), Decimal(2)]) == [Decimal(2), Decimal(3)]
+        data = metrics.snapshot()
+        assert data["scalar"]["float"]["calls"] == 1
+        assert data["scalar"]["int"]["elements"] == 1
+        assert data["many"]["Decimal"] == {
+            **data["many"]["Decimal"],
+            "calls": 1,
+            "elements": 2,
+            "bytes": 0,
+            "errors": 0,
+        }
+
+    def test_buffer_bytes(self, recording):
+        """Buffer calls count elements and bytes by typecode."""
+        add_one_buffer(array("q", [1, 2, 3]))
+        add_one_buffer(bytearray(16), typecode="d")
+        data = metrics.snapshot()["buffer"]
+        assert (data["q"]["elements"], data["q"]["bytes"]) == (3, 24)
+        assert (data["d"]["elements"], data["d"]["bytes"]) == (2, 16)
+
+    def test_errors_are_counted(self, recording):
+        """Calls that raise are counted as calls and errors."""
+        with pytest.raises(TypeError):
+            main.add_one("1")
+        with pytest.raises(TypeError):
+            add_one_buffer(b"read-only")
+        with pytest.raises(TypeError):
+            add_one_buffer(array("u", "x"))
+        data = metrics.snapshot()
+        assert data["scalar"]["str"]["errors"] == 1
+        assert data["buffer"]["B"]["errors"] == 1
+        assert data["buffer"]["invalid"]["errors"] == 1
+
+    def test_threaded_engine(self, recording):
+        """Thread-pool batches record the engine and their slices."""
+        assert add_one_threaded(range(10), max_workers=2, min_batch=0) == list(
+            range(1, 11)
+        )
+        data = metrics.snapshot()
+        assert data["threaded"]["int"]["elements"] == 10
+        assert data["many"]["int"]["elements"] == 10
+        threaded.shutdown_pool()
+
+    def test_parallel_engine(self, recording):
+        """Process-pool batches record the engine in the calling process."""
+        assert parallel.add_one_parallel([1, 2, 3], max_workers=2, min_cost=0) == [
+            2,
+            3,
+            4,
+        ]
+        assert metrics.snapshot()["parallel"]["int"]["calls"] == 1
+        parallel.shutdown_pool()
+
+    def test_shared_engine(self, recording):
+        """Shared-memory batches record elements and bytes by typecode."""
+        data = array("d", [0.5] * 4)
+        shared.add_one_shared(data, max_workers=2, min_bytes=0)
+        assert data == array("d", [1.5] * 4)
+        series = metrics.snapshot()["shared"]["d"]
+        assert (series["elements"], series["bytes"]) == (4, 32)
+        shared.shutdown_pool()
+
+    def test_histogram_buckets(self, recording):
+        """Buckets are cumulative and end with every call."""
+        for _ in range(5):
+            main.add_one(1)
+        series = metrics.snapshot()["scalar"]["int"]
+        counts = [count for _, count in series["buckets"]]
+        bounds = [bound for bound, _ in series["buckets"]]
+        assert counts == sorted(counts)
+        assert series["buckets"][-1] == (float("inf"), 5)
+        assert bounds[:3] == [1e-7, 2e-7, 3e-7]
+        assert series["seconds"] > 0
+
+
+class TestExport:
+    """Test class for the Prometheus exports."""
+
+    def test_prometheus_text(self, recording):
+        """The exposition text has typed counters and a histogram."""
+        add_one_many([1, 2, 3])
+        text = metrics.prometheus_text()
+        assert "# TYPE add_one_calls_total counter" in text
+        assert 'add_one_elements_total{engine="many",type="int"} 3' in text
+        assert "# TYPE add_one_call_seconds histogram" in text
+        assert (
+            'add_one_call_seconds_bucket{engine="many",type="int",le="+Inf"} 1' in text
+        )
+        assert 'add_one_call_seconds_count{engine="many",type="int"} 1' in text
+        assert text.endswith("\n")
+
+    def test_label_escaping(self, recording):
+        """Label values are escaped."""
+
+        class Odd(int):
+            pass
+
+        Odd.__name__ = 'odd"\\\nname'
+        main.add_one(Odd(1))
+        assert 'type="odd\\"\\\\\\nname"' in metrics.prometheus_text()
+
+    def test_empty_text(self):
+        """Without recorded values only the metric headers are written."""
+        text = metrics.prometheus_text(prefix="x")
+        assert "# TYPE x_errors_total counter" in text
+        assert "{" not in text
+
+    def test_write_file(self, recording, tmp_path):
+        """The text is written to a file."""
+        main.add_one(1)
+        path = tmp_path / "add_one.prom"
+        metrics.write_prometheus(path)
+        assert path.read_text() == metrics.prometheus_text()
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_serve_tcp(self, recording):
+        """GET requests on the TCP server return the current text."""
+        main.add_one(1)
+        server = metrics.serve_prometheus()
+        try:
+            host, port = server.server_address
+            connection = http.client.HTTPConnection(host, port, timeout=5)
+            connection.request("GET", "/metrics")
+            response = connection.getresponse()
+            body = response.read().decode()
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert response.status == 200
+        assert response.getheader("Content-Type") == metrics.PROMETHEUS_CONTENT_TYPE
+        assert 'add_one_calls_total{engine="scalar",type="int"} 1' in body
+
+    def test_serve_unix_socket(self, recording, tmp_path):
+        """The server also listens on Unix domain sockets."""
+        main.add_one(1)
+        path = str(tmp_path / "metrics.sock")
+        server = metrics.serve_prometheus(path)
+        try:
+            with socket.socket(socket.AF_UNIX) as client:
+                client.settimeout(5)
+                client.connect(path)
+                client.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+                reply = b""
+                while chunk := client.recv(65536):
+                    reply += chunk
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert reply.startswith(b"HTTP/1.0 200")
+        assert b"add_one_calls_total" in reply
@@ -0,0 +1,118 @@
+"""
+Tests for the package root of package_trial_zenjiro.
+
+This module contains tests for the lazily loaded public API of the package
+root and an import-time budget, measured with ``python -X importtime`` in a
+fresh interpreter, that keeps the root import from pulling in heavy modules.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import src.package_trial_zenjiro as package
+
+SRC = Path(__file__).parent.parent / "src"
+
+# Cumulative microseconds allowed for a cold "import package_trial_zenjiro".
+# asyncio, multiprocessing and concurrent.futures each take several times
+# this long to import, so loading any of them eagerly breaks the budget.
+IMPORT_TIME_BUDGET_US = 20_000
+
+HEAVY_MODULES = [
+    "asyncio",
+    "concurrent.futures",
+    "decimal",
+    "fractions",
+    "mmap",
+    "multiprocessing",
+    "socket",
+    "threading",
+]
+
+
+def run_python(*args, code):
+    """Run code in a fresh interpreter that finds the package under src."""
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def cumulative_import_us(stderr, module):
+    """Return the cumulative time of module in -X importtime output."""
+    for line in stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} not in importtime output")
+
+
+class TestLazyExports:
+    """Test class for the package-level API."""
+
+    @pytest.mark.parametrize("name", sorted(package._EXPORTS))
+    def test_exports_resolve_to_submodule_objects(self, name):
+        """Every public name is the object defined in its submodule."""
+        module = getattr(package, package._EXPORTS[name])
+        assert getattr(package, name) is getattr(module, name)
+
+    def test_all_and_dir(self):
+        """__all__ and dir() list the public API."""
+        assert set(package.__all__) == set(package._EXPORTS)
+        assert set(package.__all__) <= set(dir(package))
+        assert "metrics" in dir(package)
+
+    def test_unknown_attribute(self):
+        """Unknown names raise AttributeError."""
+        with pytest.raises(AttributeError, match="no_such_name"):
+            package.no_such_name
+
+    def test_root_import_is_lazy(self):
+        """Importing the root and calling add_one loads no heavy module."""
+        code = (
+            "import sys, package_trial_zenjiro as p\n"
+            "assert p.add_one(41) == 42 and p.add_one_many([1]) == [2]\n"
+            "print('\\n'.join(sys.modules))\n"
+        )
+        loaded = set(run_python(code=code).stdout.split())
+        assert "package_trial_zenjiro.main" in loaded
+        assert not loaded & set(HEAVY_MODULES)
+        assert "package_trial_zenjiro.aio" not in loaded
+
+    def test_engines_load_on_first_use(self):
+        """Engine submodules are imported when their names are used."""
+        code = (
+            "import sys, package_trial_zenjiro as p\n"
+            "assert 'asyncio' not in sys.modules\n"
+            "p.add_one_async_stream\n"
+            "assert 'asyncio' in sys.modules\n"
+            "from package_trial_zenjiro import *\n"
+            "assert AddOneView(range(3))[0] == 1\n"
+        )
+        run_python(code=code)
+
+
+class TestImportTime:
+    """Test class for the import-time budget."""
+
+    def test_cold_import_within_budget(self):
+        """A cold import of the package root stays within the budget."""
+        # The best of a few fresh interpreters filters out scheduling noise.
+        timings = [
+            cumulative_import_us(
+                run_python(
+                    "-X", "importtime", code="import package_trial_zenjiro"
+                ).stderr,
+                "package_trial_zenjiro",
+            )
+            for _ in range(3)
+        ]
+        assert min(timings) < IMPORT_TIME_BUDGET_US
@@ -0,0 +1,93 @@
+"""
+Tests for the parallel module of package_trial_zenjiro.
+
+This module contains tests for add_one_parallel, covering cost-based
+slicing, order preservation, the in-process fallback and pool reuse.
+"""
+
+import pytest
+
+from src.package_trial_zenjiro import parallel
+from src.package_trial_zenjiro.main import add_one
+from src.package_trial_zenjiro.parallel import add_one_parallel, shutdown_pool
+
+
+@pytest.fixture
+def fresh_pool():
+    """Make sure every test starts and ends without a running pool."""
+    shutdown_pool()
+    yield
+    shutdown_pool()
+
+
+class TestAddOneParallel:
+    """Test class for the process-pool engine."""
+
+    def test_pool_results_match_scalar(self, fresh_pool):
+        """Results from worker processes equal add_one, in input order."""
+        data = [10**500 + i for i in range(50)] + [1.5, 3j, True, -(2**4000)]
+        results = add_one_parallel(data, max_workers=2, min_cost=0)
+        assert results == [add_one(x) for x in data]
+        assert parallel._pool.pool is not None
+
+    def test_pool_is_reused_across_calls(self, fresh_pool):
+        """The same pool serves later calls with the same worker count."""
+        add_one_parallel([1, 2, 3], max_workers=2, min_cost=0)
+        pool = parallel._pool.pool
+        add_one_parallel([4, 5, 6], max_workers=2, min_cost=0)
+        assert parallel._pool.pool is pool
+
+        add_one_parallel([4, 5, 6], max_workers=3, min_cost=0)
+        assert parallel._pool.pool is not pool
+
+    def test_small_batches_stay_in_process(self, fresh_pool):
+        """Cheap batches and single workers never start a pool."""
+        assert add_one_parallel(range(10), max_workers=2) == list(range(1, 11))
+        assert add_one_parallel([2**100], max_workers=2, min_cost=0) == [2**100 + 1]
+        assert add_one_parallel([1, 2], max_workers=1, min_cost=0) == [2, 3]
+        assert add_one_parallel([]) == []
+        assert parallel._pool.pool is None
+
+    def test_built_in_numbers_are_not_worth_sending(self, fresh_pool, monkeypatch):
+        """Large ints weigh nothing towards min_cost; other types do."""
+        huge = [2**100_000 + i for i in range(200)]
+        assert add_one_parallel(huge, max_workers=2) == [n + 1 for n in huge]
+        assert parallel._pool.pool is None
+
+        class Costly(int):
+            """Int subclass standing in for a type with an expensive add."""
+
+        sent = []
+        min_cost = 10 * parallel.ELEMENT_COST
+        monkeypatch.setattr(
+            parallel, "_map", lambda slices, workers: sent.append(slices) or []
+        )
+        add_one_parallel([Costly(1)] * 9 + huge, max_workers=2, min_cost=min_cost)
+        assert sent == []
+        add_one_parallel([Costly(1)] * 10, max_workers=2, min_cost=min_cost)
+        assert len(sent) == 1
+
+    def test_split_by_cost_balances_big_integers(self):
+        """Slices are cut by cost, not by element count, and stay in order."""
+        numbers = [2**10000] + [1] * 300 + [2**10000] + [1] * 300
+        costs = [n.bit_length() + parallel.ELEMENT_COST for n in numbers]
+        total = sum(costs)
+        slices = parallel._split_by_cost(numbers, costs, total, 4)
+        assert len(slices) <= 4
+        assert [n for part in slices for n in part] == numbers
+        slice_costs = [
+            sum(n.bit_length() + parallel.ELEMENT_COST for n in part) for part in slices
+        ]
+        assert max(slice_costs) <= total / 4 + max(costs)
+        assert len(slices[0]) < len(slices[-1])
+
+    def test_invalid_arguments(self, fresh_pool):
+        """Worker and chunk counts must be positive."""
+        with pytest.raises(ValueError):
+            add_one_parallel([1], max_workers=0)
+
+        with pytest.raises(ValueError):
+            add_one_parallel([1], chunks_per_worker=0)
+
+        with pytest.raises(TypeError):
+            add_one_parallel([1, "string"], max_workers=2, min_cost=0)
@@ -0,0 +1,118 @@
+"""
+Tests for the progression module of package_trial_zenjiro.
+
+This module contains tests for add_one_progression and Progression,
+covering shifted ranges, progressions of every numeric type, slicing,
+repeated shifts and agreement with element-wise add_one.
+"""
+
+import math
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from src.package_trial_zenjiro.main import add_one
+from src.package_trial_zenjiro.progression import Progression, add_one_progression
+
+
+class TestAddOneProgression:
+    """Test class for add_one_progression."""
+
+    @pytest.mark.parametrize(
+        "numbers",
+        [range(10), range(0), range(-7, 7, 2), range(10, -10, -3), range(5, 5)],
+    )
+    def test_ranges_are_shifted(self, numbers):
+        """A range becomes the range of add_one of its elements."""
+        result = add_one_progression(numbers)
+        assert isinstance(result, range)
+        assert list(result) == [add_one(x) for x in numbers]
+
+    def test_huge_range(self):
+        """Shifting does not depend on the length."""
+        result = add_one_progression(range(0, 10**30, 7))
+        assert result == range(1, 10**30 + 1, 7)
+        assert result[10**28] == 7 * 10**28 + 1
+        assert result[-1] == (10**30 - 1) // 7 * 7 + 1
+
+    @pytest.mark.parametrize(
+        "start,step",
+        [
+            (0.0, 0.1),
+            (2.0**53 - 3, 1.0),
+            (-0.5, 0.25),
+            (1e16, 3.0),
+            (Fraction(1, 3), Fraction(2, 7)),
+            (0, Fraction(1, 2)),
+            (Decimal("0.1"), Decimal("0.2")),
+            (Decimal("9999999999999999999999999999"), Decimal(1)),
+            (1 + 2j, 0.5j),
+            (True, 1),
+            (-3, 4),
+        ],
+    )
+    def test_progressions_match_element_wise(self, start, step):
+        """Every shift equals add_one applied to every element."""
+        progression = Progression(start, step, 6)
+        expected = list(progression)
+        for _ in range(3):
+            progression = add_one_progression(progression)
+            expected = [add_one(x) for x in expected]
+            assert list(progression) == expected
+            assert [type(x) for x in progression] == [type(x) for x in expected]
+            assert [progression[i] for i in range(-6, 6)] == expected * 2
+
+    def test_exact_progressions_fold_the_shift(self):
+        """int and Fraction shifts move the start instead of being deferred."""
+        shifted = add_one_progression(Progression(Fraction(1, 2), 3, 4))
+        assert shifted.start == Fraction(3, 2)
+        assert shifted._shift == 0
+        floats = add_one_progression(Progression(0.5, 3.0, 4))
+        assert floats.start == 0.5
+        assert floats._shift == 1
+
+    def test_slices(self):
+        """Slices are progressions over the same elements."""
+        progression = add_one_progression(Progression(0.0, 0.1, 100))
+        elements = list(progression)
+        for part in (slice(10, 20), slice(None, None, -3), slice(5, 90, 7)):
+            sliced = progression[part]
+            assert isinstance(sliced, Progression)
+            assert list(sliced) == elements[part]
+            assert list(add_one_progression(sliced)) == [
+                add_one(x) for x in elements[part]
+            ]
+        with pytest.raises(IndexError):
+            progression[100]
+
+    def test_elements_are_computed_from_the_index(self):
+        """Floats do not accumulate the rounding of repeated steps."""
+        progression = Progression(0.0, 0.1, 10**6)
+        assert progression[-1] == 999_999 * 0.1
+        assert progression[3] == 3 * 0.1
+        assert math.isclose(sum(progression[:10]), 4.5)
+
+    def test_constant_size(self):
+        """Huge progressions are created, sliced and shifted lazily."""
+        progression = add_one_progression(Progression(0.5, 2.0, 10**15))
+        assert len(progression) == 10**15
+        assert len(progression[::2]) == 5 * 10**14
+        assert progression[10**14] == add_one(0.5 + 10**14 * 2.0)
+        assert repr(progression) == f"Progression(<{10**15} elements>)"
+
+    def test_sequence_methods(self):
+        """Containment, index and reversal come from Sequence."""
+        progression = add_one_progression(Progression(Fraction(0), Fraction(1, 4), 8))
+        assert Fraction(3, 2) in progression
+        assert progression.index(2) == 4
+        assert list(reversed(progression))[0] == Fraction(11, 4)
+
+    def test_invalid_inputs(self):
+        """Only ranges and progressions are accepted."""
+        with pytest.raises(TypeError, match="range or Progression"):
+            add_one_progression([1, 2, 3])
+        with pytest.raises(ValueError):
+            Progression(0, 1, -1)
+        with pytest.raises(TypeError):
+            Progression(0, 1, 2.5)
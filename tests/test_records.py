@@ -0,0 +1,241 @@
+"""
+Tests for the record engine of package_trial_zenjiro.
+
+This module contains tests for add_one_csv and add_one_ndjson, checking that
+only the target field changes, that quoting, whitespace and line endings
+survive byte for byte at any block size, and that the engine beats a
+DictReader/DictWriter round trip while using bounded memory.
+"""
+
+import csv
+import io
+import json
+import os
+import random
+import tracemalloc
+
+import pytest
+
+from src.package_trial_zenjiro.bench import compare, measure
+from src.package_trial_zenjiro.records import add_one_csv, add_one_ndjson
+
+BLOCK_SIZES = [1, 7, 64, 1 << 20]
+
+
+def _run(function, data, name, **options):
+    output = io.BytesIO()
+    count = function(io.BytesIO(data), output, name, **options)
+    return count, output.getvalue()
+
+
+def _dict_round_trip(data, column):
+    """The reference: csv.DictReader + add_one + csv.DictWriter."""
+    source = io.StringIO(data.decode(), newline="")
+    output = io.StringIO(newline="")
+    reader = csv.DictReader(source)
+    writer = csv.DictWriter(output, reader.fieldnames, lineterminator="\n")
+    writer.writeheader()
+    for row in reader:
+        row[column] = str(int(row[column]) + 1)
+        writer.writerow(row)
+    return output.getvalue().encode()
+
+
+def _table(rows, quoted=False):
+    lines = ["id,value,name"]
+    for i in range(rows):
+        name = f'"name {i}, ""x"""' if quoted and i % 3 == 0 else f"name{i}"
+        lines.append(f"{i},{random.randint(-10**6, 10**6)},{name}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+class TestCsv:
+    """Test class for add_one_csv."""
+
+    @pytest.mark.parametrize("block_size", BLOCK_SIZES)
+    def test_only_the_column_changes(self, block_size):
+        """Quotes, spacing, CRLF and missing fields pass through unchanged."""
+        data = (
+            b'a,"n",c\r\n1,5,"x,\ny"\r\n2, 7 ,z\r\n3,,w\r\n4\r\n\r\n'
+            b'5,"9",q\r\n6,-1,"a ""b"""'
+        )
+        assert _run(add_one_csv, data, "n", block_size=block_size) == (
+            4,
+            b'a,"n",c\r\n1,6,"x,\ny"\r\n2, 8 ,z\r\n3,,w\r\n4\r\n\r\n'
+            b'5,"10",q\r\n6,0,"a ""b"""',
+        )
+
+    @pytest.mark.parametrize("block_size", BLOCK_SIZES)
+    @pytest.mark.parametrize("quoted", [False, True])
+    def test_matches_dict_round_trip(self, block_size, quoted):
+        """The output equals what DictReader and DictWriter produce."""
+        data = _table(200, quoted)
+        count, output = _run(add_one_csv, data, "value", block_size=block_size)
+        assert count == 200
+        assert output == _dict_round_trip(data, "value")
+
+    @pytest.mark.parametrize("column", ["id", "value", "name"])
+    def test_any_column_position(self, column):
+        """The first, middle and last columns can be the target."""
+        data = b"id,value,name\n1,2,3\n"
+        expected = {
+            "id": b"id,value,name\n2,2,3\n",
+            "value": b"id,value,name\n1,3,3\n",
+            "name": b"id,value,name\n1,2,4\n",
+        }
+        assert _run(add_one_csv, data, column) == (1, expected[column])
+
+    @pytest.mark.parametrize("delimiter", [";", "\t", "|"])
+    def test_delimiters(self, delimiter):
+        """Other single-character delimiters are supported."""
+        data = "a|n\n1|2\n".replace("|", delimiter).encode()
+        expected = "a|n\n1|3\n".replace("|", delimiter).encode()
+        assert _run(add_one_csv, data, "n", delimiter=delimiter) == (1, expected)
+
+    def test_kinds(self):
+        """kind selects how values are read, as with add-one --type."""
+        data = b"n\n1.10\n-0.5\n"
+        assert _run(add_one_csv, data, "n", kind="decimal")[1] == b"n\n2.10\n0.5\n"
+        assert _run(add_one_csv, data, "n")[1] == b"n\n2.1\n0.5\n"
+
+    def test_stray_quote_record(self):
+        """A quote inside an unquoted field falls back to the careful scan."""
+        data = b'a,n\nab"c,1\n'
+        assert _run(add_one_csv, data, "n") == (1, b'a,n\nab"c,2\n')
+
+    def test_header_edge_cases(self):
+        """BOMs, header-only and empty inputs are handled."""
+        assert _run(add_one_csv, b"\xef\xbb\xbfn\n1\n", "n")[1] == (
+            b"\xef\xbb\xbfn\n2\n"
+        )
+        assert _run(add_one_csv, b"n", "n") == (0, b"n")
+        assert _run(add_one_csv, b"", "n") == (0, b"")
+
+    def test_errors(self):
+        """Bad values, columns and delimiters raise ValueError."""
+        with pytest.raises(ValueError, match="record 3: invalid number 'x'"):
+            _run(add_one_csv, b"n\n1\nx\n", "n")
+        with pytest.raises(ValueError, match="record 3"):
+            _run(add_one_csv, b'n,m\n1,2\n"x",3\n', "n")
+        with pytest.raises(ValueError, match="column 'n' not found"):
+            _run(add_one_csv, b"m\n1\n", "n")
+        with pytest.raises(ValueError, match="delimiter"):
+            _run(add_one_csv, b"n\n1\n", "n", delimiter=";;")
+
+
+class TestNdjson:
+    """Test class for add_one_ndjson."""
+
+    @pytest.mark.parametrize("block_size", BLOCK_SIZES)
+    def test_only_the_field_changes(self, block_size):
+        """Nested keys, strings, nulls and layout are left alone."""
+        data = (
+            b'{"n": 1, "a": {"n": 5}}\n{"a": {"n": 5}, "n": 2.5}\n\n'
+            b'{"x": "\\"n\\": 3"}\n{"n": null}\n{"n" :7 , "s": "n"}\n'
+            b'{"v\\u0061l": 1, "n": 10}'
+        )
+        assert _run(add_one_ndjson, data, "n", block_size=block_size) == (
+            4,
+            b'{"n": 2, "a": {"n": 5}}\n{"a": {"n": 5}, "n": 3.5}\n\n'
+            b'{"x": "\\"n\\": 3"}\n{"n": null}\n{"n" :8 , "s": "n"}\n'
+            b'{"v\\u0061l": 1, "n": 11}',
+        )
+
+    @pytest.mark.parametrize("block_size", BLOCK_SIZES)
+    @pytest.mark.parametrize("escaped", [False, True])
+    def test_matches_json_round_trip(self, block_size, escaped):
+        """The output equals json.loads, add one, json.dumps."""
+        records = [
+            {
+                "id": i,
+                "name": f'n{i}"' if escaped else f"n{i}",
+                "value": random.choice([i * 10**15, random.random() * 1e6, -i]),
+            }
+            for i in range(200)
+        ]
+        data = "".join(json.dumps(record) + "\n" for record in records).encode()
+        count, output = _run(add_one_ndjson, data, "value", block_size=block_size)
+        for record in records:
+            record["value"] += 1
+        assert count == 200
+        assert output == "".join(json.dumps(r) + "\n" for r in records).encode()
+
+    @pytest.mark.parametrize("block_size", BLOCK_SIZES)
+    def test_values_beyond_float_range_are_kept(self, block_size):
+        """Values that overflow to infinity are copied, keeping valid JSON."""
+        data = b'{"n": 1e400}\n{"n": 1}\n{"n": -1E999, "a": [1]}\n'
+        count, output = _run(add_one_ndjson, data, "n", block_size=block_size)
+        assert (count, output) == (
+            3,
+            b'{"n": 1e400}\n{"n": 2}\n{"n": -1E999, "a": [1]}\n',
+        )
+        for line in output.splitlines():
+            json.loads(line, parse_constant=pytest.fail)
+
+    @pytest.mark.parametrize("block_size", BLOCK_SIZES)
+    def test_integers_beyond_digit_limit_are_exact(self, block_size):
+        """Integers longer than int() accepts are incremented exactly."""
+        big = b"9" * 5000
+        data = b'{"n": ' + big + b'}\n{"\\u006e": -' + big + b', "m": ' + big + b"}\n"
+        count, output = _run(add_one_ndjson, data, "n", block_size=block_size)
+        assert (count, output) == (
+            2,
+            b'{"n": 1' + b"0" * 5000 + b'}\n{"\\u006e": -' + b"9" * 4999 + b"8"
+            b', "m": ' + big + b"}\n",
+        )
+
+    def test_escaped_key_and_duplicates(self):
+        """Keys are compared after decoding; the last duplicate wins."""
+        assert _run(add_one_ndjson, b'{"\\u006e": 1}\n', "n")[1] == b'{"\\u006e": 2}\n'
+        assert _run(add_one_ndjson, b'{"n": 1, "n": 5}\n', "n")[1] == (
+            b'{"n": 1, "n": 6}\n'
+        )
+        assert _run(add_one_ndjson, '{"é": 1}\n'.encode(), "é")[1] == (
+            '{"é": 2}\n'.encode()
+        )
+
+    @pytest.mark.parametrize(
+        "line,message",
+        [
+            (b'{"n": "1"}', "line 2: field 'n' is not a number"),
+            (b'{"n": true}', "line 2: field 'n' is not a number"),
+            (b'["n", 1]', "line 2: expected a JSON object"),
+            (b'{"n": 1', "line 2"),
+        ],
+    )
+    def test_errors(self, line, message):
+        """Lines holding the field that cannot be rewritten raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            _run(add_one_ndjson, b'{"n": 1}\n' + line + b"\n", "n")
+
+
+class TestRecordPerformance:
+    """Test class for the speed and memory use of the record engine."""
+
+    def test_faster_than_dict_round_trip(self):
+        """Rewriting a column beats DictReader + add_one + DictWriter."""
+        data = _table(5000)
+
+        engine = measure(lambda: _run(add_one_csv, data, "value"), repeat=9)
+        baseline = measure(lambda: _dict_round_trip(data, "value"), repeat=9)
+
+        (comparison,) = compare({"run": engine}, {"run": baseline}, alpha=0.05)
+        assert comparison.regressed
+        assert baseline.median > 1.5 * engine.median
+
+    def test_peak_memory_is_bounded(self):
+        """Memory use depends on the block size, not the input size."""
+
+        def peak(data):
+            with open(os.devnull, "wb") as output:
+                tracemalloc.start()
+                try:
+                    baseline = tracemalloc.get_traced_memory()[0]
+                    add_one_csv(io.BytesIO(data), output, "value", block_size=1 << 14)
+                    return tracemalloc.get_traced_memory()[1] - baseline
+                finally:
+                    tracemalloc.stop()
+
+        small, large = _table(20_000), _table(100_000)
+        assert peak(large) < 2 * peak(small)
+        assert peak(large) < len(large) // 4
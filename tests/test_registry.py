@@ -0,0 +1,150 @@
+"""
+Tests for the registry module of package_trial_zenjiro.
+
+This module contains tests for registering, resolving and dispatching
+per-type increment handlers, and for their use by add_one_many.
+"""
+
+import numbers
+
+import pytest
+
+from src.package_trial_zenjiro import registry
+from src.package_trial_zenjiro.main import add_one, add_one_many
+from src.package_trial_zenjiro.registry import (
+    add_one_runs,
+    dispatch_add_one,
+    has_increment,
+    register_increment,
+    resolve_increment,
+    unregister_increment,
+)
+
+
+class Fixed:
+    """Minimal fixed-point number with three decimal places."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def __add__(self, other):
+        if isinstance(other, int):
+            return Fixed(self.raw + other * 1000)
+        return NotImplemented
+
+    def __eq__(self, other):
+        return isinstance(other, Fixed) and other.raw == self.raw
+
+
+class SubFixed(Fixed):
+    """Subclass that inherits the handler of Fixed."""
+
+    __slots__ = ()
+
+
+def _increment_fixed(number):
+    return Fixed(number.raw + 1000)
+
+
+@pytest.fixture
+def clean_registry():
+    """Restore the registry contents after each test."""
+    saved = dict(registry._handlers)
+    yield
+    registry._handlers.clear()
+    registry._handlers.update(saved)
+    registry._resolved.clear()
+
+
+class TestRegistry:
+    """Test class for the increment registry."""
+
+    def test_unregistered_types_use_plain_addition(self, clean_registry):
+        """Without a handler dispatch behaves like add_one."""
+        assert dispatch_add_one(41) == 42
+        assert dispatch_add_one(1.5) == 2.5
+        assert dispatch_add_one(Fixed(1)) == Fixed(1001)
+        assert not has_increment(int)
+        with pytest.raises(TypeError):
+            dispatch_add_one("string")
+
+    def test_register_and_resolve_along_mro(self, clean_registry):
+        """Subclasses resolve to the nearest registered base."""
+        register_increment(Fixed, _increment_fixed)
+        assert resolve_increment(Fixed) is _increment_fixed
+        assert resolve_increment(SubFixed) is _increment_fixed
+        assert dispatch_add_one(SubFixed(5)) == Fixed(1005)
+
+        def increment_sub(number):
+            return SubFixed(number.raw + 1000)
+
+        register_increment(SubFixed, increment_sub)
+        assert resolve_increment(SubFixed) is increment_sub
+        assert resolve_increment(Fixed) is _increment_fixed
+
+    def test_abstract_base_classes(self, clean_registry):
+        """Virtual subclasses match registered abstract base classes."""
+
+        class MyIntegral(int):
+            """Integer subclass registered through numbers.Integral."""
+
+        calls = []
+
+        @register_increment(numbers.Integral)
+        def increment(number):
+            calls.append(number)
+            return number + 1
+
+        assert dispatch_add_one(MyIntegral(1)) == 2
+        assert calls == [1]
+
+    def test_resolution_is_cached_and_invalidated(self, clean_registry):
+        """Lookups are cached per type until the registry changes."""
+        resolve_increment(Fixed)
+        assert Fixed in registry._resolved
+        register_increment(Fixed, _increment_fixed)
+        assert Fixed not in registry._resolved
+        assert has_increment(Fixed)
+        unregister_increment(Fixed)
+        assert not has_increment(Fixed)
+        with pytest.raises(KeyError):
+            unregister_increment(Fixed)
+
+    def test_add_one_runs_groups_types(self, clean_registry):
+        """Runs of equal types share one handler and order is kept."""
+        lookups = []
+        original = registry.resolve_increment
+
+        def counting(kind):
+            lookups.append(kind)
+            return original(kind)
+
+        register_increment(Fixed, _increment_fixed)
+        data = [Fixed(1), Fixed(2), 3, 4, Fixed(5)]
+        registry.resolve_increment = counting
+        try:
+            results = add_one_runs(data)
+        finally:
+            registry.resolve_increment = original
+        assert results == [Fixed(1001), Fixed(1002), 4, 5, Fixed(1005)]
+        assert lookups == [Fixed, int, Fixed]
+
+    def test_add_one_many_uses_registered_handlers(self, clean_registry):
+        """Batches led by a registered type go through the handlers."""
+        calls = []
+
+        def increment(number):
+            calls.append(number.raw)
+            return _increment_fixed(number)
+
+        register_increment(Fixed, increment)
+        data = [Fixed(1), SubFixed(2), 3.5]
+        assert add_one_many(data) == [add_one(x) for x in data]
+        assert calls == [1, 2]
+
+    def test_register_rejects_non_classes(self, clean_registry):
+        """Only classes can be registered."""
+        with pytest.raises(TypeError):
+            register_increment("Fixed", _increment_fixed)
@@ -0,0 +1,195 @@
+"""
+Tests for the repeat module of package_trial_zenjiro.
+
+This module contains tests for add_n, checking bit-identical agreement with
+repeated add_one for every supported type and the sublinear float path.
+"""
+
+import math
+import random
+import struct
+from decimal import (
+    ROUND_05UP,
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_HALF_EVEN,
+    ROUND_UP,
+    Decimal,
+    Inexact,
+    InvalidOperation,
+    Overflow,
+    localcontext,
+)
+from fractions import Fraction
+
+import pytest
+
+from src.package_trial_zenjiro.main import add_one
+from src.package_trial_zenjiro.repeat import add_n
+
+
+def repeat_add_one(number, k):
+    """Reference implementation: call add_one k times."""
+    for _ in range(k):
+        number = add_one(number)
+    return number
+
+
+def float_bits(value):
+    """Return the IEEE 754 bit pattern of a float."""
+    return struct.pack("<d", value)
+
+
+class Meters(float):
+    """Float subclass, which add_n must not treat as a plain float."""
+
+
+class TestAddN:
+    """Test class for repeated application."""
+
+    @pytest.mark.parametrize("number", [0, -7, True, 10**30, Fraction(1, 3)])
+    def test_exact_types(self, number):
+        """Exact types collapse to a single addition of k."""
+        assert add_n(number, 50) == repeat_add_one(number, 50)
+        assert add_n(number, 10**20) == number + 10**20
+
+    def test_zero_times_returns_input(self):
+        """k == 0 returns the input unchanged."""
+        value = -0.0
+        assert add_n(value, 0) is value
+
+    @pytest.mark.parametrize(
+        "number",
+        [
+            0.1,
+            -0.0,
+            -0.1,
+            42.7,
+            5e-324,
+            -1e-300,
+            2.0**52 + 0.5,
+            -(2.0**52) - 0.5,
+            2.0**53 - 10.5,
+            2.0**53,
+            2.0**53 + 2,
+            -(2.0**53) - 2,
+            -(2.0**54) - 4,
+            1e300,
+            -1e300,
+        ],
+    )
+    @pytest.mark.parametrize("k", [1, 2, 3, 17, 1000, 4097])
+    def test_floats_bit_identical(self, number, k):
+        """Float results match the loop bit for bit."""
+        expected = repeat_add_one(number, k)
+        assert float_bits(add_n(number, k)) == float_bits(expected)
+
+    def test_random_floats_bit_identical(self):
+        """Random floats across many binades match the loop."""
+        rng = random.Random(14)
+        for _ in range(300):
+            number = rng.choice([-1, 1]) * rng.random() * 2.0 ** rng.randint(-60, 60)
+            k = rng.randint(1, 3000)
+            expected = repeat_add_one(number, k)
+            assert float_bits(add_n(number, k)) == float_bits(expected)
+
+    def test_non_finite_floats(self):
+        """inf stays inf and NaN keeps its payload."""
+        assert add_n(math.inf, 10) == math.inf
+        assert add_n(-math.inf, 10) == -math.inf
+        nan = struct.unpack("<d", struct.pack("<Q", 0x7FF8000000000123))[0]
+        assert float_bits(add_n(nan, 10)) == float_bits(repeat_add_one(nan, 10))
+
+    def test_float_cost_is_sublinear(self):
+        """Huge k for floats finishes without running the loop."""
+        result = add_n(0.1, 10**30)
+        assert result == 2.0**53
+        assert add_n(1e-5, 10**6) == repeat_add_one(1e-5, 10**6)
+
+    def test_complex(self):
+        """The real part rounds like a float; the imaginary part is kept."""
+        for number in [complex(0.1, -0.0), complex(-3.5, 2.0), 1j]:
+            expected = repeat_add_one(number, 100)
+            result = add_n(number, 100)
+            assert float_bits(result.real) == float_bits(expected.real)
+            assert float_bits(result.imag) == float_bits(expected.imag)
+
+    @pytest.mark.parametrize(
+        "number", [Decimal("1.5"), Decimal("-0"), Decimal("-3"), Decimal("1E+5")]
+    )
+    def test_exact_decimals(self, number):
+        """Decimal additions that do not round collapse to one addition."""
+        result = add_n(number, 25)
+        expected = repeat_add_one(number, 25)
+        assert str(result) == str(expected)
+
+    def test_rounding_decimals_match_loop(self):
+        """Decimal additions that round give the result of the loop."""
+        with localcontext() as ctx:
+            ctx.prec = 3
+            for number in [Decimal("998"), Decimal("0.123"), Decimal("9.99E+5")]:
+                assert str(add_n(number, 7)) == str(repeat_add_one(number, 7))
+
+    @pytest.mark.parametrize(
+        "rounding",
+        [
+            ROUND_UP,
+            ROUND_DOWN,
+            ROUND_CEILING,
+            ROUND_FLOOR,
+            ROUND_HALF_EVEN,
+            ROUND_05UP,
+        ],
+    )
+    def test_rounding_modes_match_loop(self, rounding):
+        """Values and context flags match the loop in every rounding mode."""
+        for number in ["-1.5E+4", "-998", "0.5", "7", "9.9E+3", "1E+6"]:
+            results = []
+            for repeat in (add_n, repeat_add_one):
+                with localcontext() as ctx:
+                    ctx.prec, ctx.rounding = 2, rounding
+                    ctx.clear_flags()
+                    value = repeat(Decimal(number), 20_000)
+                    flags = {flag for flag, raised in ctx.flags.items() if raised}
+                    results.append((str(value), flags))
+            assert results[0] == results[1]
+
+    def test_decimal_cost_is_sublinear(self):
+        """k far beyond the context precision finishes at once."""
+        assert add_n(Decimal(1), 10**30) == Decimal("1E+28")
+        assert add_n(Decimal(0), 10**40) == Decimal("1E+28")
+        with localcontext() as ctx:
+            ctx.rounding = ROUND_DOWN
+            assert add_n(Decimal("-1E+40"), 10**50) == Decimal("1E+28")
+            ctx.rounding = ROUND_UP
+            with pytest.raises(Overflow):
+                add_n(Decimal(1), 10**40)
+            ctx.traps[Overflow] = False
+            assert add_n(Decimal(1), 10**40) == Decimal("Infinity")
+
+    def test_decimal_traps_are_kept(self):
+        """Signals raise exactly as add_one does, after any number of steps."""
+        with pytest.raises(InvalidOperation):
+            add_n(Decimal("sNaN"), 3)
+        with localcontext() as ctx:
+            ctx.traps[Inexact] = True
+            with pytest.raises(Inexact):
+                add_n(Decimal(1), 10**30)
+            assert add_n(Decimal(1), 10**27) == 10**27 + 1
+
+    def test_unknown_types_use_loop(self):
+        """Subclasses and other types are handled by the plain loop."""
+        assert add_n(Meters(0.5), 3) == 3.5
+
+    def test_invalid_k(self):
+        """k must be a non-negative integer."""
+        with pytest.raises(ValueError):
+            add_n(1, -1)
+        with pytest.raises(TypeError):
+            add_n(1, 2.0)
+
+    def test_invalid_number(self):
+        """Non-numeric values raise TypeError like add_one."""
+        with pytest.raises(TypeError):
+            add_n("1", 2)
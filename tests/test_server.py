@@ -0,0 +1,260 @@
+"""
+Tests for the add_one server and client of package_trial_zenjiro.
+
+This module contains tests for the wire format, the batching server on TCP
+and Unix sockets, the pooled client with pipelining and coalescing, error
+propagation and the load-generator benchmark.
+"""
+
+import io
+import socket
+import socketserver
+import threading
+from concurrent.futures import CancelledError
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from src.package_trial_zenjiro import _wire
+from src.package_trial_zenjiro import client as client_module
+from src.package_trial_zenjiro import server
+from src.package_trial_zenjiro.client import FRAME_VALUES, AddOneClient
+from src.package_trial_zenjiro.main import add_one
+
+
+@pytest.fixture
+def address():
+    running = server.serve()
+    yield running.server_address
+    running.shutdown()
+    running.server_close()
+
+
+@pytest.fixture
+def frames(monkeypatch):
+    """Record the number of values in every frame the server processes."""
+    sizes = []
+    process = _wire.process
+
+    def counting(kind, payload):
+        result = process(kind, payload)
+        sizes.append(len(_wire.decode(*result)))
+        return result
+
+    monkeypatch.setattr(_wire, "process", counting)
+    return sizes
+
+
+class TestWire:
+    """Test class for the frame format."""
+
+    @pytest.mark.parametrize(
+        "values,kind",
+        [
+            ([1, -(2**62)], ord("q")),
+            ([0.5, float("inf")], ord("d")),
+            ([2**63 - 1, 2**80], ord("A")),
+            ([1, 2.5, 1j], ord("A")),
+            ([Decimal("1.10")], ord("D")),
+            ([], ord("A")),
+        ],
+    )
+    def test_round_trip(self, values, kind):
+        """Encoded batches are processed exactly like add_one."""
+        encoded = _wire.encode(values)
+        assert encoded[0] == kind
+        result = _wire.decode(*_wire.process(*encoded))
+        assert result == [add_one(v) for v in values]
+        assert list(map(type, result)) == [type(add_one(v)) for v in values]
+
+    def test_unsendable_values(self):
+        """bool, Fraction and Decimal mixtures are refused."""
+        for values in ([True], [Fraction(1, 2)], [Decimal(1), 1]):
+            with pytest.raises(TypeError, match="cannot send"):
+                _wire.encode(values)
+
+    def test_errors_travel_as_frames(self):
+        """Server failures become error frames re-raised by decode."""
+        kind, payload = _wire.process(ord("q"), b"\x00" * 3)
+        assert kind == _wire.KIND_ERROR
+        with pytest.raises(ValueError, match="whole number"):
+            _wire.decode(kind, payload)
+        with pytest.raises(ValueError, match="unknown frame kind"):
+            _wire.decode(*_wire.process(ord("z"), b""))
+        with pytest.raises(ValueError, match="unknown frame kind"):
+            _wire.decode(ord("z"), b"")
+        with pytest.raises(RuntimeError, match="KeyError: boom"):
+            _wire.decode(_wire.KIND_ERROR, b"KeyError: boom")
+
+    def test_read_frame(self):
+        """Frames are read whole; truncation and oversize are detected."""
+        data = _wire.frame(ord("A"), b"1\n")
+        assert _wire.read_frame(io.BytesIO(data)) == (ord("A"), b"1\n")
+        assert _wire.read_frame(io.BytesIO(b"")) is None
+        with pytest.raises(ConnectionError):
+            _wire.read_frame(io.BytesIO(data[:3]))
+        with pytest.raises(ConnectionError):
+            _wire.read_frame(io.BytesIO(data[:-1]))
+        with pytest.raises(ValueError, match="exceeds"):
+            _wire.read_frame(io.BytesIO(_wire.HEADER.pack(1 << 30, ord("A"))))
+
+
+class TestServer:
+    """Test class for the server and the pooled client."""
+
+    def test_scalar_and_batch_calls(self, address):
+        """Results match add_one for every supported type."""
+        with AddOneClient(address) as client:
+            assert client.add_one(41) == 42
+            assert client.add_one(2**63 - 1) == 2**63
+            assert client.add_one(Decimal("1.10")) == Decimal("2.10")
+            values = [1, 2.5, 3j, 2**70]
+            assert client.add_one_many(values) == [add_one(v) for v in values]
+            assert client.add_one_many([]) == []
+
+    def test_unix_socket(self, tmp_path):
+        """The server also listens on a Unix domain socket."""
+        path = str(tmp_path / "add_one.sock")
+        running = server.serve(path)
+        try:
+            with AddOneClient(path) as client:
+                assert client.add_one_many(range(5)) == [1, 2, 3, 4, 5]
+        finally:
+            running.shutdown()
+            running.server_close()
+
+    def test_large_batches_are_pipelined(self, address, frames):
+        """add_one_many splits into frames that are all in flight together."""
+        values = list(range(FRAME_VALUES * 2 + 5))
+        with AddOneClient(address, connections=1) as client:
+            assert client.add_one_many(values) == [v + 1 for v in values]
+        assert frames == [FRAME_VALUES, FRAME_VALUES, 5]
+
+    def test_calls_are_coalesced(self, address, frames):
+        """Concurrent scalar calls share frames."""
+        with AddOneClient(address, linger=0.05) as client:
+            futures = [client.submit(i) for i in range(200)]
+            assert [f.result() for f in futures] == list(range(1, 201))
+        assert sum(frames) == 200
+        assert len(frames) < 20
+
+    def test_calls_from_many_threads(self, address):
+        """The client can be shared between threads."""
+        results = {}
+
+        def call(start):
+            results[start] = [client.add_one(start + i) for i in range(50)]
+
+        with AddOneClient(address, max_batch=16) as client:
+            threads = [threading.Thread(target=call, args=(n * 100,)) for n in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert results == {
+            n * 100: list(range(n * 100 + 1, n * 100 + 51)) for n in range(8)
+        }
+
+    def test_mixed_types_in_one_batch(self, address):
+        """Values that cannot share a frame are sent separately."""
+        with AddOneClient(address, linger=0.05) as client:
+            futures = [client.submit(v) for v in (1, Decimal("0.5"), True, 2.5)]
+            assert futures[0].result() == 2
+            assert futures[1].result() == Decimal("1.5")
+            with pytest.raises(TypeError):
+                futures[2].result()
+            assert futures[3].result() == 3.5
+
+    def test_failing_value_is_isolated(self, address):
+        """A server error only fails the call that caused it."""
+        with AddOneClient(address, linger=0.05) as client:
+            good = client.submit(Decimal(1))
+            bad = client.submit(Decimal("sNaN"))
+            assert good.result() == Decimal(2)
+            with pytest.raises(RuntimeError, match="InvalidOperation"):
+                bad.result()
+
+    def test_retries_are_sent_by_the_sender_thread(self, address, monkeypatch):
+        """Reader threads never send, so a retry cannot block a connection."""
+        senders = []
+        request = client_module._Connection.request
+
+        def recording(connection, kind, payload):
+            senders.append(threading.current_thread())
+            return request(connection, kind, payload)
+
+        monkeypatch.setattr(client_module._Connection, "request", recording)
+        with AddOneClient(address, connections=1, linger=0.05) as client:
+            futures = [client.submit(Decimal(n)) for n in ("1", "sNaN", "2")]
+            assert futures[0].result() == Decimal(2)
+            assert futures[2].result() == Decimal(3)
+            with pytest.raises(RuntimeError, match="InvalidOperation"):
+                futures[1].result()
+        assert len(senders) == 4
+        assert set(senders) == {client._sender}
+
+    def test_cancelled_calls_are_skipped(self, address):
+        """A future cancelled before sending is dropped from the frame."""
+        with AddOneClient(address, linger=0.05) as client:
+            cancelled = client.submit(1)
+            kept = client.submit(2)
+            assert cancelled.cancel()
+            assert kept.result() == 3
+            with pytest.raises(CancelledError):
+                cancelled.result()
+
+    def test_closed_client_and_arguments(self, address):
+        """Closed clients and invalid settings are rejected."""
+        client = AddOneClient(address)
+        client.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            client.submit(1)
+        with pytest.raises(RuntimeError, match="closed"):
+            client.add_one_many([1])
+        with pytest.raises(ValueError):
+            AddOneClient(address, connections=0)
+        with pytest.raises(ValueError):
+            AddOneClient(address, linger=-1)
+
+    def test_server_going_away(self):
+        """Calls fail with ConnectionError once the server is gone."""
+        running = server.serve()
+        client = AddOneClient(running.server_address, timeout=5)
+        assert client.add_one(1) == 2
+        running.shutdown()
+        running.server_close()
+        for connection in client._pool:
+            connection.socket.shutdown(socket.SHUT_RDWR)
+            connection._reader.join(5)
+            assert isinstance(connection.error, ConnectionError)
+        with pytest.raises(ConnectionError):
+            client.add_one(1)
+        with pytest.raises(ConnectionError):
+            client.add_one_many([1])
+        client.close()
+
+    def test_bad_frame_closes_connection(self, address):
+        """An oversized header ends the connection instead of hanging."""
+        with socket.create_connection(address, 5) as connection:
+            connection.sendall(_wire.HEADER.pack(1 << 30, ord("A")))
+            assert connection.recv(1) == b""
+
+    def test_main_serves_until_interrupted(self, monkeypatch, capsys, tmp_path):
+        """The command serves until interrupted and removes its socket."""
+
+        def interrupt(self, poll_interval=0.5):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(socketserver.BaseServer, "serve_forever", interrupt)
+        path = tmp_path / "add_one.sock"
+        assert server.main(["--unix", str(path)]) == 0
+        assert "listening on" in capsys.readouterr().out
+        assert not path.exists()
+
+    def test_benchmark(self, capsys):
+        """The load generator compares in-process and server calls."""
+        assert server.main(["--benchmark", "--threads", "2", "--duration", "0.05"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 4
+        assert all("values/s" in line and "p99.9" in line for line in lines)
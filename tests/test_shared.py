@@ -0,0 +1,195 @@
+"""
+Tests for the shared module of package_trial_zenjiro.
+
+This module contains tests for add_one_shared, covering results for every
+element type, in-place use of SharedMemory segments, overflow policies,
+the in-process fallback, and segment cleanup after errors, crashed
+workers, Ctrl-C and a killed caller.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+from array import array
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from src.package_trial_zenjiro import shared
+from src.package_trial_zenjiro.bench import compare, measure
+from src.package_trial_zenjiro.buffer import add_one_buffer
+from src.package_trial_zenjiro.parallel import add_one_parallel
+from src.package_trial_zenjiro.parallel import shutdown_pool as shutdown_parallel
+from src.package_trial_zenjiro.shared import SEGMENT_PREFIX, add_one_shared
+
+SHM = "/dev/shm"
+
+pytestmark = pytest.mark.skipif(
+    not os.path.isdir(SHM), reason="needs a /dev/shm file system"
+)
+
+
+def segments():
+    """Names of the segments this module created that still exist."""
+    return {name for name in os.listdir(SHM) if name.startswith(SEGMENT_PREFIX)}
+
+
+def _crash(*args):
+    os._exit(1)
+
+
+@pytest.fixture
+def fresh_pool():
+    """Start and end every test without a pool and without new segments."""
+    shared.shutdown_pool()
+    before = segments()
+    yield
+    shared.shutdown_pool()
+    assert segments() == before
+
+
+class TestAddOneShared:
+    """Test class for the shared-memory engine."""
+
+    @pytest.mark.parametrize("typecode", ["b", "B", "h", "i", "l", "q", "Q", "d"])
+    def test_results_match_buffer_engine(self, fresh_pool, typecode):
+        """Workers produce what add_one_buffer produces, in place."""
+        values = [i % 100 for i in range(1001)]
+        data = array(typecode, values)
+        assert add_one_shared(data, max_workers=3, min_bytes=0) is data
+        assert data == add_one_buffer(array(typecode, values))
+        assert shared._pool.pool is not None
+
+    def test_out_and_raw_buffers(self, fresh_pool):
+        """Results can go to another buffer; raw bytes take a typecode."""
+        source = array("d", [0.5, -1.0, 2.25])
+        out = array("d", [0.0] * 3)
+        assert add_one_shared(source, out, max_workers=2, min_bytes=0) is out
+        assert out == array("d", [1.5, 0.0, 3.25])
+        assert source == array("d", [0.5, -1.0, 2.25])
+        raw = bytearray(array("i", [1, 2, 3, 4]).tobytes())
+        add_one_shared(raw, typecode="i", max_workers=2, min_bytes=0)
+        assert array("i", bytes(raw)) == array("i", [2, 3, 4, 5])
+
+    def test_shared_memory_in_place(self, fresh_pool):
+        """A SharedMemory source is rewritten without copies."""
+        segment = SharedMemory(create=True, size=8 * 1000)
+        try:
+            with segment.buf.cast("q") as view:
+                view[:] = array("q", range(1000))
+            assert add_one_shared(segment, typecode="q", max_workers=2, min_bytes=0)
+            with segment.buf.cast("q") as view:
+                assert view.tolist() == list(range(1, 1001))
+            out = SharedMemory(create=True, size=8 * 1000)
+            try:
+                add_one_shared(segment, out, typecode="q", max_workers=2, min_bytes=0)
+                with out.buf.cast("q") as view:
+                    assert view.tolist() == list(range(2, 1002))
+            finally:
+                out.close()
+                out.unlink()
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def test_overflow_policies(self, fresh_pool):
+        """Policies apply per slice; errors give the index in the buffer."""
+        values = [0] * 1000 + [127]
+        data = array("b", values)
+        add_one_shared(data, overflow="wrap", max_workers=2, min_bytes=0)
+        assert data[-1] == -128 and data[0] == 1
+        data = array("b", values)
+        add_one_shared(data, overflow="saturate", max_workers=2, min_bytes=0)
+        assert data[-1] == 127
+        with pytest.raises(OverflowError, match="index 1000"):
+            add_one_shared(array("b", values), max_workers=2, min_bytes=0)
+
+    def test_small_buffers_stay_in_process(self, fresh_pool):
+        """Below min_bytes, or with one worker, no pool is started."""
+        assert add_one_shared(array("q", [1, 2])) == array("q", [2, 3])
+        assert add_one_shared(array("q", [1]), max_workers=1, min_bytes=0) == array(
+            "q", [2]
+        )
+        assert add_one_shared(array("q"), max_workers=2, min_bytes=0) == array("q")
+        assert shared._pool.pool is None
+
+    def test_invalid_arguments(self, fresh_pool):
+        """Bad arguments are rejected without leaving segments behind."""
+        with pytest.raises(ValueError):
+            add_one_shared(array("q", [1]), overflow="clamp")
+        with pytest.raises(ValueError):
+            add_one_shared(array("q", [1]), max_workers=0)
+        with pytest.raises(ValueError, match="size"):
+            add_one_shared(array("q", [1]), array("q"), max_workers=2, min_bytes=0)
+        with pytest.raises(TypeError, match="typecode"):
+            add_one_shared(array("q", [1]), array("d", [0]), max_workers=2, min_bytes=0)
+        with pytest.raises(TypeError, match="read-only"):
+            add_one_shared(bytes(8), typecode="q", max_workers=2, min_bytes=0)
+        with pytest.raises(TypeError, match="unsupported"):
+            add_one_shared(array("u", "ab"), max_workers=2, min_bytes=0)
+
+    def test_crashed_worker(self, fresh_pool, monkeypatch):
+        """A dead worker raises BrokenProcessPool and the pool is replaced."""
+        monkeypatch.setattr(shared, "_add_one_segment", _crash)
+        with pytest.raises(BrokenProcessPool):
+            add_one_shared(array("q", range(100)), max_workers=2, min_bytes=0)
+        assert shared._pool.pool is None
+        monkeypatch.undo()
+        data = add_one_shared(array("q", range(100)), max_workers=2, min_bytes=0)
+        assert data == array("q", range(1, 101))
+
+    def test_interrupted_caller(self, fresh_pool, monkeypatch):
+        """Ctrl-C while the workers run still unlinks the segment."""
+        add_one_shared(array("q", [1, 2]), max_workers=2, min_bytes=0)
+
+        def interrupt(*args, **kwargs):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(shared, "wait", interrupt)
+        data = array("q", range(100))
+        with pytest.raises(KeyboardInterrupt):
+            add_one_shared(data, max_workers=2, min_bytes=0)
+        assert data == array("q", range(100))
+
+    def test_killed_caller(self):
+        """The resource tracker unlinks the segment of a killed caller."""
+        script = (
+            "import os, signal\n"
+            "from package_trial_zenjiro.shared import _create_segment\n"
+            "print(_create_segment(64).name, flush=True)\n"
+            "os.kill(os.getpid(), signal.SIGKILL)\n"
+        )
+        environment = dict(os.environ, PYTHONPATH="src")
+        process = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            env=environment,
+        )
+        assert process.returncode == -signal.SIGKILL
+        path = os.path.join(SHM, process.stdout.strip())
+        deadline = time.monotonic() + 10
+        while os.path.exists(path) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not os.path.exists(path)
+
+    def test_faster_than_pickling_pool(self, fresh_pool):
+        """Sharing the buffer beats sending the elements through pickle."""
+        values = list(range(200_000))
+        source = array("q", values)
+
+        engine = measure(
+            lambda: add_one_shared(array("q", source), max_workers=2, min_bytes=0),
+            repeat=5,
+        )
+        baseline = measure(
+            lambda: add_one_parallel(values, max_workers=2, min_cost=0), repeat=5
+        )
+        shutdown_parallel()
+
+        (comparison,) = compare({"run": engine}, {"run": baseline}, alpha=0.05)
+        assert comparison.regressed
+        assert baseline.median > 3 * engine.median
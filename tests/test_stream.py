@@ -0,0 +1,86 @@
+"""
+Tests for the stream module of package_trial_zenjiro.
+
+This module contains tests for add_one_stream and add_one_chunks, covering
+laziness, chunking, hooks and bounded memory use.
+"""
+
+import tracemalloc
+from itertools import count, islice
+
+import pytest
+
+from src.package_trial_zenjiro.main import add_one
+from src.package_trial_zenjiro.stream import add_one_chunks, add_one_stream
+
+
+class TestAddOneStream:
+    """Test class for the streaming pipeline."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 1000])
+    def test_stream_matches_scalar(self, chunk_size):
+        """Streamed results equal element-wise add_one in order."""
+        data = [1, -2.5, 3j, True, 10**20]
+        results = list(add_one_stream(iter(data), chunk_size))
+        assert results == [add_one(x) for x in data]
+
+    def test_stream_is_lazy(self):
+        """Infinite inputs can be consumed incrementally."""
+        stream = add_one_stream(count(), chunk_size=10)
+        assert list(islice(stream, 25)) == list(range(1, 26))
+
+    def test_chunks_have_bounded_size(self):
+        """add_one_chunks yields lists of at most chunk_size elements."""
+        chunks = list(add_one_chunks(range(10), chunk_size=4))
+        assert chunks == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+
+    def test_empty_stream(self):
+        """An empty input yields nothing."""
+        assert list(add_one_stream([])) == []
+        assert list(add_one_chunks([])) == []
+
+    def test_hooks_between_reader_and_writer(self):
+        """before/after hooks parse input lines and format output lines."""
+        lines = iter(["1\n", "2\n", "41\n"])
+
+        def parse(chunk):
+            return [int(line) for line in chunk]
+
+        def format_lines(results):
+            return "".join(f"{r}\n" for r in results)
+
+        written = list(add_one_chunks(lines, 2, before=parse, after=format_lines))
+        assert written == ["2\n3\n", "42\n"]
+
+        lines = iter(["1\n", "2\n"])
+        streamed = list(add_one_stream(lines, before=parse, after=reversed))
+        assert streamed == [3, 2]
+
+    def test_invalid_chunk_size(self):
+        """A chunk size below one is rejected."""
+        with pytest.raises(ValueError):
+            list(add_one_stream([1], chunk_size=0))
+
+    def test_type_errors_propagate(self):
+        """Non-numeric elements raise TypeError when their chunk is reached."""
+        stream = add_one_stream(iter([1, 2, "string"]), chunk_size=2)
+        assert next(stream) == 2
+        assert next(stream) == 3
+        with pytest.raises(TypeError):
+            next(stream)
+
+    def test_peak_memory_does_not_grow_with_stream_length(self):
+        """Peak traced memory is flat regardless of how many items flow."""
+
+        def peak_for(length):
+            tracemalloc.start()
+            try:
+                for _ in add_one_stream(range(length), chunk_size=256):
+                    pass
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        short_peak = peak_for(10000)
+        long_peak = peak_for(200000)
+        assert long_peak < short_peak * 2 + 16384
@@ -0,0 +1,89 @@
+"""
+Tests for the threaded module of package_trial_zenjiro.
+
+This module contains tests for add_one_threaded and the free-threading
+detection, covering slicing, order preservation and the single-thread
+fallback on GIL builds.
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.package_trial_zenjiro import threaded
+from src.package_trial_zenjiro.main import add_one
+from src.package_trial_zenjiro.threaded import (
+    add_one_threaded,
+    free_threaded,
+    shutdown_pool,
+)
+
+
+@pytest.fixture
+def fresh_pool():
+    """Make sure every test starts and ends without a running pool."""
+    shutdown_pool()
+    yield
+    shutdown_pool()
+
+
+class TestAddOneThreaded:
+    """Test class for the thread-pool engine."""
+
+    @pytest.mark.parametrize("workers", [1, 2, 3, 8])
+    def test_results_match_scalar(self, fresh_pool, workers):
+        """Results equal add_one in input order for any thread count."""
+        data = list(range(-50, 50)) + [1.5, 3j, True, 10**30]
+        results = add_one_threaded(data, max_workers=workers, min_batch=0)
+        assert results == [add_one(x) for x in data]
+
+    def test_pool_is_reused(self, fresh_pool):
+        """Later calls with the same thread count share one pool."""
+        add_one_threaded(range(10), max_workers=2, min_batch=0)
+        pool = threaded._pool.pool
+        add_one_threaded(range(10), max_workers=2, min_batch=0)
+        assert threaded._pool.pool is pool
+
+        add_one_threaded(range(10), max_workers=4, min_batch=0)
+        assert threaded._pool.pool is not pool
+
+    def test_replacement_survives_concurrent_shutdown(self, fresh_pool):
+        """A shutdown between replacing and returning the pool is harmless."""
+
+        class Stale(ThreadPoolExecutor):
+            def shutdown(self, wait=True, **kwargs):
+                # Runs after the slot's lock is released, like a
+                # shutdown_pool() call from another thread would.
+                super().shutdown(wait, **kwargs)
+                threaded.shutdown_pool()
+
+        threaded._pool.pool, threaded._pool._workers = Stale(1), 1
+        pool = threaded._pool.get(2)
+        assert isinstance(pool, ThreadPoolExecutor)
+        assert threaded._pool.pool is None
+
+    def test_small_batches_stay_on_calling_thread(self, fresh_pool):
+        """Batches under min_batch never start a pool."""
+        assert add_one_threaded([1, 2, 3], max_workers=4) == [2, 3, 4]
+        assert add_one_threaded([]) == []
+        assert threaded._pool.pool is None
+
+    def test_default_worker_count_follows_gil(self, fresh_pool):
+        """Without max_workers a GIL build processes on a single thread."""
+        results = add_one_threaded(range(100), min_batch=0)
+        assert results == list(range(1, 101))
+        assert (threaded._pool.pool is None) == (not free_threaded())
+
+    def test_free_threaded_detection(self):
+        """Detection agrees with the interpreter's own GIL status."""
+        gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+        assert free_threaded() is (not gil_enabled)
+
+    def test_invalid_arguments(self, fresh_pool):
+        """Thread counts must be positive and elements numeric."""
+        with pytest.raises(ValueError):
+            add_one_threaded([1], max_workers=0)
+
+        with pytest.raises(TypeError):
+            add_one_threaded([1, "string"], max_workers=2, min_batch=0)
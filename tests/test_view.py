@@ -0,0 +1,139 @@
+"""
+Tests for the view module of package_trial_zenjiro.
+
+This module contains tests for AddOneView, covering indexing, slicing,
+iteration, laziness and buffer export.
+"""
+
+import sys
+from array import array
+
+import pytest
+
+from src.package_trial_zenjiro.main import add_one
+from src.package_trial_zenjiro.view import AddOneView
+
+
+class CountingList(list):
+    """List that records how many elements have been read by index."""
+
+    reads = 0
+
+    def __getitem__(self, index):
+        CountingList.reads += 1
+        return super().__getitem__(index)
+
+
+class TestAddOneView:
+    """Test class for the lazy view."""
+
+    def test_indexing_matches_scalar(self):
+        """Indexed reads equal add_one of the underlying element."""
+        data = [1, -2.5, 3j, True, 10**20]
+        view = AddOneView(data)
+        assert len(view) == len(data)
+        assert [view[i] for i in range(-5, 5)] == [add_one(x) for x in data * 2]
+
+    def test_index_out_of_range(self):
+        """Out-of-range indices raise IndexError."""
+        with pytest.raises(IndexError):
+            AddOneView([1, 2])[2]
+        with pytest.raises(IndexError):
+            AddOneView([1, 2])[-3]
+
+    @pytest.mark.parametrize(
+        "key",
+        [
+            slice(None),
+            slice(2, 8),
+            slice(None, None, -1),
+            slice(7, 1, -2),
+            slice(-20, None, -1),
+            slice(5, 2),
+        ],
+    )
+    def test_slices_are_views(self, key):
+        """Slices return views with list slicing semantics."""
+        data = list(range(10))
+        sliced = AddOneView(data)[key]
+        assert isinstance(sliced, AddOneView)
+        assert list(sliced) == [x + 1 for x in data[key]]
+
+    def test_nested_slices(self):
+        """Slicing a sliced view composes the index ranges."""
+        view = AddOneView(list(range(20)))[::2][1:6][::-1]
+        assert list(view) == [11, 9, 7, 5, 3]
+
+    def test_creation_is_constant_time(self):
+        """Huge inputs are not traversed when the view is created."""
+        view = AddOneView(range(10**18))
+        assert len(view) == 10**18
+        assert view[-1] == 10**18
+        assert view[10**17 :: 10**17][3] == 4 * 10**17 + 1
+
+    def test_only_touched_elements_are_computed(self):
+        """Reading a few indices reads only those elements."""
+        CountingList.reads = 0
+        view = AddOneView(CountingList(range(1000)))
+        assert view[10] == 11
+        assert list(view[500:503]) == [501, 502, 503]
+        assert CountingList.reads == 4
+
+    def test_partial_iteration_reads_only_consumed_elements(self):
+        """An iterator reads each element when it is reached, not before."""
+        CountingList.reads = 0
+        data = CountingList(range(10000))
+        iterator = iter(AddOneView(data))
+        assert next(iterator) == 1
+        assert CountingList.reads == 1
+        data[1] = 41
+        assert next(iterator) == 42
+        assert CountingList.reads == 2
+
+    def test_reads_see_current_contents(self):
+        """The view reflects later changes to the input."""
+        data = [1, 2, 3]
+        view = AddOneView(data)
+        data[1] = 41
+        assert view[1] == 42
+
+    def test_sequence_mixins(self):
+        """The Sequence ABC helpers work on the view."""
+        view = AddOneView([1, 2, 3])
+        assert 3 in view
+        assert view.index(4) == 2
+        assert list(reversed(view)) == [4, 3, 2]
+        assert repr(view) == "AddOneView(<3 elements>)"
+
+    def test_read_only(self):
+        """Views cannot be assigned to."""
+        with pytest.raises(TypeError):
+            AddOneView([1])[0] = 5
+
+    @pytest.mark.parametrize("typecode", ["b", "Q", "d"])
+    def test_to_array(self, typecode):
+        """Numeric buffers can be computed into a new array."""
+        data = array(typecode, range(10))
+        view = AddOneView(data)[7:1:-3]
+        assert view.to_array() == array(typecode, [8, 5])
+        assert AddOneView(data)[5:2].to_array() == array(typecode)
+        assert data == array(typecode, range(10))
+
+    def test_to_array_rejects_non_buffers(self):
+        """Inputs without a numeric buffer cannot be exported."""
+        with pytest.raises(TypeError):
+            AddOneView([1, 2]).to_array()
+        with pytest.raises(TypeError):
+            AddOneView(memoryview(b"ab").cast("c")).to_array()
+
+    def test_to_array_overflow(self):
+        """Fixed-width overflow is reported like add_one_buffer."""
+        with pytest.raises(OverflowError):
+            AddOneView(array("B", [1, 255])).to_array()
+
+    def test_buffer_export(self):
+        """The view exports a buffer of the computed elements."""
+        view = AddOneView(array("i", [1, 2, 3]))[1:]
+        assert view.__buffer__(0).tolist() == [3, 4]
+        if sys.version_info >= (3, 12):
+            assert memoryview(view).tolist() == [3, 4]